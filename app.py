@@ -6,8 +6,11 @@ from flask import Flask, g, redirect, render_template, session, url_for
 import pymysql
 from sqlalchemy.exc import OperationalError
 
+from cli import register_commands
 from config import config, mask_database_uri
 from models import Application, Job, ResumeData, User, db
+from services import analysis_cache, background, parallel_scoring, resume_import, resume_parser, resume_pipeline
+from services.schema_upgrade import upgrade_schema
 
 
 def create_app(config_name: str = "default") -> Flask:
@@ -19,6 +22,35 @@ def create_app(config_name: str = "default") -> Flask:
     ensure_database_exists()
 
     db.init_app(app)
+    analysis_cache.configure(
+        max_bytes=app.config["ANALYSIS_CACHE_MAX_BYTES"],
+        persistent=app.config["ANALYSIS_CACHE_PERSISTENT"],
+    )
+    parallel_scoring.configure(
+        workers=app.config["SCORING_WORKERS"],
+        chunk_size=app.config["SCORING_CHUNK_SIZE"],
+        min_jobs=app.config["SCORING_PARALLEL_MIN_JOBS"],
+    )
+    background.configure(workers=app.config["BACKGROUND_WORKERS"])
+    resume_parser.configure(
+        max_pages=app.config["RESUME_MAX_PAGES"],
+        max_chars=app.config["RESUME_MAX_CHARS"],
+        workers=app.config["RESUME_PAGE_WORKERS"],
+        parallel_min_pages=app.config["RESUME_PARALLEL_MIN_PAGES"],
+    )
+    resume_pipeline.configure(
+        workers=app.config["RESUME_WORKERS"],
+        max_queued=app.config["RESUME_QUEUE_LIMIT"],
+        timeout=app.config["RESUME_EXTRACTION_TIMEOUT"],
+    )
+    resume_import.configure(
+        workers=app.config["RESUME_IMPORT_WORKERS"],
+        batch_size=app.config["RESUME_IMPORT_BATCH_SIZE"],
+        max_files=app.config["RESUME_IMPORT_MAX_FILES"],
+        # Each resume in an archive is held to the limit of a single upload.
+        max_file_bytes=app.config["MAX_CONTENT_LENGTH"],
+        timeout=app.config["RESUME_EXTRACTION_TIMEOUT"],
+    )
     app.logger.info(
         "Active database URI: %s",
         mask_database_uri(app.config["SQLALCHEMY_DATABASE_URI"]),
@@ -33,6 +65,7 @@ def create_app(config_name: str = "default") -> Flask:
     app.register_blueprint(user_bp)
     app.register_blueprint(employer_bp)
     app.register_blueprint(admin_bp)
+    register_commands(app)
 
     @app.before_request
     def load_logged_in_user() -> None:
@@ -72,6 +105,26 @@ def create_app(config_name: str = "default") -> Flask:
 
     with app.app_context():
         bootstrap_database()
+        from services.catalog import init_semantic_model, init_skill_index
+        from services.duplicate_flags import init_duplicate_index
+        from services.site_metrics import init_site_metrics
+        from services.skill_analytics import init_skill_analytics
+        from services.talent_search import init_talent_index
+
+        for init in (
+            init_semantic_model,
+            init_skill_index,
+            init_duplicate_index,
+            init_talent_index,
+            init_skill_analytics,
+            init_site_metrics,
+        ):
+            # A derived index that cannot be built must not keep the portal from starting.
+            try:
+                init(app)
+            except Exception:
+                db.session.rollback()
+                app.logger.exception("Start-up step %s failed", init.__name__)
 
     return app
 
@@ -120,6 +173,7 @@ def bootstrap_database() -> None:
     """Initialize tables and recover automatically from stale schema mismatches."""
     try:
         db.create_all()
+        upgrade_schema()
         seed_data()
     except OperationalError as exc:
         from flask import current_app
@@ -0,0 +1 @@
+"""Benchmarks for the IRIS scoring and parsing services."""
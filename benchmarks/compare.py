@@ -0,0 +1,58 @@
+"""
+Compare two benchmark reports and flag regressions.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.15
+
+Exits with status 1 when any benchmark's p50 latency or peak memory grew by
+more than the threshold fraction.
+"""
+import argparse
+import json
+import sys
+from typing import Sequence
+
+METRICS = ("p50_ms", "p95_ms", "peak_kib")
+GATED = ("p50_ms", "peak_kib")
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> tuple[list[str], list[str]]:
+    lines, regressions = [], []
+    for name, new in candidate["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            lines.append(f"{name:<28} new benchmark")
+            continue
+        changes = []
+        for metric in METRICS:
+            before, after = old[metric], new[metric]
+            change = (after - before) / before if before else 0.0
+            changes.append(f"{metric} {before}->{after} ({change:+.0%})")
+            if metric in GATED and change > threshold:
+                regressions.append(f"{name} {metric} {change:+.0%}")
+        lines.append(f"{name:<28} " + "  ".join(changes))
+    return lines, regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    with open(args.baseline, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    with open(args.candidate, encoding="utf-8") as handle:
+        candidate = json.load(handle)
+
+    lines, regressions = compare(baseline, candidate, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Deterministic synthetic corpus built from SKILL_TAXONOMY.
+
+The same seed always yields the same resumes, job descriptions and files, so
+benchmark runs are comparable across commits.
+"""
+import os
+import random
+from dataclasses import dataclass
+
+from services.ats_analyzer import SKILL_TAXONOMY
+
+SECTIONS = ["Summary", "Experience", "Education", "Skills", "Projects", "Certifications", "Achievements"]
+DEGREES = ["B.Tech Computer Science", "BCA", "MCA", "B.Com", "MBA", "B.Sc Physics", "BA English", "LLB"]
+ROLES = [
+    "Backend Developer", "Data Scientist", "Frontend Engineer", "DevOps Engineer",
+    "Data Analyst", "Mobile Developer", "Security Engineer", "Product Designer",
+]
+FILLER = (
+    "designed built delivered improved led migrated automated maintained reviewed "
+    "scalable reliable customer platform service pipeline dashboard release team "
+    "stakeholders requirements production quality performance features users"
+).split()
+VERBS = ["Reduced", "Increased", "Shipped", "Cut", "Grew", "Automated"]
+
+
+@dataclass
+class SyntheticJob:
+    """Duck-types the Job model fields the scoring services read."""
+
+    id: int
+    title: str
+    description: str
+    is_active: bool = True
+
+
+class CorpusGenerator:
+    """Seeded generator for resumes, job descriptions and resume files."""
+
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._categories = list(SKILL_TAXONOMY)
+
+    def _skills(self, count: int) -> list[str]:
+        focus = self._random.sample(self._categories, 2)
+        pool = SKILL_TAXONOMY[focus[0]] + SKILL_TAXONOMY[focus[1]] + SKILL_TAXONOMY["soft"]
+        return self._random.sample(pool, min(count, len(pool)))
+
+    def _sentence(self, words: int = 12) -> str:
+        return " ".join(self._random.choice(FILLER) for _ in range(words)).capitalize() + "."
+
+    def resume(self, words: int = 450) -> str:
+        """A resume with sections, quantified achievements and taxonomy skills."""
+        lines = [f"Candidate {self._random.randint(1000, 9999)}", self._random.choice(DEGREES)]
+        skills = self._skills(self._random.randint(8, 20))
+        for section in self._random.sample(SECTIONS, self._random.randint(3, len(SECTIONS))):
+            lines.append(section)
+            if section == "Skills":
+                lines.append(", ".join(skills))
+                continue
+            for _ in range(self._random.randint(2, 5)):
+                lines.append(
+                    f"{self._random.choice(VERBS)} latency by {self._random.randint(5, 80)}% using "
+                    f"{self._random.choice(skills)}. {self._sentence()}"
+                )
+        text = "\n".join(lines)
+        while len(text.split()) < words:
+            text += f"\n{self._sentence()} Worked with {self._random.choice(skills)}."
+        return text
+
+    def job_description(self) -> tuple[str, str]:
+        """(title, description) with required skills drawn from the taxonomy."""
+        title = self._random.choice(ROLES)
+        skills = self._skills(self._random.randint(5, 12))
+        description = " ".join(self._sentence() for _ in range(self._random.randint(3, 8)))
+        return title, f"{description} Required skills: {', '.join(skills)}."
+
+    def jobs(self, count: int) -> list[SyntheticJob]:
+        return [SyntheticJob(job_id, *self.job_description()) for job_id in range(1, count + 1)]
+
+    def resumes(self, count: int, words: int = 450) -> list[str]:
+        return [self.resume(words) for _ in range(count)]
+
+    def write_docx(self, path: str, text: str) -> str:
+        from docx import Document
+
+        document = Document()
+        for line in text.splitlines():
+            document.add_paragraph(line)
+        document.save(path)
+        return path
+
+    def write_pdf(self, path: str, text: str, lines_per_page: int = 45) -> str:
+        write_text_pdf(path, text.splitlines(), lines_per_page)
+        return path
+
+    def files(self, directory: str, count: int, pages: int = 2) -> list[str]:
+        """Alternate PDF and DOCX resumes of roughly `pages` pages each."""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for index in range(count):
+            text = self.resume(words=pages * 400)
+            if index % 2 == 0:
+                paths.append(self.write_pdf(os.path.join(directory, f"resume_{index}.pdf"), text))
+            else:
+                paths.append(self.write_docx(os.path.join(directory, f"resume_{index}.docx"), text))
+        return paths
+
+
+def _pdf_escape(line: str) -> str:
+    line = line.encode("latin-1", errors="replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(path: str, lines: list[str], lines_per_page: int = 45) -> None:
+    """Write a minimal multi-page Helvetica PDF that pypdf can extract text from."""
+    pages = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)] or [[]]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_numbers = []
+    for page_lines in pages:
+        stream = "BT /F1 10 Tf 14 TL 50 790 Td " + " ".join(
+            f"({_pdf_escape(line)}) Tj T*" for line in page_lines
+        ) + " ET"
+        data = stream.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+        content_number = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_number
+        )
+        page_numbers.append(len(objects))
+    kids = " ".join(f"{number} 0 R" for number in page_numbers)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_numbers)} >>".encode("latin-1")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as handle:
+        handle.write(output)
@@ -0,0 +1,173 @@
+"""
+Benchmark the IRIS scoring and parsing services on a synthetic corpus.
+
+Usage:
+    python -m benchmarks.run --resumes 50 --jobs 500 --files 10 --output bench.json
+
+Each benchmark reports throughput, p50/p95 latency and peak traced memory.
+Stage benchmarks (single-pass features, clean, skill extraction, TF-IDF,
+suggestions) break the analyze_resume pipeline down. Memoized functions are measured uncached.
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Sequence
+
+from benchmarks.corpus import CorpusGenerator
+from services import semantic_model
+from services.ats_analyzer import (
+    ResumeFeatures,
+    analyze_resume,
+    clean_text,
+    extract_skills_from_text,
+    resume_suggestions,
+    semantic_scores,
+)
+from services.categorizer import final_category
+from services.job_recommender import recommend_jobs, retrieve_job_ids, suggest_jobs
+from services.resume_parser import analyze_resume_keywords, extract_text_from_file
+from services.skill_index import skill_index
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(fn: Callable, inputs: Sequence[tuple], stage: bool = False) -> dict:
+    """Time each call, then replay the inputs under tracemalloc for peak memory."""
+    if inputs:
+        fn(*inputs[0])  # warm up lazy imports and caches outside the timed loop
+    latencies = []
+    started = time.perf_counter()
+    for args in inputs:
+        call_started = time.perf_counter()
+        fn(*args)
+        latencies.append(time.perf_counter() - call_started)
+    total = time.perf_counter() - started
+
+    tracemalloc.start()
+    for args in inputs:
+        fn(*args)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "stage": stage,
+        "calls": len(inputs),
+        "total_s": round(total, 4),
+        "throughput_per_s": round(len(inputs) / total, 2) if total else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def recommend_with_retrieval(resume_text: str, jobs_by_id: dict) -> list[dict]:
+    """The job_retrieval.recommend_for_resume path, with an in-memory catalog instead of the DB."""
+    job_ids = retrieve_job_ids(resume_text)
+    jobs = list(jobs_by_id.values()) if job_ids is None else [jobs_by_id[job_id] for job_id in job_ids]
+    return recommend_jobs(resume_text, jobs)
+
+
+def run(resumes: int, jobs: int, pairs: int, files: int, pages: int, seed: int) -> dict:
+    generator = CorpusGenerator(seed)
+    resume_texts = generator.resumes(resumes)
+    job_rows = generator.jobs(jobs)
+    jd_texts = [f"{job.title} {job.description}" for job in job_rows]
+    pair_inputs = [
+        (resume_texts[i % len(resume_texts)], jd_texts[i % len(jd_texts)]) for i in range(pairs)
+    ]
+    cleaned_resumes = [clean_text(text) for text in resume_texts]
+    cleaned_jds = [clean_text(text) for text in jd_texts]
+
+    results = {}
+    fit_documents = [(job.id, text) for job, text in zip(job_rows, cleaned_jds)]
+    results["stage.tfidf_fit"] = measure(semantic_model.SemanticModel.fit, [(fit_documents,)], stage=True)
+    semantic_model.set_model(semantic_model.SemanticModel.fit(fit_documents))
+    skill_index.rebuild((job.id, extract_skills_from_text(text), None) for job, text in zip(job_rows, cleaned_jds))
+
+    results["stage.features"] = measure(ResumeFeatures.from_text, [(text,) for text in resume_texts], stage=True)
+    results["stage.clean"] = measure(clean_text, [(text,) for text in resume_texts], stage=True)
+    results["stage.skill_extraction"] = measure(
+        extract_skills_from_text, [(text,) for text in cleaned_resumes], stage=True
+    )
+    results["stage.tfidf_score"] = measure(
+        semantic_scores, [(text, cleaned_jds) for text in cleaned_resumes], stage=True
+    )
+    results["stage.suggestions"] = measure(resume_suggestions, [(text,) for text in resume_texts], stage=True)
+
+    results["analyze_resume"] = measure(analyze_resume.uncached, pair_inputs)
+    results["analyze_resume_keywords"] = measure(analyze_resume_keywords.uncached, pair_inputs)
+    results["recommend_jobs"] = measure(recommend_jobs, [(text, job_rows) for text in resume_texts])
+    jobs_by_id = {job.id: job for job in job_rows}
+    results["recommend_jobs.retrieval"] = measure(
+        recommend_with_retrieval, [(text, jobs_by_id) for text in resume_texts]
+    )
+    results["suggest_jobs"] = measure(
+        suggest_jobs, [(extract_skills_from_text(text),) for text in cleaned_resumes]
+    )
+    results["final_category"] = measure(
+        final_category, [(text.splitlines()[1], text) for text in resume_texts]
+    )
+
+    if files:
+        with tempfile.TemporaryDirectory(prefix="iris-bench-") as directory:
+            paths = generator.files(directory, files, pages=pages)
+            results["extract_text_from_file"] = measure(extract_text_from_file, [(path,) for path in paths])
+
+    return {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "seed": seed,
+            "resumes": resumes,
+            "jobs": jobs,
+            "pairs": pairs,
+            "files": files,
+            "pages": pages,
+        },
+        "results": results,
+    }
+
+
+def _print_table(report: dict) -> None:
+    print(f"{'benchmark':<28}{'calls':>7}{'ops/s':>12}{'p50 ms':>11}{'p95 ms':>11}{'peak KiB':>12}")
+    for name, row in report["results"].items():
+        print(
+            f"{name:<28}{row['calls']:>7}{row['throughput_per_s']:>12}"
+            f"{row['p50_ms']:>11}{row['p95_ms']:>11}{row['peak_kib']:>12}"
+        )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--pairs", type=int, default=200, help="resume/JD pairs for per-pair functions")
+    parser.add_argument("--files", type=int, default=6, help="synthetic PDF/DOCX files to parse (0 to skip)")
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    report = run(args.resumes, args.jobs, args.pairs, args.files, args.pages, args.seed)
+    _print_table(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
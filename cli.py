@@ -0,0 +1,250 @@
+"""Flask CLI commands for maintaining derived data in the IRIS Job Portal."""
+
+import json
+import os
+
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+semantic_cli = AppGroup("semantic-model", help="Manage the corpus TF-IDF model.")
+
+
+@semantic_cli.command("refit")
+def refit_semantic_model() -> None:
+    """Refit the semantic model over every job description."""
+    from services import semantic_model
+    from services.catalog import job_documents
+
+    model = semantic_model.refit(job_documents())
+    click.echo(f"Semantic model refitted on {model.corpus_size} jobs (version {model.version}).")
+
+
+@semantic_cli.command("info")
+def semantic_model_info() -> None:
+    """Show the active semantic model version."""
+    from services import semantic_model
+
+    model = semantic_model.get_model()
+    click.echo(
+        f"version={model.version} corpus_size={model.corpus_size} "
+        f"stored_jobs={model.job_count} pending_updates={model.pending_updates}"
+    )
+
+
+analysis_cache_cli = AppGroup("analysis-cache", help="Inspect and prune the analysis cache.")
+
+
+@analysis_cache_cli.command("stats")
+def analysis_cache_stats() -> None:
+    """Show persistent cache size per kind and version."""
+    from models import AnalysisCacheEntry, db
+
+    rows = (
+        db.session.query(
+            AnalysisCacheEntry.kind,
+            AnalysisCacheEntry.version,
+            db.func.count(),
+            db.func.sum(db.func.length(AnalysisCacheEntry.result)),
+        )
+        .group_by(AnalysisCacheEntry.kind, AnalysisCacheEntry.version)
+        .all()
+    )
+    if not rows:
+        click.echo("The persistent analysis cache is empty.")
+    for kind, version, count, size in rows:
+        click.echo(f"{kind:<10} {version:<40} entries={count} bytes={size or 0}")
+
+
+@analysis_cache_cli.command("prune")
+def prune_analysis_cache() -> None:
+    """Delete persisted results computed by an older scoring version."""
+    from models import AnalysisCacheEntry, db
+    from services.ats_analyzer import analysis_version
+    from services.resume_parser import KEYWORD_SCORING_VERSION
+
+    deleted = AnalysisCacheEntry.query.filter(
+        AnalysisCacheEntry.version.notin_([analysis_version(), KEYWORD_SCORING_VERSION])
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    click.echo(f"Deleted {deleted} stale analysis cache entries.")
+
+
+job_features_cli = AppGroup("job-features", help="Maintain the stored per-job scoring features.")
+
+
+@job_features_cli.command("backfill")
+@click.option("--all", "force", is_flag=True, help="Recompute every row, not only missing or stale ones.")
+@click.option("--batch-size", default=500, show_default=True, help="Jobs per commit.")
+def backfill_job_features(force: bool, batch_size: int) -> None:
+    """Write job_features rows for jobs that lack current ones."""
+    from services.job_feature_store import backfill_job_features as backfill
+
+    written, scanned = backfill(force=force, batch_size=batch_size)
+    click.echo(f"Wrote features for {written} of {scanned} jobs.")
+
+
+talent_cli = AppGroup("talent-index", help="Maintain the resume fields used by talent search.")
+
+
+@talent_cli.command("backfill")
+@click.option("--all", "force", is_flag=True, help="Recompute every resume, not only missing or stale ones.")
+@click.option("--batch-size", default=200, show_default=True, help="Resumes per commit.")
+def backfill_talent_fields(force: bool, batch_size: int) -> None:
+    """Write skills, section bonus and vector for resumes that lack current ones."""
+    from services.talent_search import backfill_resume_search_fields
+
+    written, scanned = backfill_resume_search_fields(force=force, batch_size=batch_size)
+    click.echo(f"Wrote search fields for {written} of {scanned} resumes.")
+
+
+recommendations_cli = AppGroup("recommendations", help="Maintain the stored per-user job recommendations.")
+
+
+@recommendations_cli.command("rebuild")
+def rebuild_recommendations() -> None:
+    """Recompute the recommendation list of every user with a resume."""
+    from models import ResumeData, db
+    from services.recommendations import refresh_user_recommendations
+
+    user_ids = [
+        user_id
+        for (user_id,) in db.session.query(ResumeData.user_id).filter(ResumeData.import_id.is_(None)).distinct()
+    ]
+    for user_id in user_ids:
+        refresh_user_recommendations(user_id)
+    click.echo(f"Rebuilt recommendations for {len(user_ids)} users.")
+
+
+similar_jobs_cli = AppGroup("similar-jobs", help="Maintain the stored similar-job lists.")
+
+
+@similar_jobs_cli.command("rebuild")
+@click.option("--batch-size", default=200, show_default=True, help="Jobs per commit.")
+def rebuild_similar_jobs(batch_size: int) -> None:
+    """Recompute the similar-job list of every job."""
+    from models import Job, db
+    from services.similar_jobs import refresh_similar_jobs
+
+    job_ids = [job_id for (job_id,) in db.session.query(Job.id).order_by(Job.id)]
+    for start in range(0, len(job_ids), batch_size):
+        refresh_similar_jobs(job_ids[start:start + batch_size])
+    click.echo(f"Rebuilt similar jobs for {len(job_ids)} jobs.")
+
+
+duplicates_cli = AppGroup("duplicates", help="Detect near-duplicate jobs and resumes.")
+
+
+@duplicates_cli.command("cluster")
+@click.option("--batch-size", default=500, show_default=True, help="Rows per commit.")
+def cluster_duplicates(batch_size: int) -> None:
+    """Sign rows without a MinHash signature and re-flag near-duplicates."""
+    from services.duplicate_flags import cluster_duplicates as cluster
+
+    report = cluster(batch_size=batch_size)
+    click.echo(
+        f"Jobs: {report['job_signatures']} signed, {report['duplicate_jobs']} duplicates "
+        f"in {report['job_clusters']} clusters."
+    )
+    click.echo(
+        f"Resumes: {report['resume_signatures']} signed, {report['duplicate_resumes']} duplicates "
+        f"in {report['resume_clusters']} clusters."
+    )
+
+
+analytics_cli = AppGroup("analytics", help="Maintain the skill and role demand rollups.")
+
+
+@analytics_cli.command("rebuild")
+def rebuild_analytics() -> None:
+    """Recount the skill and role rollups from every job and each user's latest resume."""
+    from services.skill_analytics import rebuild_skill_analytics
+
+    totals = rebuild_skill_analytics()
+    click.echo(f"Recounted {totals['jobs']} jobs and {totals['resumes']} users.")
+
+
+site_metrics_cli = AppGroup("site-metrics", help="Maintain the daily counts behind the admin dashboard.")
+
+
+@site_metrics_cli.command("rebuild")
+def rebuild_site_metrics() -> None:
+    """Recount every day of the daily_metrics rollup from the users, jobs, applications and resumes."""
+    from services.site_metrics import rebuild_site_metrics as rebuild
+
+    totals = rebuild()
+    click.echo(
+        f"Counted {totals['user_count']} users, {totals['job_count']} jobs, "
+        f"{totals['application_count']} applications and {totals['resume_count']} resumes."
+    )
+
+
+categories_cli = AppGroup("categories", help="Maintain the stored resume categories.")
+
+
+@categories_cli.command("rebuild")
+@click.option("--batch-size", default=500, show_default=True, help="Resumes read per batch.")
+@click.option("--workers", default=0, show_default=True, help="Categorizer processes; 0 runs in this process.")
+def rebuild_categories(batch_size: int, workers: int) -> None:
+    """Recategorize every resume from its extracted text."""
+    from services.resume_categories import recategorize_resumes
+
+    changed, scanned = recategorize_resumes(batch_size=batch_size, workers=workers)
+    click.echo(f"Updated the category of {changed} of {scanned} resumes.")
+
+
+resume_import_cli = AppGroup("resume-import", help="Import ZIP archives of resumes for a recruiter.")
+
+
+@resume_import_cli.command("run")
+@click.argument("archive", type=click.Path(exists=True, dir_okay=False))
+@click.option("--employer", "email", required=True, help="Email of the employer account the resumes belong to.")
+@click.option("--workers", type=int, default=None, help="Analysis processes [default: RESUME_IMPORT_WORKERS].")
+@click.option("--batch-size", type=int, default=None, help="Resumes per commit [default: RESUME_IMPORT_BATCH_SIZE].")
+def run_resume_import(archive: str, email: str, workers: int | None, batch_size: int | None) -> None:
+    """Import every resume in ARCHIVE and print a line per file."""
+    from models import ResumeImport, User, db
+    from services.resume_import import run_import
+
+    user = User.query.filter_by(email=email, role="employer").first()
+    if user is None:
+        raise click.ClickException(f"No employer account uses {email}.")
+    record = ResumeImport(user_id=user.id, archive_name=os.path.basename(archive))
+    db.session.add(record)
+    db.session.commit()
+    record = run_import(record.id, archive, workers=workers, batch_size=batch_size)
+    for entry in json.loads(record.report or "[]"):
+        details = f"  {entry['message']}" if entry.get("message") else ""
+        click.echo(f"{entry['status']:<9} {entry['name']}{details}")
+    if record.status == "failed":
+        raise click.ClickException(record.message or "The archive could not be imported.")
+    click.echo(f"Imported {record.imported_count} of {record.file_count} files (import {record.id}).")
+
+
+resume_text_cli = AppGroup("resume-text", help="Maintain the stored resume text.")
+
+
+@resume_text_cli.command("compress")
+@click.option("--batch-size", default=500, show_default=True, help="Resumes per commit.")
+def compress_resume_text(batch_size: int) -> None:
+    """Move resume text stored plain into the compressed column."""
+    from services.resume_storage import compress_resume_texts
+
+    compressed = compress_resume_texts(batch_size=batch_size)
+    click.echo(f"Compressed the text of {compressed} resumes.")
+
+
+def register_commands(app: Flask) -> None:
+    """Attach maintenance command groups to the app."""
+    app.cli.add_command(semantic_cli)
+    app.cli.add_command(analysis_cache_cli)
+    app.cli.add_command(job_features_cli)
+    app.cli.add_command(talent_cli)
+    app.cli.add_command(recommendations_cli)
+    app.cli.add_command(similar_jobs_cli)
+    app.cli.add_command(duplicates_cli)
+    app.cli.add_command(analytics_cli)
+    app.cli.add_command(site_metrics_cli)
+    app.cli.add_command(categories_cli)
+    app.cli.add_command(resume_import_cli)
+    app.cli.add_command(resume_text_cli)
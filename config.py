@@ -50,6 +50,34 @@ class Config:
     MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", 8 * 1024 * 1024))
     UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", os.path.join(BASE_DIR, "uploads"))
     ALLOWED_EXTENSIONS = {"pdf", "docx", "doc"}
+    SEMANTIC_MODEL_PATH = os.getenv(
+        "SEMANTIC_MODEL_PATH", os.path.join(BASE_DIR, "instance", "semantic_model.joblib")
+    )
+    ANALYSIS_CACHE_MAX_BYTES = int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+    ANALYSIS_CACHE_PERSISTENT = os.getenv("ANALYSIS_CACHE_PERSISTENT", "1") == "1"
+    # 0 keeps recommendation scoring in the request process.
+    SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", 0))
+    SCORING_CHUNK_SIZE = int(os.getenv("SCORING_CHUNK_SIZE", 500))
+    SCORING_PARALLEL_MIN_JOBS = int(os.getenv("SCORING_PARALLEL_MIN_JOBS", 2000))
+    # Threads for background work such as re-ranking applicants after a job edit.
+    BACKGROUND_WORKERS = int(os.getenv("BACKGROUND_WORKERS", 1))
+    # Resume uploads are extracted and scored off the request by this many threads,
+    # each reading one file in a child process for at most the timeout in seconds.
+    RESUME_WORKERS = int(os.getenv("RESUME_WORKERS", 2))
+    RESUME_QUEUE_LIMIT = int(os.getenv("RESUME_QUEUE_LIMIT", 20))
+    RESUME_EXTRACTION_TIMEOUT = float(os.getenv("RESUME_EXTRACTION_TIMEOUT", 60))
+    # Text past these budgets is not read; the resume is marked truncated.
+    RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", 50))
+    RESUME_MAX_CHARS = int(os.getenv("RESUME_MAX_CHARS", 100_000))
+    # Processes per PDF for documents of at least RESUME_PARALLEL_MIN_PAGES pages; 0 reads pages serially.
+    RESUME_PAGE_WORKERS = int(os.getenv("RESUME_PAGE_WORKERS", 0))
+    RESUME_PARALLEL_MIN_PAGES = int(os.getenv("RESUME_PARALLEL_MIN_PAGES", 40))
+    # Bulk ZIP imports: processes analyzing resumes (0 for one per core), resumes per
+    # commit, and limits on the archive upload and on what one archive may hold.
+    RESUME_IMPORT_WORKERS = int(os.getenv("RESUME_IMPORT_WORKERS", 0))
+    RESUME_IMPORT_BATCH_SIZE = int(os.getenv("RESUME_IMPORT_BATCH_SIZE", 100))
+    RESUME_IMPORT_MAX_BYTES = int(os.getenv("RESUME_IMPORT_MAX_BYTES", 200 * 1024 * 1024))
+    RESUME_IMPORT_MAX_FILES = int(os.getenv("RESUME_IMPORT_MAX_FILES", 1000))
     APP_NAME = "IRIS Job Portal"
 
 
@@ -1,5 +1,6 @@
 """SQLAlchemy data models for the IRIS Job Portal."""
 
+import zlib
 from datetime import datetime
 
 from flask_sqlalchemy import SQLAlchemy
@@ -8,6 +9,17 @@ from werkzeug.security import check_password_hash, generate_password_hash
 db = SQLAlchemy()
 
 
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def stored_text(compressed: bytes | None, plain: str | None) -> str:
+    """Text kept compressed, or in the plain column of a row not yet compressed."""
+    if compressed is not None:
+        return zlib.decompress(compressed).decode("utf-8")
+    return plain or ""
+
+
 class User(db.Model):
     """System users with role-based access."""
 
@@ -19,10 +31,17 @@ class User(db.Model):
     password = db.Column(db.String(255), nullable=False)
     role = db.Column(db.String(20), nullable=False, default="user")
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # When user_recommendations was last computed in full; NULL until then, or once a listed job is deleted.
+    recommendations_built_at = db.Column(db.DateTime, nullable=True)
 
     jobs = db.relationship("Job", back_populates="employer", cascade="all, delete-orphan")
     applications = db.relationship("Application", back_populates="user", cascade="all, delete-orphan")
     resume_data = db.relationship("ResumeData", back_populates="user", cascade="all, delete-orphan")
+    resume_uploads = db.relationship("ResumeUpload", back_populates="user", cascade="all, delete-orphan")
+    resume_imports = db.relationship("ResumeImport", back_populates="user", cascade="all, delete-orphan")
+    recommendations = db.relationship(
+        "UserRecommendation", back_populates="user", cascade="all, delete-orphan"
+    )
 
     def set_password(self, raw_password: str) -> None:
         """Hash and store a password."""
@@ -43,9 +62,32 @@ class Job(db.Model):
     description = db.Column(db.Text, nullable=False)
     employer_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    minhash = db.deferred(db.Column(db.LargeBinary, nullable=True))
+    duplicate_of = db.Column(
+        db.Integer, db.ForeignKey("jobs.id", ondelete="SET NULL"), nullable=True, index=True
+    )
 
     employer = db.relationship("User", back_populates="jobs")
     applications = db.relationship("Application", back_populates="job", cascade="all, delete-orphan")
+    feature_entry = db.relationship(
+        "JobFeatureEntry", back_populates="job", uselist=False, cascade="all, delete-orphan"
+    )
+    recommendations = db.relationship(
+        "UserRecommendation", back_populates="job", cascade="all, delete-orphan"
+    )
+    similar_jobs = db.relationship(
+        "SimilarJob",
+        foreign_keys="SimilarJob.job_id",
+        back_populates="job",
+        cascade="all, delete-orphan",
+    )
+    similar_to = db.relationship(
+        "SimilarJob",
+        foreign_keys="SimilarJob.similar_job_id",
+        back_populates="similar_job",
+        cascade="all, delete-orphan",
+    )
 
 
 class Application(db.Model):
@@ -59,12 +101,17 @@ class Application(db.Model):
     resume_path = db.Column(db.String(255), nullable=False)
     score = db.Column(db.Integer, nullable=False, default=0)
     applied_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    ats_score = db.Column(db.Float, nullable=True)
+    matched_skills = db.Column(db.Text, nullable=True)
+    missing_skills = db.Column(db.Text, nullable=True)
+    ranked_at = db.Column(db.DateTime, nullable=True)
 
     user = db.relationship("User", back_populates="applications")
     job = db.relationship("Job", back_populates="applications")
 
     __table_args__ = (
         db.UniqueConstraint("user_id", "job_id", name="uq_user_job_application"),
+        db.Index("ix_applications_job_ats_score", "job_id", "ats_score"),
     )
 
 
@@ -75,11 +122,187 @@ class ResumeData(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
-    extracted_text = db.Column(db.Text, nullable=False)
+    # Read and written through `extracted_text`. Rows stored before compression keep the
+    # plain column until `flask resume-text compress` moves them over.
+    plain_text = db.deferred(db.Column("extracted_text", db.Text, nullable=True), group="text")
+    compressed_text = db.deferred(db.Column(db.LargeBinary(length=2**24), nullable=True), group="text")
     file_name = db.Column(db.String(255), nullable=False)
     original_name = db.Column(db.String(255), nullable=False)
     score = db.Column(db.Integer, nullable=False, default=0)
     keywords = db.Column(db.Text, nullable=False, default="")
+    keyword_terms = db.deferred(db.Column(db.Text, nullable=True))
+    features = db.Column(db.Text, nullable=True)
+    skills = db.Column(db.Text, nullable=True)
+    section_bonus = db.Column(db.Float, nullable=True)
+    vector = db.deferred(db.Column(db.LargeBinary, nullable=True))
+    vector_version = db.Column(db.String(80), nullable=True)
+    minhash = db.deferred(db.Column(db.LargeBinary, nullable=True))
+    duplicate_of = db.Column(
+        db.Integer, db.ForeignKey("resume_data.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    category = db.Column(db.String(40), nullable=True, index=True)
+    pages_processed = db.Column(db.Integer, nullable=True)
+    content_hash = db.Column(db.String(64), nullable=True, index=True)
+    text_truncated = db.Column(db.Boolean, nullable=False, default=False)
+    # Set on resumes a recruiter imported from an archive; those are not the user's own resume.
+    import_id = db.Column(
+        db.Integer, db.ForeignKey("resume_imports.id", ondelete="CASCADE"), nullable=True, index=True
+    )
     uploaded_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
     user = db.relationship("User", back_populates="resume_data")
+
+    @property
+    def extracted_text(self) -> str:
+        return stored_text(self.compressed_text, self.plain_text)
+
+    @extracted_text.setter
+    def extracted_text(self, text: str) -> None:
+        self.compressed_text = compress_text(text)
+        self.plain_text = None
+
+
+class ResumeUpload(db.Model):
+    """An uploaded resume file waiting for, or done with, background processing."""
+
+    __tablename__ = "resume_uploads"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+    file_name = db.Column(db.String(255), nullable=False)
+    original_name = db.Column(db.String(255), nullable=False)
+    content_hash = db.Column(db.String(64), nullable=True)
+    # queued -> processing -> ready | failed
+    status = db.Column(db.String(20), nullable=False, default="queued")
+    message = db.Column(db.String(255), nullable=True)
+    resume_id = db.Column(db.Integer, db.ForeignKey("resume_data.id", ondelete="SET NULL"), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    user = db.relationship("User", back_populates="resume_uploads")
+    resume = db.relationship("ResumeData")
+
+
+class ResumeImport(db.Model):
+    """A ZIP archive of resumes imported by a recruiter, with a per-file report."""
+
+    __tablename__ = "resume_imports"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+    archive_name = db.Column(db.String(255), nullable=False)
+    # queued -> processing -> done | failed
+    status = db.Column(db.String(20), nullable=False, default="queued")
+    message = db.Column(db.String(255), nullable=True)
+    file_count = db.Column(db.Integer, nullable=False, default=0)
+    imported_count = db.Column(db.Integer, nullable=False, default=0)
+    failed_count = db.Column(db.Integer, nullable=False, default=0)
+    report = db.deferred(db.Column(db.Text, nullable=True))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    user = db.relationship("User", back_populates="resume_imports")
+
+
+class UserRecommendation(db.Model):
+    """A user's top-N recommended jobs, maintained incrementally."""
+
+    __tablename__ = "user_recommendations"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey("jobs.id"), nullable=False, index=True)
+    score = db.Column(db.Float, nullable=False)
+    matched_skills = db.Column(db.Text, nullable=False, default="[]")
+    missing_skills = db.Column(db.Text, nullable=False, default="[]")
+    computed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    user = db.relationship("User", back_populates="recommendations")
+    job = db.relationship("Job", back_populates="recommendations")
+
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "job_id", name="uq_user_recommendation"),
+        db.Index("ix_user_recommendations_user_score", "user_id", "score"),
+    )
+
+
+class SimilarJob(db.Model):
+    """A job's nearest neighbors by description and skill similarity, maintained incrementally."""
+
+    __tablename__ = "similar_jobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey("jobs.id"), nullable=False)
+    similar_job_id = db.Column(db.Integer, db.ForeignKey("jobs.id"), nullable=False, index=True)
+    score = db.Column(db.Float, nullable=False)
+    computed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    job = db.relationship("Job", foreign_keys=[job_id], back_populates="similar_jobs")
+    similar_job = db.relationship("Job", foreign_keys=[similar_job_id], back_populates="similar_to")
+
+    __table_args__ = (
+        db.UniqueConstraint("job_id", "similar_job_id", name="uq_similar_job"),
+        db.Index("ix_similar_jobs_job_score", "job_id", "score"),
+    )
+
+
+class SkillDemand(db.Model):
+    """Rollup of one taxonomy skill across jobs and users' latest resumes."""
+
+    __tablename__ = "skill_demand"
+
+    skill = db.Column(db.String(60), primary_key=True)
+    job_count = db.Column(db.Integer, nullable=False, default=0)
+    resume_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class RoleDemand(db.Model):
+    """Rollup of one suggested role across jobs and users' latest resumes."""
+
+    __tablename__ = "role_demand"
+
+    role = db.Column(db.String(60), primary_key=True)
+    job_count = db.Column(db.Integer, nullable=False, default=0)
+    resume_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class DailyMetric(db.Model):
+    """Rollup of the users, jobs, applications and resumes created on one day that still exist."""
+
+    __tablename__ = "daily_metrics"
+
+    day = db.Column(db.Date, primary_key=True)
+    user_count = db.Column(db.Integer, nullable=False, default=0)
+    job_count = db.Column(db.Integer, nullable=False, default=0)
+    application_count = db.Column(db.Integer, nullable=False, default=0)
+    resume_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class JobFeatureEntry(db.Model):
+    """Scoring inputs derived from a job, written whenever the job is saved."""
+
+    __tablename__ = "job_features"
+
+    job_id = db.Column(db.Integer, db.ForeignKey("jobs.id"), primary_key=True)
+    version = db.Column(db.String(40), nullable=False)
+    job_updated_at = db.Column(db.DateTime, nullable=False)
+    clean_text = db.Column(db.Text, nullable=False)
+    skills = db.Column(db.Text, nullable=False, default="[]")
+    vector = db.Column(db.LargeBinary, nullable=True)
+    vector_version = db.Column(db.String(80), nullable=True)
+    keyword_terms = db.Column(db.Text, nullable=True)
+    computed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    job = db.relationship("Job", back_populates="feature_entry")
+
+
+class AnalysisCacheEntry(db.Model):
+    """Persistent tier of the content-addressed analysis cache."""
+
+    __tablename__ = "analysis_cache"
+
+    cache_key = db.Column(db.String(64), primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)
+    version = db.Column(db.String(80), nullable=False, index=True)
+    result = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
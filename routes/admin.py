@@ -1,12 +1,18 @@
 """Admin routes for managing users and jobs."""
 
-from collections import defaultdict
-from datetime import datetime
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, session, url_for
+from sqlalchemy.orm import joinedload
 
-from flask import Blueprint, flash, redirect, render_template, request, session, url_for
-
-from models import Application, Job, ResumeData, User, db
+from models import Application, Job, User, db
 from routes.auth import login_required, roles_required
+from services.analysis_cache import analysis_cache
+from services.catalog import job_deleted
+from services.duplicate_flags import duplicate_job_ids, resolve_job_duplicates
+from services.recommendations import stage_recommendation_removal
+from services.similar_jobs import referring_job_ids, schedule_similar_refresh
+from services.site_metrics import monthly_metrics, uncount_job, uncount_user
+from services.skill_analytics import skill_report, stage_job_removal, stage_user_removal
+from services.talent_search import user_deleted
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 
@@ -15,27 +21,20 @@ admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 @login_required
 @roles_required("admin")
 def dashboard():
-    """Render the admin dashboard."""
-    users = User.query.order_by(User.created_at.desc()).all()
-    jobs = Job.query.order_by(Job.created_at.desc()).all()
-    applications = Application.query.order_by(Application.applied_at.desc()).all()
-    resumes = ResumeData.query.order_by(ResumeData.uploaded_at.desc()).all()
-
-    monthly_metrics = defaultdict(lambda: {"users": 0, "jobs": 0, "applications": 0})
-    for user in users:
-        monthly_metrics[user.created_at.strftime("%b %Y")]["users"] += 1
-    for job in jobs:
-        monthly_metrics[job.created_at.strftime("%b %Y")]["jobs"] += 1
-    for application in applications:
-        monthly_metrics[application.applied_at.strftime("%b %Y")]["applications"] += 1
-
-    sorted_labels = sorted(
-        monthly_metrics.keys(),
-        key=lambda label: datetime.strptime(label, "%b %Y"),
+    """Render the admin dashboard from the daily rollups and a few bounded queries."""
+    months = monthly_metrics()
+    # ids follow creation order and, unlike the timestamps, are indexed.
+    recent_users = User.query.order_by(User.id.desc()).limit(5).all()
+    recent_jobs = Job.query.options(joinedload(Job.employer)).order_by(Job.id.desc()).limit(3).all()
+    recent_applications = (
+        Application.query.options(joinedload(Application.user), joinedload(Application.job))
+        .order_by(Application.id.desc())
+        .limit(4)
+        .all()
     )
 
     recent_activity = []
-    for user in users[:3]:
+    for user in recent_users[:3]:
         recent_activity.append(
             {
                 "icon": "fa-user-plus",
@@ -44,7 +43,7 @@ def dashboard():
                 "timestamp": user.created_at,
             }
         )
-    for job in jobs[:3]:
+    for job in recent_jobs:
         recent_activity.append(
             {
                 "icon": "fa-briefcase",
@@ -53,7 +52,7 @@ def dashboard():
                 "timestamp": job.created_at,
             }
         )
-    for application in applications[:4]:
+    for application in recent_applications:
         recent_activity.append(
             {
                 "icon": "fa-file-circle-check",
@@ -64,20 +63,33 @@ def dashboard():
         )
     recent_activity.sort(key=lambda item: item["timestamp"], reverse=True)
 
-    top_jobs = sorted(jobs, key=lambda job: len(job.applications), reverse=True)[:5]
+    applicant_counts = (
+        db.session.query(Application.job_id, db.func.count().label("applicants"))
+        .group_by(Application.job_id)
+        .subquery()
+    )
+    applicants = db.func.coalesce(applicant_counts.c.applicants, 0)
+    top_jobs = (
+        db.session.query(Job, applicants)
+        .options(joinedload(Job.employer))
+        .outerjoin(applicant_counts, applicant_counts.c.job_id == Job.id)
+        .order_by(applicants.desc(), Job.id.desc())
+        .limit(5)
+        .all()
+    )
 
     return render_template(
         "admin/dashboard.html",
-        user_count=len(users),
-        job_count=len(jobs),
-        application_count=len(applications),
-        resume_count=len(resumes),
-        chart_labels=sorted_labels,
-        chart_users=[monthly_metrics[label]["users"] for label in sorted_labels],
-        chart_jobs=[monthly_metrics[label]["jobs"] for label in sorted_labels],
-        chart_applications=[monthly_metrics[label]["applications"] for label in sorted_labels],
+        user_count=sum(month["user_count"] for month in months),
+        job_count=sum(month["job_count"] for month in months),
+        application_count=sum(month["application_count"] for month in months),
+        resume_count=sum(month["resume_count"] for month in months),
+        chart_labels=[month["month"].strftime("%b %Y") for month in months],
+        chart_users=[month["user_count"] for month in months],
+        chart_jobs=[month["job_count"] for month in months],
+        chart_applications=[month["application_count"] for month in months],
         recent_activity=recent_activity[:6],
-        recent_users=users[:5],
+        recent_users=recent_users,
         top_jobs=top_jobs,
     )
 
@@ -95,8 +107,19 @@ def users():
 
         user = User.query.get_or_404(user_id)
         try:
+            # The user's jobs are deleted along with them. Jobs are only flagged
+            # as duplicates of the same employer's jobs, so no flag outlives them.
+            job_ids = [job.id for job in user.jobs]
+            neighbors_of = referring_job_ids(job_ids)
+            stage_recommendation_removal(job_ids)
+            stage_user_removal(user)
+            uncount_user(user)
             db.session.delete(user)
             db.session.commit()
+            for job_id in job_ids:
+                job_deleted(job_id)
+            schedule_similar_refresh(neighbors_of)
+            user_deleted(user_id)
             flash("User deleted successfully.", "success")
         except Exception:
             db.session.rollback()
@@ -115,8 +138,16 @@ def jobs():
         job_id = request.form.get("job_id", type=int)
         job = Job.query.get_or_404(job_id)
         try:
+            neighbors_of = referring_job_ids([job_id])
+            duplicates = duplicate_job_ids(job_id)
+            stage_recommendation_removal([job_id])
+            stage_job_removal(job)
+            uncount_job(job)
             db.session.delete(job)
             db.session.commit()
+            job_deleted(job_id)
+            resolve_job_duplicates(duplicates)
+            schedule_similar_refresh(neighbors_of)
             flash("Job deleted successfully.", "success")
         except Exception:
             db.session.rollback()
@@ -127,6 +158,14 @@ def jobs():
     return render_template("admin/jobs.html", jobs=jobs)
 
 
+@admin_bp.route("/analytics")
+@login_required
+@roles_required("admin")
+def analytics():
+    """Skill and role demand in jobs against supply in resumes, read from the rollup tables."""
+    return render_template("admin/analytics.html", report=skill_report())
+
+
 @admin_bp.route("/applications")
 @login_required
 @roles_required("admin")
@@ -134,3 +173,11 @@ def applications():
     """Display all submitted applications."""
     records = Application.query.order_by(Application.applied_at.desc()).all()
     return render_template("admin/applications.html", applications=records)
+
+
+@admin_bp.route("/analysis-cache")
+@login_required
+@roles_required("admin")
+def analysis_cache_stats():
+    """Report this worker's analysis cache hit/miss counters for sizing."""
+    return jsonify(analysis_cache.stats())
@@ -5,6 +5,7 @@ from functools import wraps
 from flask import Blueprint, flash, redirect, render_template, request, session, url_for
 
 from models import User, db
+from services.site_metrics import count_added
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
@@ -69,6 +70,7 @@ def register():
             user = User(username=username, email=email, role=role)
             user.set_password(password)
             db.session.add(user)
+            count_added(user)
             db.session.commit()
             flash("Registration successful. Please sign in.", "success")
             return redirect(url_for("auth.login"))
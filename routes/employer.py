@@ -1,12 +1,30 @@
 """Employer routes for posting jobs and reviewing applicants."""
 
-from flask import Blueprint, flash, redirect, render_template, request, session, url_for
+import json
+import os
 
-from models import Application, Job, db
+from flask import Blueprint, current_app, flash, redirect, render_template, request, session, url_for
+from sqlalchemy.orm import joinedload, undefer
+from werkzeug.utils import secure_filename
+
+from models import Application, Job, ResumeImport, db
 from routes.auth import login_required, roles_required
+from services import resume_import
+from services.applicant_ranking import needs_ranking, schedule_ranking
+from services.catalog import job_saved
+from services.categorizer import CATEGORIES
+from services.recommendations import schedule_job_merge
+from services.similar_jobs import schedule_similar_update
+from services.site_metrics import count_added
+from services.talent_search import search_talent
 
 employer_bp = Blueprint("employer", __name__, url_prefix="/employer")
 
+TALENT_PAGE_SIZE = 20
+TALENT_MAX_PAGES = 50
+IMPORT_HISTORY_SIZE = 20
+IMPORT_QUEUE_FULL_MESSAGE = "Another archive is being imported. Please try again when it has finished."
+
 
 @employer_bp.route("/dashboard")
 @login_required
@@ -42,8 +60,20 @@ def post_job():
         try:
             job = Job(title=title, description=description, employer_id=session["user_id"])
             db.session.add(job)
+            count_added(job)
             db.session.commit()
+            job_saved(job)
+            schedule_job_merge(job.id)
+            schedule_similar_update(job.id)
             flash("Job posted successfully.", "success")
+            original = db.session.get(Job, job.duplicate_of) if job.duplicate_of is not None else None
+            # The earlier job may have been deleted since it was flagged.
+            if original is not None:
+                flash(
+                    f'This posting is nearly identical to your earlier job "{original.title}"; '
+                    "it is hidden from job listings and recommendations.",
+                    "warning",
+                )
             return redirect(url_for("employer.dashboard"))
         except Exception:
             db.session.rollback()
@@ -73,6 +103,10 @@ def edit_job(job_id: int):
             job.title = title
             job.description = description
             db.session.commit()
+            job_saved(job)
+            schedule_ranking(job.id)
+            schedule_job_merge(job.id)
+            schedule_similar_update(job.id)
             flash("Job updated successfully.", "success")
             return redirect(url_for("employer.dashboard"))
         except Exception:
@@ -93,8 +127,115 @@ def applicants(job_id: int):
         return redirect(url_for("employer.dashboard"))
 
     applications = (
-        Application.query.filter_by(job_id=job.id)
-        .order_by(Application.score.desc(), Application.applied_at.desc())
+        Application.query.options(joinedload(Application.user))
+        .filter_by(job_id=job.id)
+        .order_by(
+            Application.ats_score.is_(None),
+            Application.ats_score.desc(),
+            Application.score.desc(),
+            Application.applied_at.desc(),
+        )
+        .all()
+    )
+    ranking_pending = needs_ranking(job, applications)
+    if ranking_pending:
+        schedule_ranking(job.id)
+    rows = [
+        {
+            "application": application,
+            "matched_skills": json.loads(application.matched_skills or "[]"),
+            "missing_skills": json.loads(application.missing_skills or "[]"),
+        }
+        for application in applications
+    ]
+    return render_template(
+        "employer/job_applications.html", job=job, rows=rows, ranking_pending=ranking_pending
+    )
+
+
+@employer_bp.route("/jobs/<int:job_id>/talent")
+@login_required
+@roles_required("employer")
+def talent_search(job_id: int):
+    """Rank every candidate's latest resume against a job."""
+    job = Job.query.get_or_404(job_id)
+    if job.employer_id != session["user_id"]:
+        flash("You cannot search talent for that job.", "error")
+        return redirect(url_for("employer.dashboard"))
+
+    page = min(max(request.args.get("page", 1, type=int), 1), TALENT_MAX_PAGES)
+    category = request.args.get("category")
+    if category not in CATEGORIES:
+        category = None
+    candidates, total = search_talent(job, page, TALENT_PAGE_SIZE, category)
+    page_count = max(1, -(-min(total, TALENT_PAGE_SIZE * TALENT_MAX_PAGES) // TALENT_PAGE_SIZE))
+    return render_template(
+        "employer/talent_search.html",
+        job=job,
+        candidates=candidates,
+        page=page,
+        page_count=page_count,
+        total=total,
+        offset=(page - 1) * TALENT_PAGE_SIZE,
+        categories=CATEGORIES,
+        category=category,
+    )
+
+
+@employer_bp.route("/resumes/import", methods=["GET", "POST"])
+@login_required
+@roles_required("employer")
+def resume_imports():
+    """Upload a ZIP archive of resumes for bulk import, and list earlier imports."""
+    if request.method == "POST":
+        # An archive holds many resumes, so it gets a larger limit than a single upload.
+        request.max_content_length = current_app.config["RESUME_IMPORT_MAX_BYTES"]
+        archive = request.files.get("archive")
+        if not archive or archive.filename == "":
+            flash("Please choose a ZIP archive to import.", "error")
+            return redirect(url_for("employer.resume_imports"))
+
+        if os.path.splitext(archive.filename)[1].lower() != ".zip":
+            flash("Only ZIP archives can be imported.", "error")
+            return redirect(url_for("employer.resume_imports"))
+
+        if not resume_import.accepting():
+            flash(IMPORT_QUEUE_FULL_MESSAGE, "warning")
+            return redirect(url_for("employer.resume_imports"))
+
+        archive_path = resume_import.save_archive(archive, current_app.config["UPLOAD_FOLDER"])
+        record = ResumeImport(
+            user_id=session["user_id"], archive_name=secure_filename(archive.filename) or "archive.zip"
+        )
+        db.session.add(record)
+        db.session.commit()
+        if not resume_import.submit(record.id, archive_path):
+            db.session.delete(record)
+            db.session.commit()
+            os.remove(archive_path)
+            flash(IMPORT_QUEUE_FULL_MESSAGE, "warning")
+            return redirect(url_for("employer.resume_imports"))
+        flash("Archive uploaded. We are importing its resumes now.", "success")
+        return redirect(url_for("employer.resume_import_detail", import_id=record.id))
+
+    imports = (
+        ResumeImport.query.filter_by(user_id=session["user_id"])
+        .order_by(ResumeImport.created_at.desc())
+        .limit(IMPORT_HISTORY_SIZE)
         .all()
     )
-    return render_template("employer/job_applications.html", job=job, applications=applications)
+    return render_template("employer/resume_imports.html", imports=imports)
+
+
+@employer_bp.route("/resumes/imports/<int:import_id>")
+@login_required
+@roles_required("employer")
+def resume_import_detail(import_id: int):
+    """Progress of one import, then its per-file report."""
+    record = ResumeImport.query.options(undefer(ResumeImport.report)).get_or_404(import_id)
+    if record.user_id != session["user_id"]:
+        flash("You cannot view that import.", "error")
+        return redirect(url_for("employer.resume_imports"))
+    return render_template(
+        "employer/resume_import.html", record=record, report=json.loads(record.report or "[]")
+    )
@@ -1,17 +1,45 @@
 """User-facing job browsing, profile, resume upload, and application routes."""
 
+import json
 import os
-import uuid
 
-from flask import Blueprint, current_app, flash, redirect, render_template, request, session, url_for
+from flask import Blueprint, current_app, flash, g, jsonify, redirect, render_template, request, session, url_for
 from werkzeug.utils import secure_filename
 
-from models import Application, Job, ResumeData, User, db
+from models import Application, Job, ResumeData, ResumeUpload, User, db
 from routes.auth import login_required, roles_required
-from services.resume_parser import analyze_resume_keywords, extract_text_from_file
+from services import resume_pipeline
+from services.recommendations import schedule_user_refresh, user_recommendations
+from services.resume_parser import score_keyword_terms
+from services.resume_storage import latest_resume
+from services.similar_jobs import similar_jobs
+from services.site_metrics import count_added
+from services.skill_matcher import SkillMatcher
+from services.stored_keywords import job_keyword_terms, resume_keyword_terms
 
 user_bp = Blueprint("user", __name__, url_prefix="/user")
 
+QUEUE_FULL_MESSAGE = "Too many resumes are being analyzed right now. Please try again in a minute."
+
+JOB_CARD_SKILLS = [
+    "Python",
+    "Flask",
+    "JavaScript",
+    "React",
+    "HTML",
+    "CSS",
+    "SQL",
+    "MySQL",
+    "Docker",
+    "Git",
+    "REST API",
+    "UX",
+    "Accessibility",
+    "Machine Learning",
+    "Data Analysis",
+]
+JOB_CARD_SKILL_MATCHER = SkillMatcher(JOB_CARD_SKILLS)
+
 
 @user_bp.route("/dashboard")
 @login_required
@@ -19,20 +47,34 @@ user_bp = Blueprint("user", __name__, url_prefix="/user")
 def dashboard():
     """Render the user dashboard."""
     user_id = session["user_id"]
-    resumes = ResumeData.query.filter_by(user_id=user_id).order_by(ResumeData.uploaded_at.desc()).all()
+    resumes = _distinct_resumes(
+        ResumeData.query.filter_by(user_id=user_id).order_by(ResumeData.uploaded_at.desc()).all()
+    )
     applications = (
         Application.query.filter_by(user_id=user_id)
         .order_by(Application.applied_at.desc())
         .all()
     )
-    jobs = Job.query.order_by(Job.created_at.desc()).all()
-    featured_jobs = [_serialize_job_card(job) for job in jobs[:5]]
+    jobs = Job.query.filter(Job.duplicate_of.is_(None)).order_by(Job.created_at.desc()).limit(5).all()
+    featured_jobs = [_serialize_job_card(job) for job in jobs]
+    recommendations = user_recommendations(user_id)
+    # Not built since the first upload, or a job in the list was deleted.
+    if resumes and g.user.recommendations_built_at is None:
+        schedule_user_refresh(user_id)
     return render_template(
         "user/dashboard.html",
         resumes=resumes,
         applications=applications,
-        jobs=jobs[:5],
+        jobs=jobs,
         featured_jobs=featured_jobs,
+        recommendations=[
+            {
+                "job": recommendation.job,
+                "score": recommendation.score,
+                "matched_skills": json.loads(recommendation.matched_skills or "[]"),
+            }
+            for recommendation in recommendations
+        ],
     )
 
 
@@ -40,8 +82,8 @@ def dashboard():
 @login_required
 @roles_required("user")
 def job_listings():
-    """List available jobs."""
-    jobs = Job.query.order_by(Job.created_at.desc()).all()
+    """List available jobs, one per group of near-duplicate postings."""
+    jobs = Job.query.filter(Job.duplicate_of.is_(None)).order_by(Job.created_at.desc()).all()
     applied_job_ids = {
         application.job_id
         for application in Application.query.filter_by(user_id=session["user_id"]).all()
@@ -61,7 +103,7 @@ def job_listings():
 def profile():
     """Show the current user's profile using fields supported by the active model."""
     user = User.query.get_or_404(session["user_id"])
-    resumes = (
+    resumes = _distinct_resumes(
         ResumeData.query.filter_by(user_id=user.id)
         .order_by(ResumeData.uploaded_at.desc())
         .all()
@@ -83,7 +125,7 @@ def profile():
 @login_required
 @roles_required("user")
 def upload_resume():
-    """Upload a resume and store extracted analysis data."""
+    """Save an uploaded resume and queue it for background analysis."""
     if request.method == "POST":
         uploaded_file = request.files.get("resume")
         if not uploaded_file or uploaded_file.filename == "":
@@ -94,35 +136,77 @@ def upload_resume():
             flash("Only PDF, DOC, and DOCX files are allowed.", "error")
             return redirect(url_for("user.upload_resume"))
 
+        if not resume_pipeline.accepting():
+            flash(QUEUE_FULL_MESSAGE, "warning")
+            return redirect(url_for("user.upload_resume"))
+
         safe_name = secure_filename(uploaded_file.filename)
-        unique_name = f"{uuid.uuid4().hex}_{safe_name}"
-        stored_path = os.path.join(current_app.config["UPLOAD_FOLDER"], unique_name)
-        uploaded_file.save(stored_path)
-
-        try:
-            extracted_text = extract_text_from_file(stored_path)
-            analysis = analyze_resume_keywords(extracted_text)
-            resume_data = ResumeData(
-                user_id=session["user_id"],
-                extracted_text=extracted_text or "No readable text found.",
-                file_name=unique_name,
-                original_name=safe_name,
-                score=analysis["score"],
-                keywords=", ".join(analysis["keywords"]),
-            )
-            db.session.add(resume_data)
-            db.session.commit()
+        folder = current_app.config["UPLOAD_FOLDER"]
+        file_name, content_hash = resume_pipeline.save_upload(
+            uploaded_file, folder, os.path.splitext(safe_name)[1].lower()
+        )
+        stored_path = os.path.join(folder, file_name)
+
+        prior = resume_pipeline.analyzed_resume(content_hash)
+        if prior is not None:
+            # Seen before: reuse its extraction and analysis instead of queueing.
+            try:
+                resume_data = resume_pipeline.reuse_resume(session["user_id"], file_name, safe_name, prior)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                flash("The resume could not be processed.", "error")
+                return redirect(url_for("user.upload_resume"))
+            resume_pipeline.resume_committed(resume_data)
             flash("Resume uploaded and analyzed successfully.", "success")
             return redirect(url_for("user.resume_result", resume_id=resume_data.id))
-        except Exception:
-            db.session.rollback()
-            if os.path.exists(stored_path):
-                os.remove(stored_path)
-            flash("The resume could not be processed.", "error")
+
+        upload = ResumeUpload(
+            user_id=session["user_id"], file_name=file_name, original_name=safe_name, content_hash=content_hash
+        )
+        db.session.add(upload)
+        db.session.commit()
+        if not resume_pipeline.submit(upload.id, stored_path):
+            db.session.delete(upload)
+            db.session.commit()
+            resume_pipeline.release_file(stored_path)
+            flash(QUEUE_FULL_MESSAGE, "warning")
+            return redirect(url_for("user.upload_resume"))
+        flash("Resume uploaded. We are analyzing it now.", "success")
+        return redirect(url_for("user.resume_upload", upload_id=upload.id))
 
     return render_template("user/upload_resume.html")
 
 
+@user_bp.route("/resume/uploads/<int:upload_id>")
+@login_required
+@roles_required("user")
+def resume_upload(upload_id: int):
+    """Wait for an upload to be analyzed, then continue to its result."""
+    upload = ResumeUpload.query.get_or_404(upload_id)
+    if upload.user_id != session["user_id"]:
+        flash("You cannot access that resume.", "error")
+        return redirect(url_for("user.dashboard"))
+    state = resume_pipeline.upload_state(upload)
+    if state["status"] == "ready":
+        return redirect(url_for("user.resume_result", resume_id=state["resume_id"]))
+    return render_template("user/resume_pending.html", upload=upload, state=state)
+
+
+@user_bp.route("/resume/uploads/<int:upload_id>/status")
+@login_required
+@roles_required("user")
+def resume_upload_status(upload_id: int):
+    """Polled by the pending page; reads one resume_uploads row."""
+    upload = ResumeUpload.query.get_or_404(upload_id)
+    if upload.user_id != session["user_id"]:
+        return jsonify({"error": "not found"}), 404
+    state = resume_pipeline.upload_state(upload)
+    if state["status"] == "ready":
+        state["result_url"] = url_for("user.resume_result", resume_id=state["resume_id"])
+    return jsonify(state)
+
+
 @user_bp.route("/resume/<int:resume_id>")
 @login_required
 @roles_required("user")
@@ -141,17 +225,14 @@ def resume_result(resume_id: int):
 def job_detail(job_id: int):
     """Show details for a single job."""
     job = Job.query.get_or_404(job_id)
-    latest_resume = (
-        ResumeData.query.filter_by(user_id=session["user_id"])
-        .order_by(ResumeData.uploaded_at.desc())
-        .first()
-    )
+    resume = latest_resume(session["user_id"])
     has_applied = Application.query.filter_by(user_id=session["user_id"], job_id=job_id).first()
     return render_template(
         "user/job_detail.html",
         job=job,
-        latest_resume=latest_resume,
+        latest_resume=resume,
         has_applied=has_applied,
+        similar_jobs=similar_jobs(job_id),
     )
 
 
@@ -167,24 +248,21 @@ def apply_job(job_id: int):
         flash("You have already applied for this job.", "error")
         return redirect(url_for("user.job_detail", job_id=job_id))
 
-    latest_resume = (
-        ResumeData.query.filter_by(user_id=user_id)
-        .order_by(ResumeData.uploaded_at.desc())
-        .first()
-    )
-    if not latest_resume:
+    resume = latest_resume(user_id, ResumeData.id, ResumeData.file_name, ResumeData.keyword_terms)
+    if not resume:
         flash("Please upload a resume before applying.", "error")
         return redirect(url_for("user.upload_resume"))
 
     try:
-        analysis = analyze_resume_keywords(latest_resume.extracted_text, job.description)
+        analysis = score_keyword_terms(resume_keyword_terms(resume), job_keyword_terms(job))
         application = Application(
             user_id=user_id,
             job_id=job.id,
-            resume_path=os.path.join("uploads", latest_resume.file_name),
+            resume_path=os.path.join("uploads", resume.file_name),
             score=analysis["score"],
         )
         db.session.add(application)
+        count_added(application)
         db.session.commit()
         flash("Application submitted successfully.", "success")
     except Exception:
@@ -212,6 +290,17 @@ def _allowed_file(filename: str) -> bool:
     return extension in current_app.config["ALLOWED_EXTENSIONS"]
 
 
+def _distinct_resumes(resumes: list[ResumeData]) -> list[ResumeData]:
+    """Keep the first, newest-first, of each group of near-duplicate resumes."""
+    seen, distinct = set(), []
+    for resume in resumes:
+        group = resume.duplicate_of or resume.id
+        if group not in seen:
+            seen.add(group)
+            distinct.append(resume)
+    return distinct
+
+
 def _serialize_job_card(job: Job) -> dict:
     """Prepare compact job card display metadata for templates."""
     return {
@@ -223,25 +312,7 @@ def _serialize_job_card(job: Job) -> dict:
 
 def _extract_job_skills(description: str) -> list[str]:
     """Infer a few visible skill tags from the raw job description."""
-    normalized = description.lower()
-    vocabulary = [
-        "Python",
-        "Flask",
-        "JavaScript",
-        "React",
-        "HTML",
-        "CSS",
-        "SQL",
-        "MySQL",
-        "Docker",
-        "Git",
-        "REST API",
-        "UX",
-        "Accessibility",
-        "Machine Learning",
-        "Data Analysis",
-    ]
-    matches = [skill for skill in vocabulary if skill.lower() in normalized]
+    matches = [JOB_CARD_SKILLS[i] for i in sorted(JOB_CARD_SKILL_MATCHER.find_indexes(description))]
     return matches[:4] or ["Hiring", "Full Time", "Growth"]
 
 
@@ -0,0 +1,173 @@
+"""
+IRIS Analysis Cache
+Content-addressed memoization for resume analysis results.
+
+Keys hash the normalized resume and job text together with the scoring
+version, so results go stale automatically when the algorithm, the skill
+taxonomy or the semantic model changes. Entries live in an in-process LRU
+bounded by serialized size and, inside an app context, in the
+`analysis_cache` table so they survive restarts.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable
+
+from flask import current_app, has_app_context
+
+
+def normalize_text(text: str) -> str:
+    """Case and whitespace never change an analysis result, so they never change the key."""
+    return " ".join((text or "").lower().split())
+
+
+def cache_key(kind: str, version: str, *texts: str) -> str:
+    digest = hashlib.sha256()
+    for part in (kind, version, *texts):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """Thread-safe LRU of JSON-serialized results, evicting by total size."""
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, persistent: bool = True):
+        self.max_bytes = max_bytes
+        self.persistent = persistent
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(payload)
+
+        payload = self._load_persistent(key)
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.persistent_hits += 1
+            self._remember(key, payload)
+        return json.loads(payload)
+
+    def put(self, key: str, kind: str, version: str, result: dict) -> None:
+        payload = json.dumps(result)
+        with self._lock:
+            self._remember(key, payload)
+        self._store_persistent(key, kind, version, payload)
+
+    def _remember(self, key: str, payload: str) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = payload
+        self._bytes += len(payload)
+        while self._bytes > self.max_bytes:
+            _key, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.persistent_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "persistent_hits": self.persistent_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.persistent_hits) / lookups, 3) if lookups else 0.0,
+            }
+
+    # ── Persistent tier ──────────────────────────────────────────────────────
+    # Uses its own connection so a cache write never commits or rolls back
+    # whatever the calling route has pending in db.session.
+    def _load_persistent(self, key: str) -> str | None:
+        if not (self.persistent and has_app_context()):
+            return None
+        from models import AnalysisCacheEntry, db
+
+        try:
+            with db.engine.connect() as connection:
+                return connection.execute(
+                    db.select(AnalysisCacheEntry.result).where(AnalysisCacheEntry.cache_key == key)
+                ).scalar()
+        except Exception as exc:
+            current_app.logger.warning("Analysis cache read failed: %s", exc)
+            return None
+
+    def _store_persistent(self, key: str, kind: str, version: str, payload: str) -> None:
+        if not (self.persistent and has_app_context()):
+            return
+        from sqlalchemy.exc import IntegrityError
+
+        from models import AnalysisCacheEntry, db
+
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(
+                    db.insert(AnalysisCacheEntry).values(
+                        cache_key=key, kind=kind, version=version, result=payload
+                    )
+                )
+        except IntegrityError:
+            pass  # Another worker stored the same result first.
+        except Exception as exc:
+            current_app.logger.warning("Analysis cache write failed: %s", exc)
+
+
+analysis_cache = AnalysisCache()
+
+
+def configure(max_bytes: int, persistent: bool) -> None:
+    analysis_cache.clear()
+    analysis_cache.max_bytes = max_bytes
+    analysis_cache.persistent = persistent
+
+
+def memoized(kind: str, version: Callable[[], str], min_length: int = 0):
+    """
+    Cache a `fn(resume_text, job_text="")` analysis by content.
+    Texts whose normalized form is shorter than `min_length` bypass the cache,
+    because whitespace can decide whether they count as too short to score.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(resume_text: str, job_text: str = "") -> dict:
+            resume_norm = normalize_text(resume_text)
+            if len(resume_norm) < min_length:
+                return fn(resume_text, job_text)
+            current_version = version()
+            key = cache_key(kind, current_version, resume_norm, normalize_text(job_text))
+            result = analysis_cache.get(key)
+            if result is None:
+                result = fn(resume_text, job_text)
+                analysis_cache.put(key, kind, current_version, result)
+            return result
+
+        wrapper.uncached = fn
+        return wrapper
+
+    return decorator
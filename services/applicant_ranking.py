@@ -0,0 +1,95 @@
+"""
+IRIS Applicant Ranking
+Re-scores every applicant of a job with the full ATS analysis in one batch.
+
+Application.score is the quick keyword overlap taken at apply time; this
+stores the ATS score and matched/missing skills of each applicant's latest
+resume on the application, so the applicants page only reads them. A newer
+resume re-scores that user's applications, so every job's ranking keeps
+using the latest one.
+"""
+import json
+from datetime import datetime
+
+from sqlalchemy.orm import load_only
+
+from models import Application, Job, ResumeData, db
+from services import background
+from services.ats_analyzer import analyze_resumes_for_job, stored_job_features, stored_resume_features
+from services.resume_storage import latest_resume, latest_resume_ids
+
+
+def rank_applicants(job_id: int) -> int:
+    """Score all applicants of a job and store the results. Returns the number ranked."""
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return 0
+    applications = Application.query.filter_by(job_id=job_id).all()
+    if not applications:
+        return 0
+
+    latest_ids = latest_resume_ids({application.user_id for application in applications})
+    resumes = {
+        resume.user_id: resume
+        for resume in ResumeData.query.options(
+            load_only(ResumeData.id, ResumeData.user_id, ResumeData.features)
+        ).filter(ResumeData.id.in_(latest_ids))
+    }
+
+    ranked = [application for application in applications if application.user_id in resumes]
+    results = analyze_resumes_for_job(
+        [stored_resume_features(resumes[application.user_id]) for application in ranked],
+        stored_job_features(job),
+        job.id,
+    )
+    now = datetime.utcnow()
+    for application, result in zip(ranked, results):
+        application.ats_score = result["ats_score"]
+        application.matched_skills = json.dumps(result["matched_skills"])
+        application.missing_skills = json.dumps(result["missing_skills"])
+        application.ranked_at = now
+    # Applicants without a resume of their own keep the apply-time score; stamped
+    # so the applicants page does not queue them again on every visit.
+    for application in applications:
+        if application.user_id not in resumes:
+            application.ats_score = application.matched_skills = application.missing_skills = None
+            application.ranked_at = now
+    db.session.commit()
+    return len(ranked)
+
+
+def rank_user_applications(user_id: int) -> int:
+    """Score the user's latest resume against every job they applied to. Returns the number ranked."""
+    resume = latest_resume(user_id, ResumeData.id, ResumeData.features)
+    if resume is None:
+        return 0
+    features = stored_resume_features(resume)
+    applications = Application.query.filter_by(user_id=user_id).all()
+    now = datetime.utcnow()
+    for application in applications:
+        job = application.job
+        [result] = analyze_resumes_for_job([features], stored_job_features(job), job.id)
+        application.ats_score = result["ats_score"]
+        application.matched_skills = json.dumps(result["matched_skills"])
+        application.missing_skills = json.dumps(result["missing_skills"])
+        application.ranked_at = now
+    db.session.commit()
+    return len(applications)
+
+
+def schedule_ranking(job_id: int) -> None:
+    """Queue rank_applicants for the job on the background pool."""
+    background.submit(rank_applicants, job_id, key=("rank_applicants", job_id))
+
+
+def schedule_user_ranking(user_id: int) -> None:
+    """Queue rank_user_applications for the user on the background pool."""
+    background.submit(rank_user_applications, user_id, key=("rank_user_applications", user_id))
+
+
+def needs_ranking(job: Job, applications: list[Application]) -> bool:
+    """True when any application was never ranked or was ranked before the job's last edit."""
+    return any(
+        application.ranked_at is None or application.ranked_at < job.updated_at
+        for application in applications
+    )
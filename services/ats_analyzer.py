@@ -6,9 +6,16 @@ No spaCy model download required — pure scikit-learn approach.
 import re
 import json
 import math
+import hashlib
+from dataclasses import asdict, dataclass, field
+
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from services import semantic_model
+from services.analysis_cache import memoized
+from services.skill_matcher import SkillMatcher
+
 
 # ── Master skill taxonomy ────────────────────────────────────────────────────
 SKILL_TAXONOMY = {
@@ -62,6 +69,21 @@ SKILL_TAXONOMY = {
 
 ALL_SKILLS = [s for skills in SKILL_TAXONOMY.values() for s in skills]
 
+# Built once at import; finds every taxonomy skill in a single pass.
+SKILL_MATCHER = SkillMatcher(ALL_SKILLS)
+ALL_SKILLS_UNIQUE = SKILL_MATCHER.terms
+
+# Bump when the scoring formula changes; cached results keyed on the old value go stale.
+SCORING_VERSION = "1"
+TAXONOMY_VERSION = hashlib.sha1(
+    json.dumps(SKILL_TAXONOMY, sort_keys=True).encode("utf-8")
+).hexdigest()[:12]
+
+
+def analysis_version() -> str:
+    """Everything an analyze_resume result depends on besides its two texts."""
+    return f"{SCORING_VERSION}.{TAXONOMY_VERSION}.{semantic_model.get_model().version}"
+
 
 # ── Text utilities ────────────────────────────────────────────────────────────
 def clean_text(text: str) -> str:
@@ -72,14 +94,193 @@ def clean_text(text: str) -> str:
 
 
 def extract_skills_from_text(text: str) -> list[str]:
-    """Return deduplicated list of skills found in text."""
-    text_lower = text.lower()
-    found = []
-    for skill in ALL_SKILLS:
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(pattern, text_lower):
-            found.append(skill)
-    return list(dict.fromkeys(found))  # preserve order, dedupe
+    """Return deduplicated list of skills found in text, in taxonomy order."""
+    return SKILL_MATCHER.find(text)
+
+
+# ── Resume features ───────────────────────────────────────────────────────────
+# Points awarded by section_bonus for each section heading found.
+SECTION_POINTS = {
+    'education': 5,
+    'experience': 5,
+    'skills': 5,
+    'projects': 3,
+    'certifications': 2,
+    'summary': 2,
+    'achievements': 3,
+}
+# Words resume_suggestions looks for besides the scored sections.
+SUGGESTION_MARKERS = ('project', 'portfolio', 'certification', 'certified')
+
+_MARKER_TERMS = sorted(set(SECTION_POINTS) | set(SUGGESTION_MARKERS), key=len, reverse=True)
+# Lookahead so overlapping markers ("projectsummary") are all found, longest first.
+_MARKER_RE = re.compile("(?=(" + "|".join(map(re.escape, _MARKER_TERMS)) + "))")
+_FEATURE_TOKEN_RE = re.compile(r'(\s*)(?:(\w+)|([^\w\s]))')
+_CLEAN_PUNCTUATION = {'+', '#', '.'}
+_QUANTIFIER_RE = re.compile(r'\d+\s*%|\d+\s+\w+|\$\d+')
+
+# Bump when ResumeFeatures fields or their extraction rules change.
+FEATURES_VERSION = 1
+
+
+@dataclass
+class ResumeFeatures:
+    """
+    Everything the scoring and suggestion functions need from a resume,
+    computed in one tokenizing pass and serializable for storage.
+    """
+
+    text_length: int
+    clean_text: str
+    tokens: list[str] = field(default_factory=list)
+    skills: list[str] = field(default_factory=list)
+    sections: list[str] = field(default_factory=list)
+    quantifier_count: int = 0
+    word_count: int = 0
+
+    @classmethod
+    def from_text(cls, text: str) -> "ResumeFeatures":
+        text = text or ""
+        lowered = text.lower()
+        pairs = _FEATURE_TOKEN_RE.findall(lowered)
+
+        tokens, clean_parts, keys = [], [], []
+        word_count = quantifiers = 0
+        pending_gap = False
+        consumed = -1
+        for i, (space, word, punct) in enumerate(pairs):
+            token = word or punct
+            tokens.append(token)
+            if space or i == 0:
+                word_count += 1  # each whitespace-separated chunk starts with a token
+
+            # clean_text keeps word runs and + # . and turns other symbols into spaces
+            if word or punct in _CLEAN_PUNCTUATION:
+                if clean_parts and (space or pending_gap):
+                    clean_parts.append(" ")
+                    keys.append(" " + token)
+                else:
+                    keys.append(token)
+                clean_parts.append(token)
+                pending_gap = False
+            else:
+                pending_gap = True
+
+            # Same matches as re.findall(r'\d+\s*%|\d+\s+\w+|\$\d+'): a token consumed
+            # by one quantifier cannot start another.
+            if i <= consumed or i + 1 >= len(pairs):
+                continue
+            next_space, next_word, next_punct = pairs[i + 1]
+            if word and word[-1].isdecimal():
+                if next_punct == '%' or (next_space and next_word):
+                    quantifiers += 1
+                    consumed = i + 1
+            elif punct == '$' and not next_space and next_word[:1].isdecimal():
+                quantifiers += 1
+                if next_word.isdecimal():
+                    consumed = i + 1  # otherwise only its leading digits were used
+
+        if len(lowered) != len(text):
+            # Only "İ" lowercases to two characters, one of them a non-word
+            # mark; count on the original text as the quantifier rule expects.
+            quantifiers = len(_QUANTIFIER_RE.findall(text))
+            word_count = len(text.split())
+
+        found = set(_MARKER_RE.findall(lowered))
+        sections = sorted({term for term in _MARKER_TERMS if any(term in hit for hit in found)})
+
+        return cls(
+            text_length=len(text.strip()),
+            clean_text="".join(clean_parts),
+            tokens=tokens,
+            skills=[ALL_SKILLS_UNIQUE[i] for i in sorted(SKILL_MATCHER.find_indexes_in_keys(keys))],
+            sections=sections,
+            quantifier_count=quantifiers,
+            word_count=word_count,
+        )
+
+    def has(self, term: str) -> bool:
+        return term in self.sections
+
+    def to_dict(self) -> dict:
+        return {"version": FEATURES_VERSION, **asdict(self)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ResumeFeatures | None":
+        """Return None for features stored by an older extractor."""
+        if not data or data.get("version") != FEATURES_VERSION:
+            return None
+        return cls(**{key: value for key, value in data.items() if key != "version"})
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, payload: str | None) -> "ResumeFeatures | None":
+        try:
+            return cls.from_dict(json.loads(payload)) if payload else None
+        except (TypeError, ValueError):
+            return None
+
+
+def resume_features(resume: "str | ResumeFeatures") -> ResumeFeatures:
+    """Accept raw text or already extracted features."""
+    if isinstance(resume, ResumeFeatures):
+        return resume
+    return ResumeFeatures.from_text(resume)
+
+
+def stored_resume_features(resume: object) -> ResumeFeatures:
+    """Features saved on a ResumeData row, extracted again only if missing or outdated."""
+    features = ResumeFeatures.from_json(getattr(resume, "features", None))
+    return features or ResumeFeatures.from_text(resume.extracted_text)
+
+
+# ── Job features ──────────────────────────────────────────────────────────────
+# Stored job features are reused only when written under this version.
+JOB_FEATURES_VERSION = f"1.{TAXONOMY_VERSION}"
+
+
+@dataclass
+class JobFeatures:
+    """
+    Job side of the scoring inputs, computed once when a job is saved.
+    `vector` is the packed TF-IDF row, valid only for `vector_version`.
+    """
+
+    clean_text: str
+    skills: list[str] = field(default_factory=list)
+    vector: bytes | None = None
+    vector_version: str | None = None
+
+    @classmethod
+    def from_text(cls, text: str) -> "JobFeatures":
+        cleaned = clean_text(text) if text else ""
+        return cls(clean_text=cleaned, skills=extract_skills_from_text(cleaned) if cleaned else [])
+
+
+def job_features(jd: "str | JobFeatures") -> JobFeatures:
+    """Accept raw job description text or already extracted features."""
+    if isinstance(jd, JobFeatures):
+        return jd
+    return JobFeatures.from_text(jd)
+
+
+def stored_job_features(job: object) -> JobFeatures:
+    """Features saved for a job, extracted again if missing or older than the job."""
+    entry = getattr(job, "feature_entry", None)
+    if (
+        entry is not None
+        and entry.version == JOB_FEATURES_VERSION
+        and entry.job_updated_at == getattr(job, "updated_at", None)
+    ):
+        return JobFeatures(
+            clean_text=entry.clean_text,
+            skills=json.loads(entry.skills),
+            vector=entry.vector,
+            vector_version=entry.vector_version,
+        )
+    return JobFeatures.from_text(job_document_text(job))
 
 
 # ── Scoring ───────────────────────────────────────────────────────────────────
@@ -87,14 +288,35 @@ def keyword_score(resume_skills: list[str], jd_skills: list[str]) -> tuple[float
     """Hard keyword overlap score."""
     if not jd_skills:
         return 50.0, resume_skills, []
-    matched = [s for s in jd_skills if s in resume_skills]
-    missing = [s for s in jd_skills if s not in resume_skills]
+    resume_set = set(resume_skills)
+    matched = [s for s in jd_skills if s in resume_set]
+    missing = [s for s in jd_skills if s not in resume_set]
     score = (len(matched) / len(jd_skills)) * 100
     return round(score, 1), matched, missing
 
 
 def semantic_score(resume_text: str, jd_text: str) -> float:
-    """TF-IDF cosine similarity between resume and JD."""
+    """TF-IDF cosine similarity between resume and JD using the corpus model."""
+    return semantic_scores(resume_text, [jd_text])[0]
+
+
+def semantic_scores(
+    resume_text: str, jd_texts: list[str], job_ids: list | None = None, stored: list | None = None
+) -> list[float]:
+    """
+    Semantic similarity of one resume against many JDs in one sparse product.
+    `stored` holds (vector_version, packed vector) per JD, from JobFeatures.
+    """
+    if not jd_texts:
+        return []
+    model = semantic_model.get_model()
+    if model.is_fitted:
+        return model.similarities(resume_text, jd_texts, job_ids, stored)
+    return [_pairwise_semantic_score(resume_text, jd_text) for jd_text in jd_texts]
+
+
+def _pairwise_semantic_score(resume_text: str, jd_text: str) -> float:
+    """Fallback while the catalog is empty and there are no IDF weights to reuse."""
     try:
         vec = TfidfVectorizer(stop_words='english', max_features=5000)
         tfidf = vec.fit_transform([resume_text, jd_text])
@@ -104,61 +326,64 @@ def semantic_score(resume_text: str, jd_text: str) -> float:
         return 0.0
 
 
-def section_bonus(resume_text: str) -> float:
+def section_bonus(resume: "str | ResumeFeatures") -> float:
     """Award bonus points for having key resume sections."""
-    sections = {
-        'education': 5,
-        'experience': 5,
-        'skills': 5,
-        'projects': 3,
-        'certifications': 2,
-        'summary': 2,
-        'achievements': 3,
-    }
-    text_lower = resume_text.lower()
+    features = resume_features(resume)
     bonus = 0.0
-    for section, pts in sections.items():
-        if section in text_lower:
+    for section, pts in SECTION_POINTS.items():
+        if features.has(section):
             bonus += pts
     return min(bonus, 20.0)  # cap at 20
 
 
-def generate_suggestions(matched: list, missing: list, resume_text: str, semantic: float) -> list[str]:
+def generate_suggestions(matched: list, missing: list, resume: "str | ResumeFeatures", semantic: float) -> list[str]:
+    return _assemble_suggestions(missing, semantic, resume_suggestions(resume))
+
+
+def resume_suggestions(resume: "str | ResumeFeatures") -> list[str]:
+    """Suggestions that depend only on the resume, not on the job description."""
+    features = resume_features(resume)
     suggestions = []
 
-    if len(missing) > 0:
-        top_missing = missing[:5]
+    if not features.has('project') and not features.has('portfolio'):
         suggestions.append(
-            f"Add these in-demand skills to your resume: {', '.join(top_missing)}."
+            "Include a Projects section with 2–3 relevant projects to demonstrate hands-on experience."
         )
 
-    if semantic < 40:
+    if not features.has('certification') and not features.has('certified'):
         suggestions.append(
-            "Tailor your resume summary/objective to mirror the job description language."
+            "Add relevant certifications (AWS, Google, Microsoft, etc.) to boost credibility."
         )
 
-    resume_lower = resume_text.lower()
-    if 'project' not in resume_lower and 'portfolio' not in resume_lower:
+    if features.quantifier_count < 3:
         suggestions.append(
-            "Include a Projects section with 2–3 relevant projects to demonstrate hands-on experience."
+            "Quantify your achievements — use numbers, percentages, and metrics (e.g., 'Reduced load time by 40%')."
         )
 
-    if 'certification' not in resume_lower and 'certified' not in resume_lower:
+    if features.word_count < 300:
         suggestions.append(
-            "Add relevant certifications (AWS, Google, Microsoft, etc.) to boost credibility."
+            "Your resume appears thin. Expand experience descriptions with specific responsibilities and outcomes."
         )
 
-    quantifiers = re.findall(r'\d+\s*%|\d+\s+\w+|\$\d+', resume_text)
-    if len(quantifiers) < 3:
+    return suggestions
+
+
+def _assemble_suggestions(missing: list, semantic: float, resume_only: list[str]) -> list[str]:
+    suggestions = []
+
+    if len(missing) > 0:
+        top_missing = missing[:5]
         suggestions.append(
-            "Quantify your achievements — use numbers, percentages, and metrics (e.g., 'Reduced load time by 40%')."
+            f"Add these in-demand skills to your resume: {', '.join(top_missing)}."
         )
 
-    if len(resume_text.split()) < 300:
+    if semantic < 40:
         suggestions.append(
-            "Your resume appears thin. Expand experience descriptions with specific responsibilities and outcomes."
+            "Tailor your resume summary/objective to mirror the job description language."
         )
 
+    suggestions.extend(resume_only)
+
     if not suggestions:
         suggestions.append("Your resume is well-aligned. Keep it concise and ATS-friendly.")
 
@@ -166,73 +391,182 @@ def generate_suggestions(matched: list, missing: list, resume_text: str, semanti
 
 
 # ── Main entry point ──────────────────────────────────────────────────────────
+def job_document_text(job: object) -> str:
+    """Text that represents a job for scoring and for the semantic model corpus."""
+    return (
+        f"{job.title} {job.description or ''} "
+        f"{getattr(job, 'skills_required', '') or ''} "
+        f"{getattr(job, 'requirements', '') or ''}"
+    )
+
+
+@memoized("ats", analysis_version, min_length=50)
 def analyze_resume(resume_text: str, job_description: str = "") -> dict:
     """
     Full ATS analysis.
     Returns a dict with score, matched_skills, missing_skills, suggestions.
     """
-    if not resume_text or len(resume_text.strip()) < 50:
-        return {
-            "ats_score": 0,
-            "matched_skills": [],
-            "missing_skills": [],
-            "suggestions": ["Could not extract meaningful content from the resume."],
-            "semantic_score": 0,
-            "keyword_score": 0,
-            "skill_categories": {},
-        }
-
-    resume_clean = clean_text(resume_text)
-    jd_clean = clean_text(job_description) if job_description else ""
-
-    resume_skills = extract_skills_from_text(resume_clean)
-
-    if jd_clean:
-        jd_skills = extract_skills_from_text(jd_clean)
-    else:
-        # Generic scoring against full taxonomy when no JD provided
-        jd_skills = ALL_SKILLS[:60]
+    return analyze_resume_batch(resume_text, [job_description])[0]
 
-    kw_score, matched, missing = keyword_score(resume_skills, jd_skills)
-    sem_score = semantic_score(resume_clean, jd_clean) if jd_clean else 50.0
-    bonus = section_bonus(resume_text)
 
+def analyze_resume_batch(
+    resume_text: "str | ResumeFeatures",
+    jds: "list[str | JobFeatures]",
+    job_ids: list | None = None,
+    semantic: list[float | None] | None = None,
+) -> list[dict]:
+    """
+    ATS analysis of one resume against many job descriptions.
+    Resume-side work runs once, through ResumeFeatures (pass stored features
+    to skip it entirely), and all semantic similarities come from one sparse
+    product. JDs may likewise be stored JobFeatures instead of raw text.
+    Results are identical to calling analyze_resume for each JD.
+    `job_ids`, when given, lets the semantic model reuse stored job vectors;
+    `semantic` carries scores already computed with batch_semantic_scores.
+    """
+    if not resume_text:
+        return [_empty_analysis() for _jd in jds]
+    features = resume_features(resume_text)
+    if features.text_length < 50:
+        return [_empty_analysis() for _jd in jds]
+
+    resume_clean = features.clean_text
+    resume_skills = features.skills
+    bonus = section_bonus(features)
+    resume_only = resume_suggestions(features)
+
+    jd_features = [job_features(jd) for jd in jds]
+    jd_cleans = [jd.clean_text for jd in jd_features]
+    if semantic is None:
+        semantic = _semantic_for_cleaned(resume_clean, jd_features, job_ids)
+
+    results = []
+    for i, jd_clean in enumerate(jd_cleans):
+        if jd_clean:
+            jd_skills = jd_features[i].skills
+        else:
+            # Generic scoring against full taxonomy when no JD provided
+            jd_skills = ALL_SKILLS[:60]
+
+        kw_score, matched, missing = keyword_score(resume_skills, jd_skills)
+        sem_score = semantic[i] if jd_clean else 50.0
+        final = _final_score(kw_score, sem_score, bonus, bool(jd_clean), len(resume_skills))
+
+        # Categorise matched skills
+        skill_categories = {}
+        for cat, skills in SKILL_TAXONOMY.items():
+            cat_matched = [s for s in matched if s in skills]
+            if cat_matched:
+                skill_categories[cat] = cat_matched
+
+        results.append({
+            "ats_score": final,
+            "matched_skills": matched,
+            "missing_skills": missing[:20],
+            "suggestions": _assemble_suggestions(missing, sem_score, resume_only),
+            "semantic_score": sem_score,
+            "keyword_score": kw_score,
+            "skill_categories": skill_categories,
+        })
+    return results
+
+
+def analyze_resumes_for_job(
+    resumes: "list[str | ResumeFeatures]", jd: "str | JobFeatures", job_id: int | None = None
+) -> list[dict]:
+    """
+    Score many resumes against one job description: the job side is prepared
+    once and all semantic similarities come from one sparse product.
+    Each result holds the ats_score, matched_skills, missing_skills,
+    semantic_score and keyword_score analyze_resume_batch gives that pair.
+    """
+    jd = job_features(jd)
+    features = [resume_features(resume) for resume in resumes]
+    scorable = [i for i, item in enumerate(features) if item.text_length >= 50]
+    jd_skills = jd.skills if jd.clean_text else ALL_SKILLS[:60]
+
+    semantic = {}
+    if jd.clean_text and scorable:
+        model = semantic_model.get_model()
+        resume_cleans = [features[i].clean_text for i in scorable]
+        if model.is_fitted:
+            job_vector = model.job_vectors(
+                [job_id] if job_id is not None else None, [jd.clean_text], [(jd.vector_version, jd.vector)]
+            )
+            sims = (model.transform(resume_cleans) @ job_vector.T).toarray().ravel()
+            scores = [round(float(sim) * 100, 1) for sim in sims]
+        else:
+            scores = [_pairwise_semantic_score(resume_clean, jd.clean_text) for resume_clean in resume_cleans]
+        semantic = dict(zip(scorable, scores))
+
+    results = []
+    for i, item in enumerate(features):
+        if i not in semantic and item.text_length < 50:
+            empty = _empty_analysis()
+            del empty["suggestions"], empty["skill_categories"]
+            results.append(empty)
+            continue
+        kw_score, matched, missing = keyword_score(item.skills, jd_skills)
+        sem_score = semantic[i] if jd.clean_text else 50.0
+        results.append({
+            "ats_score": _final_score(kw_score, sem_score, section_bonus(item), bool(jd.clean_text), len(item.skills)),
+            "matched_skills": matched,
+            "missing_skills": missing[:20],
+            "semantic_score": sem_score,
+            "keyword_score": kw_score,
+        })
+    return results
+
+
+def _final_score(kw_score: float, sem_score: float, bonus: float, has_jd: bool, skill_count: int) -> float:
     # Weighted final score: 50% keyword, 30% semantic, 20% section bonus
-    if jd_clean:
+    if has_jd:
         final = (kw_score * 0.50) + (sem_score * 0.30) + (bonus * 1.0)
     else:
         # No JD: score based on resume completeness only
-        completeness = min((len(resume_skills) / 15) * 60, 60)
+        completeness = min((skill_count / 15) * 60, 60)
         final = completeness + bonus
+    return min(round(final, 1), 100.0)
+
+
+def batch_semantic_scores(
+    resume_text: "str | ResumeFeatures", jds: "list[str | JobFeatures]", job_ids: list | None = None
+) -> list[float | None]:
+    """Semantic scores aligned with jds (None where a JD is empty), for analyze_resume_batch."""
+    return _semantic_for_cleaned(
+        resume_features(resume_text).clean_text, [job_features(jd) for jd in jds], job_ids
+    )
 
-    final = min(round(final, 1), 100.0)
 
-    # Categorise matched skills
-    skill_categories = {}
-    for cat, skills in SKILL_TAXONOMY.items():
-        cat_matched = [s for s in matched if s in skills]
-        if cat_matched:
-            skill_categories[cat] = cat_matched
+def _semantic_for_cleaned(
+    resume_clean: str, jds: list[JobFeatures], job_ids: list | None
+) -> list[float | None]:
+    with_jd = [i for i, jd in enumerate(jds) if jd.clean_text]
+    scores = semantic_scores(
+        resume_clean,
+        [jds[i].clean_text for i in with_jd],
+        [job_ids[i] for i in with_jd] if job_ids is not None else None,
+        [(jds[i].vector_version, jds[i].vector) for i in with_jd],
+    )
+    aligned = [None] * len(jds)
+    for i, score in zip(with_jd, scores):
+        aligned[i] = score
+    return aligned
 
-    suggestions = generate_suggestions(matched, missing, resume_text, sem_score)
 
+def _empty_analysis() -> dict:
     return {
-        "ats_score": final,
-        "matched_skills": matched,
-        "missing_skills": missing[:20],
-        "suggestions": suggestions,
-        "semantic_score": sem_score,
-        "keyword_score": kw_score,
-        "skill_categories": skill_categories,
+        "ats_score": 0,
+        "matched_skills": [],
+        "missing_skills": [],
+        "suggestions": ["Could not extract meaningful content from the resume."],
+        "semantic_score": 0,
+        "keyword_score": 0,
+        "skill_categories": {},
     }
 
 
 def compute_job_match(resume_text: str, job: object) -> float:
     """Quick match score between a resume and a Job model instance."""
-    jd_text = (
-        f"{job.title} {job.description or ''} "
-        f"{getattr(job, 'skills_required', '') or ''} "
-        f"{getattr(job, 'requirements', '') or ''}"
-    )
-    result = analyze_resume(resume_text, jd_text)
+    result = analyze_resume_batch(resume_text, [stored_job_features(job)], [job.id])[0]
     return result["ats_score"]
@@ -0,0 +1,137 @@
+"""
+IRIS Background Tasks
+In-process thread pools for work that should not hold up a request.
+
+ExecutorSlot holds an executor that is created on first use, replaced when
+its worker count changes and shut down at exit. TaskQueue adds a bound on
+tasks accepted but not finished, and runs each task inside the submitting
+app's context. submit() is the shared queue for derived-data refreshes:
+tasks submitted with a key are coalesced, so while one with the same key
+is queued further submissions are dropped, and a burst of edits to one job
+queues a single re-rank.
+"""
+import atexit
+import functools
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Callable
+
+from flask import current_app
+
+_slots: list["ExecutorSlot"] = []
+
+
+class ExecutorSlot:
+    """An executor built by `factory(workers)` on first use."""
+
+    def __init__(self, factory: Callable[[int], Executor], workers: int = 1):
+        self.factory = factory
+        self.workers = workers
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        _slots.append(self)
+
+    def configure(self, workers: int) -> None:
+        with self._lock:
+            if self._executor is not None and workers != self.workers:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self.workers = workers
+
+    def executor(self) -> Executor:
+        with self._lock:
+            return self._current()
+
+    def _current(self) -> Executor:
+        if self._executor is None:
+            self._executor = self.factory(self.workers)
+        return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class TaskQueue(ExecutorSlot):
+    """A thread pool holding at most `max_queued` unfinished tasks; None for no limit."""
+
+    def __init__(self, name: str, workers: int = 1, max_queued: int | None = None):
+        super().__init__(
+            lambda count: ThreadPoolExecutor(max_workers=count, thread_name_prefix=name), workers
+        )
+        self.max_queued = max_queued
+        self._in_flight = 0
+
+    def configure(self, workers: int, max_queued: int | None = None) -> None:
+        super().configure(workers)
+        self.max_queued = max_queued
+
+    def accepting(self) -> bool:
+        """Whether the queue has room for another task."""
+        with self._lock:
+            return self.max_queued is None or self._in_flight < self.max_queued
+
+    def submit(self, fn: Callable, *args) -> Future | None:
+        """Run fn(*args) on the pool; None when the queue is full or the interpreter is exiting."""
+        app = current_app._get_current_object()
+        with self._lock:
+            if self.max_queued is not None and self._in_flight >= self.max_queued:
+                return None
+            try:
+                future = self._current().submit(self._run, app, fn, args)
+            except RuntimeError:
+                # Shut down: a task finishing at exit tried to queue a follow-up.
+                return None
+            self._in_flight += 1
+            return future
+
+    def _run(self, app, fn: Callable, args: tuple):
+        try:
+            with app.app_context():
+                try:
+                    return fn(*args)
+                except Exception:
+                    app.logger.exception("Background task %s failed", getattr(fn, "__name__", fn))
+                    raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+@atexit.register
+def _shutdown() -> None:
+    for slot in _slots:
+        slot.shutdown()
+
+
+_tasks = TaskQueue("iris-bg")
+_queued: set = set()
+_lock = threading.Lock()
+
+
+def configure(workers: int = 1) -> None:
+    _tasks.configure(max(int(workers), 1))
+
+
+def submit(fn: Callable, *args, key: object = None) -> Future | None:
+    """Run fn(*args) on the pool; returns None when an identical keyed task is already queued."""
+    with _lock:
+        if key is not None:
+            if key in _queued:
+                return None
+            _queued.add(key)
+
+    @functools.wraps(fn)
+    def run(*args):
+        # Release the key when the task starts, so writes made meanwhile queue a fresh run.
+        if key is not None:
+            with _lock:
+                _queued.discard(key)
+        return fn(*args)
+
+    future = _tasks.submit(run, *args)
+    if future is None and key is not None:
+        with _lock:
+            _queued.discard(key)
+    return future
@@ -0,0 +1,138 @@
+"""
+IRIS Catalog Sync
+Keeps data derived from the jobs table in step with job writes.
+"""
+from flask import current_app
+
+from models import Job, JobFeatureEntry, db
+from services import semantic_model
+from services.ats_analyzer import JOB_FEATURES_VERSION, JobFeatures, job_document_text
+from services.duplicate_flags import mark_job_duplicates
+from services.job_feature_store import iter_job_features, store_job_features
+from services.near_duplicates import job_duplicates, minhash_signature
+from services.skill_index import skill_index
+
+
+# ── Start-up ─────────────────────────────────────────────────────────────────
+def job_documents() -> list[tuple[int, str]]:
+    """(job_id, cleaned text) for every job, read from stored features where possible."""
+    return [(job_id, features.clean_text) for job_id, _updated_at, features in iter_job_features()]
+
+
+def reconcile_semantic_model(model) -> bool:
+    """
+    Bring a loaded semantic model in line with the jobs table: drop deleted
+    jobs and add jobs created or edited since their row was stored, from
+    their job_features vector while it belongs to this model.
+    """
+    if not model.is_fitted:
+        return True
+    try:
+        # Runs inside whatever request asked for the model; leave its pending rows alone.
+        with db.session.no_autoflush:
+            removed, stale = model.drift(dict(db.session.query(Job.id, Job.updated_at)))
+            model.remove_jobs(removed)
+            for start in range(0, len(stale), 500):
+                _restore_job_vectors(model, stale[start:start + 500])
+    except Exception as exc:
+        current_app.logger.warning("Semantic model reconcile failed: %s", exc)
+        return False
+    return True
+
+
+def _restore_job_vectors(model, job_ids: list[int]) -> None:
+    rows = (
+        db.session.query(
+            Job.id,
+            Job.title,
+            Job.description,
+            Job.updated_at,
+            JobFeatureEntry.version,
+            JobFeatureEntry.job_updated_at,
+            JobFeatureEntry.clean_text,
+            JobFeatureEntry.vector,
+            JobFeatureEntry.vector_version,
+        )
+        .outerjoin(JobFeatureEntry, JobFeatureEntry.job_id == Job.id)
+        .filter(Job.id.in_(job_ids))
+        .all()
+    )
+    texts, stored = [], []
+    for row in rows:
+        current = row.job_updated_at == row.updated_at
+        if current and row.vector is not None and row.vector_version == model.version:
+            # job_vectors unpacks the stored vector; the text is not needed.
+            texts.append("")
+            stored.append((row.vector_version, row.vector))
+            continue
+        stored.append(None)
+        if current and row.version == JOB_FEATURES_VERSION:
+            texts.append(row.clean_text)
+        else:
+            texts.append(JobFeatures.from_text(job_document_text(row)).clean_text)
+    if rows:
+        matrix = model.job_vectors(None, texts, stored)
+        model.store_vectors([row.id for row in rows], matrix, [row.updated_at for row in rows])
+
+
+def init_semantic_model(app) -> None:
+    """Load the persisted semantic model, refitting it when missing or stale."""
+    semantic_model.configure(app.config["SEMANTIC_MODEL_PATH"], reconcile_semantic_model)
+    model = semantic_model.get_model()
+    if model.needs_refit():
+        model = semantic_model.refit(job_documents())
+    app.logger.info("Semantic model version: %s", model.version)
+
+
+def init_skill_index(app) -> None:
+    """Build the in-memory skill -> jobs index from stored job features."""
+    skill_index.rebuild(
+        (job_id, features.skills, updated_at) for job_id, updated_at, features in iter_job_features()
+    )
+    app.logger.info("Skill index built for %s jobs", len(skill_index))
+
+
+# ── Write hooks ──────────────────────────────────────────────────────────────
+def job_saved(job: Job) -> None:
+    """Refresh derived data after a job is created or edited and committed."""
+    features = JobFeatures.from_text(job_document_text(job))
+    skill_index.upsert(job.id, features.skills, job.updated_at)
+
+    signature = minhash_signature(features.clean_text)
+    try:
+        mark_job_duplicates(job, signature)
+    except Exception as exc:
+        db.session.rollback()
+        current_app.logger.warning("Duplicate check failed for job %s: %s", job.id, exc)
+
+    vector, vector_version = None, None
+    try:
+        model = semantic_model.get_model()
+        if not model.is_fitted:
+            model = semantic_model.refit(job_documents())
+            if model.is_fitted:
+                vector = model.job_vectors([job.id], [features.clean_text])
+        else:
+            vector = semantic_model.upsert_job(job.id, features.clean_text, job.updated_at)
+        vector_version = model.version
+    except Exception as exc:
+        current_app.logger.warning("Semantic model update failed for job %s: %s", job.id, exc)
+
+    try:
+        store_job_features(job, features, vector, vector_version)
+        db.session.commit()
+    except Exception as exc:
+        db.session.rollback()
+        current_app.logger.warning("Storing features failed for job %s: %s", job.id, exc)
+    semantic_model.mark_changed()
+
+
+def job_deleted(job_id: int) -> None:
+    """Drop derived data for a deleted job."""
+    skill_index.remove(job_id)
+    job_duplicates.remove(job_id)
+    try:
+        semantic_model.remove_job(job_id)
+    except Exception as exc:
+        current_app.logger.warning("Semantic model removal failed for job %s: %s", job_id, exc)
+    semantic_model.mark_changed()
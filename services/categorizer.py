@@ -2,6 +2,7 @@
 IRIS Smart Categorization Service
 Degree-based + Skill-based auto-categorization
 """
+from services.skill_matcher import SkillMatcher
 
 DEGREE_MAP = {
     'bca':        'IT',
@@ -88,37 +89,40 @@ SKILL_KEYWORDS = {
     ],
 }
 
+# One matcher for every degree and skill keyword. SkillMatcher matches whole
+# tokens only, so short keywords like 'ca', 'ba' or 'ui' no longer fire
+# inside longer words ('cat', 'bba', 'build').
+CATEGORY_MATCHER = SkillMatcher(
+    [*DEGREE_MAP, *(kw for keywords in SKILL_KEYWORDS.values() for kw in keywords)]
+)
+_DEGREE_RANK = {
+    CATEGORY_MATCHER.terms.index(degree): rank for rank, degree in enumerate(DEGREE_MAP)
+}
+_DEGREE_CATEGORIES = list(DEGREE_MAP.values())
+_SKILL_CATEGORIES = {}
+for _category, _keywords in SKILL_KEYWORDS.items():
+    for _keyword in dict.fromkeys(_keywords):
+        _SKILL_CATEGORIES.setdefault(CATEGORY_MATCHER.terms.index(_keyword), []).append(_category)
 
-def detect_degree_category(text: str) -> str | None:
-    """Detect category based on degree keywords in text."""
-    text_lower = text.lower()
-    for degree, category in DEGREE_MAP.items():
-        if degree in text_lower:
-            return category
-    return None
+# Every category final_category can name on its own, for filters.
+CATEGORIES = sorted({*DEGREE_MAP.values(), *SKILL_KEYWORDS}) + ['General']
 
 
-def detect_skill_category(text: str) -> str | None:
-    """Detect category based on skill keyword frequency."""
-    text_lower = text.lower()
-    scores = {}
-    for category, keywords in SKILL_KEYWORDS.items():
-        score = sum(1 for kw in keywords if kw in text_lower)
-        if score > 0:
-            scores[category] = score
-    if not scores:
-        return None
-    return max(scores, key=scores.get)
+def _degree_category(indexes: set[int]) -> str | None:
+    ranks = [_DEGREE_RANK[index] for index in indexes if index in _DEGREE_RANK]
+    return _DEGREE_CATEGORIES[min(ranks)] if ranks else None
 
 
-def final_category(degree: str, resume_text: str) -> str:
-    """
-    Combine degree-based and skill-based detection.
-    Returns final category string.
-    """
-    deg_cat   = detect_degree_category(degree) if degree else None
-    skill_cat = detect_skill_category(resume_text) if resume_text else None
+def _skill_category(indexes: set[int]) -> str | None:
+    scores = dict.fromkeys(SKILL_KEYWORDS, 0)
+    for index in indexes:
+        for category in _SKILL_CATEGORIES.get(index, ()):
+            scores[category] += 1
+    category = max(scores, key=scores.get)
+    return category if scores[category] else None
+
 
+def _combine(deg_cat: str | None, skill_cat: str | None) -> str:
     if deg_cat and skill_cat:
         if deg_cat == skill_cat:
             return deg_cat
@@ -128,3 +132,42 @@ def final_category(degree: str, resume_text: str) -> str:
     if skill_cat:
         return skill_cat
     return 'General'
+
+
+def detect_degree_category(text: str) -> str | None:
+    """Detect category based on the first DEGREE_MAP keyword found in text."""
+    return _degree_category(CATEGORY_MATCHER.find_indexes(text))
+
+
+def detect_skill_category(text: str) -> str | None:
+    """Detect category based on skill keyword frequency (first category on ties)."""
+    return _skill_category(CATEGORY_MATCHER.find_indexes(text))
+
+
+def final_category(degree: str, resume_text: str) -> str:
+    """
+    Combine degree-based and skill-based detection.
+    Returns final category string.
+    """
+    deg_cat   = detect_degree_category(degree) if degree else None
+    skill_cat = detect_skill_category(resume_text) if resume_text else None
+    return _combine(deg_cat, skill_cat)
+
+
+def resume_category(resume_text: str) -> str:
+    """
+    Category stored on a resume. Its degree is read from the resume itself,
+    so one matcher pass serves both detections.
+    """
+    indexes = CATEGORY_MATCHER.find_indexes(resume_text)
+    return _combine(_degree_category(indexes), _skill_category(indexes))
+
+
+def category_parts(category: str | None) -> list[str]:
+    """The single categories in a final_category value ('IT + Finance' -> ['IT', 'Finance'])."""
+    return category.split(' + ') if category else []
+
+
+def categorize_texts(texts: list[str]) -> list[str]:
+    """resume_category for a batch; the process-pool entry point for recategorization."""
+    return [resume_category(text) for text in texts]
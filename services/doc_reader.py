@@ -0,0 +1,304 @@
+"""
+IRIS DOC Reader
+Streams the text of legacy Word (.doc) files.
+
+A .doc is an OLE2 compound file: a small FAT file system whose
+WordDocument stream holds the text in pieces, listed by the piece table in
+the 0Table or 1Table stream. Only the container headers, the piece table
+and the text pieces themselves are read, a sector at a time through
+seeks, so embedded images, formatting and fonts never leave the disk and
+reading stops as soon as the character budget is spent.
+"""
+import codecs
+import re
+import struct
+import sys
+from array import array
+from typing import Callable, Iterator
+
+SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+_FREE_SECTOR = 0xFFFFFFFF
+_END_OF_CHAIN = 0xFFFFFFFE
+_NO_STREAM = 0xFFFFFFFF
+_STREAM, _ROOT = 2, 5
+
+_WORD_IDENT = 0xA5EC
+# nFib of Word 97; earlier versions use another layout.
+_WORD97_NFIB = 0xC1
+_FIB_COMPLEX, _FIB_ENCRYPTED, _FIB_TABLE_1 = 0x0004, 0x0100, 0x0200
+# Position of fcClx/lcbClx among the FIB's fc/lcb pairs.
+_CLX_PAIR = 33
+
+_CHUNK_CHARS = 8192
+
+# Paragraph, cell, line, page and column marks, and field begin/separator/end.
+_MARKS = re.compile("([\r\x07\x0b\x0c\x0e\x13\x14\x15])")
+_FIELD_BEGIN, _FIELD_SEPARATOR, _FIELD_END = "\x13", "\x14", "\x15"
+# Non-breaking hyphen and space become plain ones; other control
+# characters are anchors for pictures, notes and comments.
+_CLEAN = {code: None for code in range(32) if code != 9}
+_CLEAN.update({0x1E: "-", 0xA0: " "})
+
+
+def is_compound_file(file_path: str) -> bool:
+    """Whether the file is an OLE2 compound file, as Word 97-2003 documents are."""
+    with open(file_path, "rb") as handle:
+        return handle.read(len(SIGNATURE)) == SIGNATURE
+
+
+class _Stream:
+    """A stream of the compound file, read in place through its sector chain."""
+
+    def __init__(self, read_sector: Callable[[int, int, int], bytes], sectors: list[int], sector_size: int, size: int):
+        self._read_sector = read_sector
+        self._sectors = sectors
+        self._sector_size = sector_size
+        self.size = min(size, len(sectors) * sector_size)
+
+    def read(self, offset: int, length: int) -> bytes:
+        """`length` bytes from `offset`. Raises ValueError past the end of the stream."""
+        if offset < 0 or length < 0 or offset + length > self.size:
+            raise ValueError("The document is damaged.")
+        parts = []
+        while length > 0:
+            index, start = divmod(offset, self._sector_size)
+            count = min(length, self._sector_size - start)
+            parts.append(self._read_sector(self._sectors[index], start, count))
+            offset += count
+            length -= count
+        return b"".join(parts)
+
+
+class _CompoundFile:
+    """The directory and allocation tables of an open compound file."""
+
+    def __init__(self, handle):
+        self._handle = handle
+        handle.seek(0, 2)
+        file_size = handle.tell()
+        header = self._read_at(0, 512)
+        if header[:8] != SIGNATURE:
+            raise ValueError("The file is not a Word document.")
+        sector_shift, mini_shift = struct.unpack_from("<HH", header, 30)
+        if sector_shift not in (9, 12) or mini_shift != 6:
+            raise ValueError("The document is damaged.")
+        self._sector_size = 1 << sector_shift
+        self._mini_size = 1 << mini_shift
+        (fat_count, first_directory, _signature, self._mini_cutoff,
+         first_mini_fat, mini_fat_count, first_difat, difat_count) = struct.unpack_from("<8I", header, 44)
+        # Chains can be no longer than the file has sectors; anything longer loops.
+        self._max_sectors = max(file_size // self._sector_size, 1)
+        if fat_count > self._max_sectors or difat_count > self._max_sectors:
+            raise ValueError("The document is damaged.")
+
+        fat_sectors = [sector for sector in struct.unpack_from("<109I", header, 76) if sector != _FREE_SECTOR]
+        per_difat = self._sector_size // 4 - 1
+        sector = first_difat
+        for _ in range(difat_count):
+            if sector >= self._max_sectors:
+                break
+            entries = struct.unpack(f"<{per_difat + 1}I", self._read_sector(sector, 0, self._sector_size))
+            fat_sectors.extend(entry for entry in entries[:per_difat] if entry != _FREE_SECTOR)
+            sector = entries[per_difat]
+        self._fat = array("I")
+        for sector in fat_sectors[:fat_count]:
+            self._fat.frombytes(self._read_sector(sector, 0, self._sector_size))
+        if sys.byteorder == "big":
+            self._fat.byteswap()
+
+        self._directory = self._regular_stream(first_directory, None)
+        root = self._entry(0)
+        if root is None or root[1] != _ROOT:
+            raise ValueError("The document is damaged.")
+        self._mini_stream = self._regular_stream(root[2], root[3])
+        self._mini_fat = array("I")
+        if mini_fat_count:
+            mini_fat = self._regular_stream(first_mini_fat, None)
+            self._mini_fat.frombytes(mini_fat.read(0, min(mini_fat.size, mini_fat_count * self._sector_size)))
+            if sys.byteorder == "big":
+                self._mini_fat.byteswap()
+        self._root_child = root[4]
+
+    def _read_at(self, offset: int, length: int) -> bytes:
+        self._handle.seek(offset)
+        data = self._handle.read(length)
+        if len(data) != length:
+            raise ValueError("The document is damaged.")
+        return data
+
+    def _read_sector(self, sector: int, start: int, length: int) -> bytes:
+        return self._read_at((sector + 1) * self._sector_size + start, length)
+
+    def _read_mini_sector(self, sector: int, start: int, length: int) -> bytes:
+        return self._mini_stream.read(sector * self._mini_size + start, length)
+
+    @staticmethod
+    def _chain(table: array, start: int, limit: int) -> list[int]:
+        sectors = []
+        while start != _END_OF_CHAIN:
+            if start >= len(table) or len(sectors) >= limit:
+                raise ValueError("The document is damaged.")
+            sectors.append(start)
+            start = table[start]
+        return sectors
+
+    def _regular_stream(self, start: int, size: int | None) -> _Stream:
+        sectors = self._chain(self._fat, start, self._max_sectors)
+        size = len(sectors) * self._sector_size if size is None else size
+        return _Stream(self._read_sector, sectors, self._sector_size, size)
+
+    def _entry(self, index: int) -> tuple | None:
+        """(name, type, start sector, size, child) of a directory entry, or None past the directory."""
+        if (index + 1) * 128 > self._directory.size:
+            return None
+        data = self._directory.read(index * 128, 128)
+        name_size, kind = struct.unpack_from("<HB", data, 64)
+        (child,) = struct.unpack_from("<I", data, 76)
+        start, size = struct.unpack_from("<IQ", data, 116)
+        if self._sector_size == 512:
+            # Version 3 files leave the high half of the size undefined.
+            size &= 0xFFFFFFFF
+        name = data[:max(min(name_size, 64) - 2, 0)].decode("utf-16-le", errors="ignore")
+        return name, kind, start, size, child
+
+    def _sibling_ids(self, index: int) -> tuple[int, int]:
+        return struct.unpack("<II", self._directory.read(index * 128 + 68, 8))
+
+    def root_streams(self) -> dict[str, tuple[int, int]]:
+        """(start sector, size) of each stream directly under the root storage, by name."""
+        streams, pending, seen = {}, [self._root_child], set()
+        while pending:
+            index = pending.pop()
+            if index == _NO_STREAM or index in seen:
+                continue
+            seen.add(index)
+            entry = self._entry(index)
+            if entry is None:
+                raise ValueError("The document is damaged.")
+            name, kind, start, size, _child = entry
+            if kind == _STREAM:
+                streams[name] = (start, size)
+            pending.extend(self._sibling_ids(index))
+        return streams
+
+    def open_stream(self, start: int, size: int) -> _Stream:
+        if size < self._mini_cutoff:
+            sectors = self._chain(self._mini_fat, start, len(self._mini_fat))
+            return _Stream(self._read_mini_sector, sectors, self._mini_size, size)
+        return self._regular_stream(start, size)
+
+
+def _pieces(word: _Stream, table: _Stream | None, nfib: int, flags: int) -> Iterator[tuple[int, int, bool]]:
+    """(offset in WordDocument, characters, 8-bit) of each text piece, in document order."""
+    if nfib < _WORD97_NFIB:
+        if flags & _FIB_COMPLEX:
+            raise ValueError("Fast-saved Word 6/95 documents are not supported.")
+        text_start, text_end = struct.unpack("<II", word.read(0x18, 8))
+        yield text_start, max(text_end - text_start, 0), True
+        return
+    if table is None:
+        raise ValueError("The document is damaged.")
+
+    position = 32
+    (word_count,) = struct.unpack("<H", word.read(position, 2))
+    position += 2 + word_count * 2
+    (long_count,) = struct.unpack("<H", word.read(position, 2))
+    position += 2 + long_count * 4
+    (pair_count,) = struct.unpack("<H", word.read(position, 2))
+    if pair_count <= _CLX_PAIR:
+        raise ValueError("The document is damaged.")
+    clx_offset, clx_size = struct.unpack("<II", word.read(position + 2 + _CLX_PAIR * 8, 8))
+
+    # The Clx holds formatting runs (type 1) and then the piece table (type 2).
+    end = clx_offset + clx_size
+    while clx_offset < end:
+        (kind,) = table.read(clx_offset, 1)
+        if kind == 1:
+            (run_size,) = struct.unpack("<h", table.read(clx_offset + 1, 2))
+            clx_offset += 3 + max(run_size, 0)
+            continue
+        if kind != 2:
+            break
+        (size,) = struct.unpack("<I", table.read(clx_offset + 1, 4))
+        count, remainder = divmod(size - 4, 12)
+        if size < 4 or remainder:
+            break
+        positions = struct.unpack(f"<{count + 1}I", table.read(clx_offset + 5, (count + 1) * 4))
+        descriptors = table.read(clx_offset + 5 + (count + 1) * 4, count * 8)
+        for index in range(count):
+            (raw,) = struct.unpack_from("<I", descriptors, index * 8 + 2)
+            characters = positions[index + 1] - positions[index]
+            if raw & 0x40000000:
+                # 8-bit text sits at half the recorded offset.
+                yield (raw & 0x3FFFFFFF) // 2, characters, True
+            else:
+                yield raw & 0x3FFFFFFF, characters, False
+        return
+    raise ValueError("The document is damaged.")
+
+
+def _characters(word: _Stream, pieces: Iterator[tuple[int, int, bool]]) -> Iterator[str]:
+    """The document's raw characters, a chunk at a time."""
+    for offset, characters, eight_bit in pieces:
+        if characters <= 0:
+            continue
+        width = 1 if eight_bit else 2
+        decoder = codecs.getincrementaldecoder("cp1252" if eight_bit else "utf-16-le")(errors="ignore")
+        for start in range(0, characters, _CHUNK_CHARS):
+            count = min(_CHUNK_CHARS, characters - start)
+            yield decoder.decode(word.read(offset + start * width, count * width))
+
+
+def iter_paragraphs(file_path: str, max_chars: int) -> Iterator[str]:
+    """
+    Paragraphs (and table cells) of a Word 97-2003 document, with field
+    instructions left out. Reading stops once more than `max_chars`
+    characters have been produced. Raises ValueError for a file that is not
+    a readable Word document, or one protected by a password.
+    """
+    with open(file_path, "rb") as handle:
+        try:
+            compound = _CompoundFile(handle)
+            streams = compound.root_streams()
+            if "WordDocument" not in streams:
+                raise ValueError("The file is not a Word document.")
+            word = compound.open_stream(*streams["WordDocument"])
+            ident, nfib = struct.unpack("<HH", word.read(0, 4))
+            (flags,) = struct.unpack("<H", word.read(10, 2))
+            if ident != _WORD_IDENT:
+                raise ValueError("The file is not a Word document.")
+            if flags & _FIB_ENCRYPTED:
+                raise ValueError("The document is password protected.")
+            table_name = "1Table" if flags & _FIB_TABLE_1 else "0Table"
+            table = compound.open_stream(*streams[table_name]) if table_name in streams else None
+
+            # One entry per open field: True once past its instructions, into the shown result.
+            fields, paragraph, produced = [], [], 0
+            for chunk in _characters(word, _pieces(word, table, nfib, flags)):
+                for token in _MARKS.split(chunk):
+                    if token == _FIELD_BEGIN:
+                        fields.append(False)
+                    elif token == _FIELD_SEPARATOR:
+                        if fields:
+                            fields[-1] = True
+                    elif token == _FIELD_END:
+                        if fields:
+                            fields.pop()
+                    elif not all(fields):
+                        continue
+                    elif len(token) == 1 and _MARKS.fullmatch(token):
+                        yield "".join(paragraph)
+                        paragraph = []
+                        produced += 1
+                    else:
+                        text = token.translate(_CLEAN)
+                        paragraph.append(text)
+                        produced += len(text)
+                    if produced > max_chars:
+                        yield "".join(paragraph)
+                        return
+            if paragraph:
+                yield "".join(paragraph)
+        except struct.error:
+            raise ValueError("The document is damaged.") from None
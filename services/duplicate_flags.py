@@ -0,0 +1,169 @@
+"""
+IRIS Duplicate Flags
+Keeps the duplicate_of columns of jobs and resumes in step with their writes.
+
+A job is a duplicate when it near-duplicates an earlier job of the same
+employer and points at the earliest such job; a resume likewise within one
+user's resumes. The MinHash signatures are stored next to the flags so the
+job index can be rebuilt at start-up without re-reading any text.
+"""
+from flask import current_app
+from sqlalchemy.orm import load_only
+
+from models import Job, ResumeData, db
+from services.ats_analyzer import ResumeFeatures, stored_resume_features
+from services.job_feature_store import iter_job_features
+from services.near_duplicates import (
+    earliest_duplicate,
+    job_duplicates,
+    minhash_signature,
+    pack_signature,
+    unpack_signature,
+)
+
+
+def init_duplicate_index(app) -> None:
+    """Build the job near-duplicate index from stored MinHash signatures."""
+    rows = (
+        db.session.query(Job.id, Job.employer_id, Job.minhash, Job.duplicate_of)
+        .filter(Job.minhash.isnot(None))
+        .yield_per(1000)
+    )
+    job_duplicates.rebuild(
+        (row.id, unpack_signature(row.minhash), row.employer_id, row.duplicate_of) for row in rows
+    )
+    app.logger.info("Duplicate index built for %s jobs", len(job_duplicates))
+
+
+def mark_job_duplicates(job: Job, signature) -> None:
+    """
+    Store the job's signature and re-derive duplicate_of for it and for the
+    employer's later jobs it may now duplicate or no longer does; commits.
+    A job is a duplicate when it near-duplicates an earlier job of the same
+    employer, and points at the earliest such job.
+    """
+    job_duplicates.add(job.id, signature, job.employer_id)
+    affected = {job.id}
+    if signature is not None:
+        affected.update(other for other in job_duplicates.matches(signature, job.employer_id) if other > job.id)
+    affected.update(other for (other,) in db.session.query(Job.id).filter(Job.duplicate_of == job.id))
+
+    values = {job.id: {"minhash": pack_signature(signature)}}
+    for other, current in db.session.query(Job.id, Job.duplicate_of).filter(Job.id.in_(affected)):
+        duplicate_of = job_duplicates.earliest_match(other)
+        job_duplicates.set_duplicate(other, duplicate_of)
+        if duplicate_of != current:
+            values.setdefault(other, {})["duplicate_of"] = duplicate_of
+    for other, changes in values.items():
+        # Derived columns: keep updated_at, which stamps the job's stored features.
+        db.session.execute(
+            db.update(Job).where(Job.id == other).values(updated_at=Job.updated_at, **changes)
+        )
+    db.session.commit()
+
+
+def duplicate_job_ids(job_id: int) -> list[int]:
+    """Jobs flagged as duplicates of job_id; read before deleting it, since the flags are cleared with it."""
+    return [other for (other,) in db.session.query(Job.id).filter(Job.duplicate_of == job_id)]
+
+
+def resolve_job_duplicates(job_ids: list[int]) -> None:
+    """Re-derive duplicate_of for jobs whose earlier duplicate was deleted."""
+    for job_id in job_ids:
+        duplicate_of = job_duplicates.earliest_match(job_id)
+        job_duplicates.set_duplicate(job_id, duplicate_of)
+        db.session.execute(
+            db.update(Job).where(Job.id == job_id).values(updated_at=Job.updated_at, duplicate_of=duplicate_of)
+        )
+    db.session.commit()
+
+
+def resume_duplicate_fields(user_id: int, features: ResumeFeatures) -> dict:
+    """
+    MinHash signature of a new resume, and the user's earliest resume it
+    near-duplicates. A user has few resumes, so they are compared directly.
+    """
+    signature = minhash_signature(features.clean_text)
+    earlier = [
+        (resume_id, unpack_signature(payload))
+        for resume_id, payload in db.session.query(ResumeData.id, ResumeData.minhash).filter(
+            ResumeData.user_id == user_id, ResumeData.minhash.isnot(None)
+        )
+    ]
+    return {"minhash": pack_signature(signature), "duplicate_of": earliest_duplicate(signature, earlier)}
+
+
+def cluster_duplicates(batch_size: int = 500) -> dict:
+    """
+    Compute missing MinHash signatures for jobs and resumes, then re-derive
+    duplicate_of for every row: jobs through the LSH index within each
+    employer, resumes directly within each user. Returns counts for a report.
+    """
+    report = {"job_signatures": 0, "resume_signatures": 0}
+
+    missing = {job_id for (job_id,) in db.session.query(Job.id).filter(Job.minhash.is_(None))}
+    pending = []
+    for job_id, _updated_at, features in iter_job_features():
+        if job_id in missing:
+            pending.append((job_id, pack_signature(minhash_signature(features.clean_text))))
+        if len(pending) >= batch_size:
+            report["job_signatures"] += _write_job_columns(pending, "minhash")
+            pending = []
+    report["job_signatures"] += _write_job_columns(pending, "minhash")
+
+    init_duplicate_index(current_app)
+    changes = []
+    for job_id, current in db.session.query(Job.id, Job.duplicate_of).order_by(Job.id).all():
+        duplicate_of = job_duplicates.earliest_match(job_id)
+        job_duplicates.set_duplicate(job_id, duplicate_of)
+        if duplicate_of != current:
+            changes.append((job_id, duplicate_of))
+    for start in range(0, len(changes), batch_size):
+        _write_job_columns(changes[start:start + batch_size], "duplicate_of")
+    report["duplicate_jobs"] = len(job_duplicates.duplicate_of)
+    report["job_clusters"] = len(set(job_duplicates.duplicate_of.values()))
+
+    resume_ids = [resume_id for (resume_id,) in db.session.query(ResumeData.id).filter(ResumeData.minhash.is_(None))]
+    for start in range(0, len(resume_ids), batch_size):
+        for resume in ResumeData.query.options(load_only(ResumeData.id, ResumeData.features)).filter(
+            ResumeData.id.in_(resume_ids[start:start + batch_size])
+        ):
+            resume.minhash = pack_signature(minhash_signature(stored_resume_features(resume).clean_text))
+            report["resume_signatures"] += 1
+        db.session.commit()
+
+    report["duplicate_resumes"] = 0
+    clusters = set()
+    earlier, user_id = [], None
+    rows = (
+        db.session.query(ResumeData.id, ResumeData.user_id, ResumeData.minhash, ResumeData.duplicate_of)
+        .order_by(ResumeData.user_id, ResumeData.id)
+        .yield_per(1000)
+    )
+    changes = []
+    for row in rows:
+        if row.user_id != user_id:
+            earlier, user_id = [], row.user_id
+        signature = unpack_signature(row.minhash)
+        duplicate_of = earliest_duplicate(signature, earlier)
+        earlier.append((row.id, signature))
+        if duplicate_of is not None:
+            report["duplicate_resumes"] += 1
+            clusters.add(duplicate_of)
+        if duplicate_of != row.duplicate_of:
+            changes.append({"id": row.id, "duplicate_of": duplicate_of})
+    for start in range(0, len(changes), batch_size):
+        db.session.execute(db.update(ResumeData), changes[start:start + batch_size])
+        db.session.commit()
+    report["resume_clusters"] = len(clusters)
+    return report
+
+
+def _write_job_columns(values: list[tuple[int, object]], column: str) -> int:
+    """Set one derived column on many jobs without touching updated_at; commits."""
+    for job_id, value in values:
+        db.session.execute(
+            db.update(Job).where(Job.id == job_id).values({column: value, "updated_at": Job.updated_at})
+        )
+    db.session.commit()
+    return len(values)
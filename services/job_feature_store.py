@@ -0,0 +1,112 @@
+"""
+IRIS Job Feature Store
+Per-job scoring features stored in job_features when a job is posted or edited.
+
+Rows are stamped with the job's updated_at and the extraction version, so a
+reader can tell a current row from one left behind by an edit or an
+extractor change and re-extract only those.
+"""
+import json
+from datetime import datetime
+from typing import Iterator
+
+from sqlalchemy.orm import selectinload
+
+from models import Job, JobFeatureEntry, db
+from services import semantic_model
+from services.ats_analyzer import JOB_FEATURES_VERSION, JobFeatures, job_document_text
+from services.resume_parser import keyword_terms, pack_terms
+from services.skill_analytics import counted_job_skills, stage_job_skills
+
+
+def iter_job_features() -> Iterator[tuple[int, datetime, JobFeatures]]:
+    """(job_id, updated_at, features) for every job, re-extracting only missing or stale rows."""
+    rows = (
+        db.session.query(
+            Job.id,
+            Job.title,
+            Job.description,
+            Job.updated_at,
+            JobFeatureEntry.version,
+            JobFeatureEntry.job_updated_at,
+            JobFeatureEntry.clean_text,
+            JobFeatureEntry.skills,
+        )
+        .outerjoin(JobFeatureEntry, JobFeatureEntry.job_id == Job.id)
+        .order_by(Job.id)
+        .yield_per(1000)
+    )
+    for row in rows:
+        if row.version == JOB_FEATURES_VERSION and row.job_updated_at == row.updated_at:
+            features = JobFeatures(clean_text=row.clean_text, skills=json.loads(row.skills))
+        else:
+            features = JobFeatures.from_text(job_document_text(row))
+        yield row.id, row.updated_at, features
+
+
+def scoring_jobs(job_ids: list[int] | None = None) -> list[Job]:
+    """
+    Jobs (all, or job_ids) with their stored features loaded in one extra
+    query, ready for recommend_jobs. Near-duplicate jobs are left out.
+    """
+    query = Job.query.options(selectinload(Job.feature_entry)).filter(Job.duplicate_of.is_(None))
+    if job_ids is not None:
+        query = query.filter(Job.id.in_(job_ids))
+    return query.order_by(Job.id).all()
+
+
+def store_job_features(job: Job, features: JobFeatures, vector=None, vector_version: str | None = None) -> None:
+    """Stage the job_features row for a job; the caller commits."""
+    stage_job_skills(counted_job_skills(job.feature_entry), features.skills)
+    entry = job.feature_entry or JobFeatureEntry(job_id=job.id)
+    entry.version = JOB_FEATURES_VERSION
+    entry.job_updated_at = job.updated_at
+    entry.clean_text = features.clean_text
+    entry.skills = json.dumps(features.skills)
+    entry.vector = semantic_model.pack_vector(vector) if vector is not None else None
+    entry.vector_version = vector_version if vector is not None else None
+    entry.keyword_terms = pack_terms(keyword_terms(job.description))
+    entry.computed_at = datetime.utcnow()
+    job.feature_entry = entry
+
+
+def backfill_job_features(force: bool = False, batch_size: int = 500) -> tuple[int, int]:
+    """
+    Write job_features rows that are missing, stale or hold a vector from an
+    older semantic model. Returns (rows written, jobs scanned).
+    """
+    model = semantic_model.get_model()
+    vector_version = model.version if model.is_fitted else None
+    job_ids = [job_id for (job_id,) in db.session.query(Job.id).order_by(Job.id)]
+    written = 0
+    for start in range(0, len(job_ids), batch_size):
+        jobs = (
+            Job.query.options(selectinload(Job.feature_entry))
+            .filter(Job.id.in_(job_ids[start:start + batch_size]))
+            .all()
+        )
+        if not force:
+            jobs = [job for job in jobs if _needs_backfill(job, vector_version)]
+        if not jobs:
+            continue
+        features = [JobFeatures.from_text(job_document_text(job)) for job in jobs]
+        vectors = None
+        if vector_version is not None:
+            vectors = model.job_vectors([job.id for job in jobs], [item.clean_text for item in features])
+        for position, (job, item) in enumerate(zip(jobs, features)):
+            vector = vectors[position] if vectors is not None else None
+            store_job_features(job, item, vector, vector_version)
+        db.session.commit()
+        written += len(jobs)
+    return written, len(job_ids)
+
+
+def _needs_backfill(job: Job, vector_version: str | None) -> bool:
+    entry = job.feature_entry
+    return (
+        entry is None
+        or entry.version != JOB_FEATURES_VERSION
+        or entry.job_updated_at != job.updated_at
+        or entry.vector_version != vector_version
+        or entry.keyword_terms is None
+    )
@@ -2,7 +2,25 @@
 IRIS Job Recommendation Engine
 Ranks jobs based on resume-to-JD similarity.
 """
-from services.ats_analyzer import analyze_resume, extract_skills_from_text, clean_text
+import heapq
+import threading
+
+import numpy as np
+from scipy import sparse
+
+from services import parallel_scoring, semantic_model
+from services.ats_analyzer import (
+    ALL_SKILLS_UNIQUE,
+    ResumeFeatures,
+    analyze_resume_batch,
+    clean_text,
+    extract_skills_from_text,
+    resume_features,
+    section_bonus,
+    stored_job_features,
+)
+from services.near_duplicates import job_duplicates
+from services.skill_index import skill_index
 
 JOB_ROLE_SKILL_MAP = {
     "Backend Developer": {
@@ -56,47 +74,269 @@ JOB_ROLE_SKILL_MAP = {
 }
 
 
-def recommend_jobs(resume_text: str, jobs: list, top_n: int = 6) -> list[dict]:
+def recommend_jobs(resume_text: "str | ResumeFeatures", jobs: list, top_n: int = 6) -> list[dict]:
     """
-    Score every job against the resume and return top_n ranked results.
+    Rank jobs against the resume and return top_n results.
     Each item: { job, score, matched_skills, missing_skills }
+    Accepts stored ResumeFeatures in place of the resume text; job features
+    stored in job_features are used when loaded on the jobs (see
+    job_feature_store.scoring_jobs), so only jobs without them are re-extracted.
+
+    Jobs sharing a skill with the resume (per the skill index) are scored
+    first. A job sharing none scores at most 30 + section bonus, so the rest
+    of the catalog is only scored while that bound could still enter the
+    top_n. Ordering matches a full stable sort by score.
     """
-    if not resume_text or not jobs:
+    if not resume_text or not jobs or top_n <= 0:
         return []
 
-    resume_clean = clean_text(resume_text)
-    resume_skills = extract_skills_from_text(resume_clean)
-    scored = []
+    features = resume_features(resume_text)
+    active_jobs = [job for job in jobs if getattr(job, "is_active", True)]
+    resume_skills = set(features.skills)
+
+    candidates, others = [], []
+    for position, job in enumerate(active_jobs):
+        job_skills = skill_index.skills_of(job.id, getattr(job, "updated_at", None))
+        # Unknown/stale jobs and jobs without taxonomy skills are always scored.
+        if job_skills is None or not job_skills or job_skills & resume_skills:
+            candidates.append(position)
+        else:
+            others.append(position)
+
+    rows = _top_rows(features, active_jobs, candidates, top_n)
+    if others:
+        outside_bound = min(round(30 + section_bonus(features), 1), 100.0)
+        if len(rows) < top_n or rows[-1][0] <= outside_bound:
+            rows = heapq.nsmallest(
+                top_n,
+                rows + _top_rows(features, active_jobs, others, top_n),
+                key=_rank_key,
+            )
+
+    return [
+        {
+            "job": active_jobs[position],
+            "score": score,
+            "matched_skills": matched,
+            "missing_skills": missing,
+        }
+        for score, position, matched, missing in rows
+    ]
+
+
+def _rank_key(row: tuple) -> tuple:
+    return -row[0], row[1]
 
-    for job in jobs:
-        if not getattr(job, "is_active", True):
-            continue
 
-        jd_text = (
-            f"{job.title} {job.description or ''} "
-            f"{getattr(job, 'skills_required', '') or ''} "
-            f"{getattr(job, 'requirements', '') or ''}"
+def _top_rows(features: ResumeFeatures, jobs: list, positions: list[int], top_n: int) -> list[tuple]:
+    """Top (score, position, matched, missing) rows among jobs[positions], best first."""
+    if not positions:
+        return []
+    jd_texts = [stored_job_features(jobs[position]) for position in positions]
+    job_ids = [jobs[position].id for position in positions]
+
+    if parallel_scoring.is_enabled_for(len(positions)):
+        return [
+            (score, positions[index], matched, missing)
+            for score, index, matched, missing in parallel_scoring.rank_parallel(
+                features, jd_texts, job_ids, top_n
+            )
+        ]
+
+    # Bounded min-heap: the root is the worst row kept so far.
+    heap = []
+    for position, result in zip(positions, analyze_resume_batch(features, jd_texts, job_ids)):
+        entry = (result["ats_score"], -position, result)
+        if len(heap) < top_n:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+    return sorted(
+        (
+            (score, -negative_position, result["matched_skills"][:8], result["missing_skills"][:5])
+            for score, negative_position, result in heap
+        ),
+        key=_rank_key,
+    )
+
+
+# ── Skill incidence ───────────────────────────────────────────────────────────
+SKILL_COLUMN = {skill: column for column, skill in enumerate(ALL_SKILLS_UNIQUE)}
+
+
+def skill_incidence(skill_lists: list) -> sparse.csr_matrix:
+    """Row x taxonomy-skill 0/1 matrix; skills outside the taxonomy are ignored."""
+    indptr, columns = [0], []
+    for skills in skill_lists:
+        columns.extend(sorted({SKILL_COLUMN[skill] for skill in skills if skill in SKILL_COLUMN}))
+        indptr.append(len(columns))
+    return sparse.csr_matrix(
+        (np.ones(len(columns)), columns, indptr), shape=(len(skill_lists), len(ALL_SKILLS_UNIQUE))
+    )
+
+
+# ── Catalog retrieval ─────────────────────────────────────────────────────────
+# Rows per sparse product, bounding the temporaries of one retrieval.
+RETRIEVAL_BLOCK_ROWS = 8192
+# Upper limit on jobs passed to full scoring, even when many estimates tie.
+RETRIEVAL_MAX_SHORTLIST = 200
+# Rounding of the keyword, semantic and final scores moves an ATS score at
+# most 0.09 away from the unrounded estimate.
+ROUNDING_SLACK = 0.1
+
+# Weight of TF-IDF cosine against skill-set overlap in job-to-job similarity.
+SIMILAR_SEMANTIC_WEIGHT = 0.7
+
+
+class CatalogMatrix:
+    """
+    Every job in the semantic model as row-aligned sparse matrices: the
+    stored TF-IDF rows and a job x skill incidence matrix from the skill
+    index. Together they give the ATS score of every job in a few blocked
+    sparse products, up to rounding.
+    """
+
+    def __init__(self, model: semantic_model.SemanticModel):
+        self.key = _catalog_key(model)
+        self.model = model
+        job_ids, self.semantic = model.stored_jobs()
+        self.job_ids = np.asarray(job_ids, dtype=np.int64)
+
+        skill_lists, unknown = [], []
+        for row, job_id in enumerate(self.job_ids.tolist()):
+            skills = skill_index.indexed_skills(job_id)
+            if skills is None:
+                unknown.append(row)
+                skills = ()
+            skill_lists.append(skills)
+        self.skills = skill_incidence(skill_lists)
+        self.skill_counts = np.diff(self.skills.indptr)
+        duplicates = job_duplicates.duplicate_of
+        self.duplicate_rows = np.asarray(
+            [row for row, job_id in enumerate(self.job_ids.tolist()) if job_id in duplicates], dtype=np.int64
         )
-        result = analyze_resume(resume_text, jd_text)
-        scored.append({
-            "job": job,
-            "score": result["ats_score"],
-            "matched_skills": result["matched_skills"][:8],
-            "missing_skills": result["missing_skills"][:5],
-        })
+        self.unknown_rows = np.setdiff1d(np.asarray(unknown, dtype=np.int64), self.duplicate_rows)
 
-    scored.sort(key=lambda x: x["score"], reverse=True)
-    return scored[:top_n]
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    def estimate_scores(self, features: ResumeFeatures, block_rows: int = RETRIEVAL_BLOCK_ROWS) -> np.ndarray:
+        """Unrounded ATS score of every row, computed block by block."""
+        resume_vector = self.model.transform([features.clean_text]).T.tocsc()
+        resume_skills = np.zeros(len(ALL_SKILLS_UNIQUE))
+        resume_skills[[SKILL_COLUMN[skill] for skill in features.skills]] = 1.0
+        bonus = section_bonus(features)
+
+        scores = np.empty(len(self.job_ids))
+        for start in range(0, len(self.job_ids), block_rows):
+            stop = min(start + block_rows, len(self.job_ids))
+            semantic = (self.semantic[start:stop] @ resume_vector).toarray().ravel() * 100
+            matched = self.skills[start:stop] @ resume_skills
+            counts = self.skill_counts[start:stop]
+            keyword = np.where(counts > 0, matched * 100 / np.maximum(counts, 1), 50.0)
+            scores[start:stop] = keyword * 0.50 + semantic * 0.30 + bonus
+        return np.minimum(scores, 100.0, out=scores)
+
+    def row_of(self, job_id: int) -> int | None:
+        rows = np.flatnonzero(self.job_ids == job_id)
+        return int(rows[0]) if len(rows) else None
+
+    def job_similarities(self, row: int, block_rows: int = RETRIEVAL_BLOCK_ROWS) -> np.ndarray:
+        """
+        Similarity of every row to `row`, in [0, 1]: SIMILAR_SEMANTIC_WEIGHT x
+        TF-IDF cosine plus the rest x skill-set Jaccard. Symmetric, so one
+        call also gives `row`'s similarity from every other job's side.
+        """
+        job_vector = self.semantic[row].T.tocsc()
+        job_skills = self.skills[row].T.tocsc()
+        count = self.skill_counts[row]
+        similarities = np.empty(len(self.job_ids))
+        for start in range(0, len(self.job_ids), block_rows):
+            stop = min(start + block_rows, len(self.job_ids))
+            cosine = (self.semantic[start:stop] @ job_vector).toarray().ravel()
+            shared = (self.skills[start:stop] @ job_skills).toarray().ravel()
+            union = self.skill_counts[start:stop] + count - shared
+            jaccard = np.divide(shared, union, out=np.zeros(stop - start), where=union > 0)
+            similarities[start:stop] = (
+                SIMILAR_SEMANTIC_WEIGHT * cosine + (1 - SIMILAR_SEMANTIC_WEIGHT) * jaccard
+            )
+        return np.clip(similarities, 0.0, 1.0, out=similarities)
+
+
+_catalog_lock = threading.Lock()
+_catalog: CatalogMatrix | None = None
+
+
+def _catalog_key(model: semantic_model.SemanticModel) -> tuple:
+    """
+    Identifies what a CatalogMatrix was built from. The model's revision and
+    the generation of the skill index and of the job duplicate flags count
+    their writes, so any change to the catalog changes the key.
+    """
+    return (
+        id(model),
+        model.version,
+        model.revision,
+        skill_index.generation,
+        job_duplicates.generation,
+    )
+
+
+def catalog_matrix() -> CatalogMatrix | None:
+    """The retrieval matrices for the active model, rebuilt after any catalog change."""
+    global _catalog
+    model = semantic_model.get_model()
+    if not model.is_fitted or not model.job_count:
+        return None
+    with _catalog_lock:
+        if _catalog is None or _catalog.key != _catalog_key(model):
+            _catalog = CatalogMatrix(model)
+        return _catalog
+
+
+def retrieve_job_ids(resume_text: "str | ResumeFeatures", top_n: int = 6) -> list[int] | None:
+    """
+    Shortlist of job ids, ascending, that contains the top_n jobs
+    recommend_jobs would return over the whole catalog ordered by id,
+    near-duplicate jobs left out.
+
+    Scores are estimated for all jobs at once and the k-th best found with
+    argpartition; every job within twice the rounding slack of it is kept,
+    so full scoring of the shortlist gives the exact result unless more than
+    RETRIEVAL_MAX_SHORTLIST jobs tie. Returns None when there is no fitted
+    model and the caller has to score every job.
+    """
+    catalog = catalog_matrix()
+    if catalog is None or not resume_text or top_n <= 0:
+        return None
+    features = resume_features(resume_text)
+    if features.text_length < 50:
+        # Every job scores 0; recommend_jobs keeps catalog order.
+        return np.sort(np.delete(catalog.job_ids, catalog.duplicate_rows))[:top_n].tolist()
+
+    scores = catalog.estimate_scores(features)
+    # Jobs missing from the skill index have no usable estimate; always score them.
+    scores[catalog.unknown_rows] = -np.inf
+    # Near-duplicate jobs are never recommended.
+    scores[catalog.duplicate_rows] = -np.inf
+    k = min(top_n, len(catalog) - len(catalog.unknown_rows) - len(catalog.duplicate_rows))
+    if k > 0:
+        top = np.argpartition(scores, len(scores) - k)[len(scores) - k:]
+        threshold = scores[top].min() - 2 * ROUNDING_SLACK
+        shortlist = np.flatnonzero(scores >= threshold)
+    else:
+        shortlist = np.empty(0, dtype=np.int64)
+    if len(shortlist) > RETRIEVAL_MAX_SHORTLIST:
+        # Sorting only the shortlist: best estimate first, lower job id on ties.
+        order = np.lexsort((catalog.job_ids[shortlist], -scores[shortlist]))
+        shortlist = shortlist[order[:RETRIEVAL_MAX_SHORTLIST]]
+    rows = np.union1d(shortlist, catalog.unknown_rows)
+    return np.sort(catalog.job_ids[rows]).tolist()
 
 
 def get_skill_gap(resume_text: str, job) -> dict:
     """Detailed skill gap analysis for a specific job."""
-    jd_text = (
-        f"{job.title} {job.description or ''} "
-        f"{getattr(job, 'skills_required', '') or ''} "
-        f"{getattr(job, 'requirements', '') or ''}"
-    )
-    return analyze_resume(resume_text, jd_text)
+    return analyze_resume_batch(resume_text, [stored_job_features(job)], [job.id])[0]
 
 
 def suggest_jobs(skills: list[str]) -> dict:
@@ -158,6 +398,44 @@ def suggest_jobs(skills: list[str]) -> dict:
     }
 
 
+# ── Role affinity ─────────────────────────────────────────────────────────────
+# Roles in the tie-break order of suggest_jobs, and a skill x role incidence matrix.
+ROLE_NAMES = sorted(JOB_ROLE_SKILL_MAP)
+_ROLE_MATRIX = sparse.csr_matrix(
+    np.array(
+        [[skill in JOB_ROLE_SKILL_MAP[role]["skills"] for role in ROLE_NAMES] for skill in ALL_SKILLS_UNIQUE],
+        dtype=np.float64,
+    )
+)
+_ROLE_SIZES = np.array([len(JOB_ROLE_SKILL_MAP[role]["skills"]) for role in ROLE_NAMES], dtype=np.float64)
+
+
+def role_affinity(incidence: sparse.csr_matrix) -> np.ndarray:
+    """suggest_jobs role scores for every row at once: coverage x 100 + 10 per matched skill."""
+    matched = (incidence @ _ROLE_MATRIX).toarray()
+    return np.round(matched / _ROLE_SIZES * 100 + matched * 10, 1)
+
+
+def top_role_columns(incidence: sparse.csr_matrix, limit: int = 3) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Column indexes into ROLE_NAMES of each row's `limit` best roles, as
+    suggest_jobs ranks them, and a mask of those the row matches at all.
+    """
+    scores = role_affinity(incidence)
+    # Stable sort keeps alphabetical order among tied roles.
+    order = np.argsort(-scores, axis=1, kind="stable")[:, :limit]
+    return order, np.take_along_axis(scores, order, axis=1) > 0
+
+
+def top_roles(incidence: sparse.csr_matrix, limit: int = 3) -> list[list[str]]:
+    """The roles suggest_jobs would recommend for each row."""
+    order, matched = top_role_columns(incidence, limit)
+    return [
+        [ROLE_NAMES[column] for column, hit in zip(row_order, row_matched) if hit]
+        for row_order, row_matched in zip(order.tolist(), matched.tolist())
+    ]
+
+
 def suggest_jobs_from_resume_text(resume_text: str) -> dict:
     """Convenience wrapper to extract skills first, then suggest roles."""
     if not resume_text:
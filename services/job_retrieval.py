@@ -0,0 +1,15 @@
+"""
+IRIS Job Retrieval
+Recommendations for one resume from the database-backed job catalog.
+
+retrieve_job_ids shortlists jobs from the in-memory retrieval matrices;
+only the shortlisted rows are loaded and fully scored.
+"""
+from services.job_feature_store import scoring_jobs
+from services.job_recommender import recommend_jobs, retrieve_job_ids
+
+
+def recommend_for_resume(resume, top_n: int = 6) -> list[dict]:
+    """Top jobs for a resume, fully scoring only the retrieval shortlist when the model allows it."""
+    job_ids = retrieve_job_ids(resume, top_n)
+    return recommend_jobs(resume, scoring_jobs(job_ids), top_n)
@@ -0,0 +1,178 @@
+"""
+IRIS Near-Duplicate Detection
+MinHash signatures over word shingles, and an LSH index over them.
+
+Two texts whose shingle sets have Jaccard similarity s agree on each
+signature position with probability s. The signature is cut into bands;
+texts sharing any whole band become candidates, which is likely for
+s above roughly (1 / LSH_BANDS) ** (1 / rows per band) ~= 0.71 and
+unlikely well below it. Candidates are then confirmed on the full
+signature against DUPLICATE_THRESHOLD, so a lookup touches only a few
+buckets instead of every stored signature.
+"""
+import threading
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16
+SHINGLE_WORDS = 3
+# Estimated shingle Jaccard at or above which two texts are near-duplicates.
+DUPLICATE_THRESHOLD = 0.8
+
+_ROWS_PER_BAND = NUM_PERMUTATIONS // LSH_BANDS
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Fixed seed: signatures are stored, so the permutations must never change.
+_random = np.random.RandomState(20240601)
+_A = _random.randint(1, 1 << 32, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _random.randint(0, 1 << 32, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> set[str]:
+    """Overlapping runs of `size` words; a shorter text is its own single shingle."""
+    words = text.split()
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[start:start + size]) for start in range(len(words) - size + 1)}
+
+
+def minhash_signature(text: str) -> np.ndarray | None:
+    """NUM_PERMUTATIONS uint32 minimum hashes of the text's shingles, or None for empty text."""
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles(text)), dtype=np.uint64
+    )
+    if not len(hashes):
+        return None
+    # a, x < 2**32, so a * x + b stays below 2**64.
+    permuted = (np.outer(hashes, _A) + _B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def pack_signature(signature: np.ndarray | None) -> bytes | None:
+    return signature.astype("<u4").tobytes() if signature is not None else None
+
+
+def unpack_signature(payload: bytes | None) -> np.ndarray | None:
+    if not payload or len(payload) != NUM_PERMUTATIONS * 4:
+        return None
+    return np.frombuffer(payload, dtype="<u4").astype(np.uint32)
+
+
+def estimated_similarity(first: np.ndarray, second: np.ndarray) -> float:
+    return float(np.count_nonzero(first == second)) / NUM_PERMUTATIONS
+
+
+def earliest_duplicate(signature: np.ndarray | None, earlier: list[tuple[int, np.ndarray | None]]) -> int | None:
+    """Lowest key among `earlier` (key, signature) pairs that `signature` near-duplicates, without an index."""
+    if signature is None:
+        return None
+    found = [
+        key for key, other in earlier
+        if other is not None and estimated_similarity(signature, other) >= DUPLICATE_THRESHOLD
+    ]
+    return min(found) if found else None
+
+
+class LshIndex:
+    """
+    key -> signature, bucketed by band. Keys carry a group (the posting
+    employer, say) and only match keys of the same group.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: list[dict[bytes, set[int]]] = [defaultdict(set) for _ in range(LSH_BANDS)]
+        self._signatures: dict[int, tuple[np.ndarray, object]] = {}
+        # key -> lowest earlier key it duplicates.
+        self.duplicate_of: dict[int, int] = {}
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    @staticmethod
+    def _bands(signature: np.ndarray) -> list[bytes]:
+        return [
+            signature[band * _ROWS_PER_BAND:(band + 1) * _ROWS_PER_BAND].tobytes()
+            for band in range(LSH_BANDS)
+        ]
+
+    def add(self, key: int, signature: np.ndarray | None, group: object = None) -> None:
+        with self._lock:
+            self._drop(key)
+            if signature is None:
+                return
+            self._signatures[key] = (signature, group)
+            for bucket, band in zip(self._buckets, self._bands(signature)):
+                bucket[band].add(key)
+
+    def remove(self, key: int) -> None:
+        with self._lock:
+            self._drop(key)
+            if self.duplicate_of.pop(key, None) is not None:
+                self.generation += 1
+
+    def _drop(self, key: int) -> None:
+        entry = self._signatures.pop(key, None)
+        if entry is None:
+            return
+        for bucket, band in zip(self._buckets, self._bands(entry[0])):
+            members = bucket.get(band)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del bucket[band]
+
+    def signature_of(self, key: int) -> np.ndarray | None:
+        entry = self._signatures.get(key)
+        return entry[0] if entry is not None else None
+
+    def matches(self, signature: np.ndarray, group: object = None, threshold: float = DUPLICATE_THRESHOLD) -> list[int]:
+        """Keys of the same group whose signature is at least `threshold` similar, ascending."""
+        with self._lock:
+            candidates = set()
+            for bucket, band in zip(self._buckets, self._bands(signature)):
+                candidates |= bucket.get(band, set())
+            found = []
+            for key in candidates:
+                other, other_group = self._signatures[key]
+                if other_group == group and estimated_similarity(signature, other) >= threshold:
+                    found.append(key)
+        return sorted(found)
+
+    def earliest_match(self, key: int) -> int | None:
+        """The lowest key below `key` that the stored signature of `key` near-duplicates."""
+        entry = self._signatures.get(key)
+        if entry is None:
+            return None
+        earlier = [other for other in self.matches(entry[0], entry[1]) if other < key]
+        return earlier[0] if earlier else None
+
+    def set_duplicate(self, key: int, duplicate_of: int | None) -> None:
+        with self._lock:
+            if self.duplicate_of.get(key) == duplicate_of:
+                return
+            if duplicate_of is None:
+                del self.duplicate_of[key]
+            else:
+                self.duplicate_of[key] = duplicate_of
+            self.generation += 1
+
+    def rebuild(self, entries) -> None:
+        """Replace the index from (key, signature, group, duplicate_of) tuples."""
+        fresh = LshIndex()
+        for key, signature, group, duplicate_of in entries:
+            fresh.add(key, signature, group)
+            if duplicate_of is not None:
+                fresh.duplicate_of[key] = duplicate_of
+        with self._lock:
+            self._buckets, self._signatures = fresh._buckets, fresh._signatures
+            self.duplicate_of = fresh.duplicate_of
+            self.generation += 1
+
+
+job_duplicates = LshIndex()
+
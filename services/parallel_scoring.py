@@ -0,0 +1,83 @@
+"""
+IRIS Parallel Scoring
+Optional process-pool execution for scoring one resume against a large catalog.
+
+Semantic similarities are computed in the parent with one sparse product, so
+workers never need the semantic model. Each worker receives the resume's
+ResumeFeatures and compact (index, jd, semantic) tuples, scores its chunk with analyze_resume_batch
+and returns its local top-N; the parent merges them with the same ordering as
+the serial path (score descending, catalog order on ties).
+"""
+import heapq
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from services.ats_analyzer import (
+    JobFeatures,
+    ResumeFeatures,
+    analyze_resume_batch,
+    batch_semantic_scores,
+    resume_features,
+)
+from services.background import ExecutorSlot
+
+_settings = {"workers": 0, "chunk_size": 500, "min_jobs": 2000}
+# spawn: never fork a web worker that may hold DB connections or locks.
+_pool = ExecutorSlot(
+    lambda workers: ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+)
+
+
+def configure(workers: int = 0, chunk_size: int = 500, min_jobs: int = 2000) -> None:
+    """
+    workers=0 keeps scoring serial. Catalogs smaller than min_jobs are always
+    scored serially because pool overhead would dominate.
+    """
+    _settings.update(workers=max(int(workers), 0), chunk_size=max(int(chunk_size), 1), min_jobs=int(min_jobs))
+    _pool.configure(_settings["workers"])
+
+
+def is_enabled_for(job_count: int) -> bool:
+    return _settings["workers"] > 0 and job_count >= _settings["min_jobs"]
+
+
+def _score_chunk(
+    features: ResumeFeatures, chunk: list[tuple[int, "str | JobFeatures", float | None]], top_n: int
+) -> list[tuple]:
+    """Worker entry point: score a chunk and keep only its top_n compact rows."""
+    indexes = [index for index, _jd, _semantic in chunk]
+    results = analyze_resume_batch(
+        features,
+        [jd for _index, jd, _semantic in chunk],
+        semantic=[semantic for _index, _jd, semantic in chunk],
+    )
+    rows = (
+        (result["ats_score"], index, result["matched_skills"][:8], result["missing_skills"][:5])
+        for index, result in zip(indexes, results)
+    )
+    return heapq.nsmallest(top_n, rows, key=lambda row: (-row[0], row[1]))
+
+
+def rank_parallel(
+    resume_text: "str | ResumeFeatures", jd_texts: "list[str | JobFeatures]", job_ids: list, top_n: int
+) -> list[tuple]:
+    """
+    Return the top_n (score, index, matched_skills, missing_skills) rows,
+    where index points into jd_texts, ordered exactly like the serial path.
+    """
+    features = resume_features(resume_text)
+    semantic = batch_semantic_scores(features, jd_texts, job_ids)
+    # Packed vectors were only needed for the semantic scores; don't ship them to workers.
+    jds = [JobFeatures(jd.clean_text, jd.skills) if isinstance(jd, JobFeatures) else jd for jd in jd_texts]
+    items = list(zip(range(len(jds)), jds, semantic))
+    size = _settings["chunk_size"]
+    chunks = [items[start:start + size] for start in range(0, len(items), size)]
+
+    pool = _pool.executor()
+    futures = [pool.submit(_score_chunk, features, chunk, top_n) for chunk in chunks]
+    merged = heapq.merge(
+        *(future.result() for future in futures),
+        key=lambda row: (-row[0], row[1]),
+    )
+    return list(islice(merged, top_n))
@@ -0,0 +1,153 @@
+"""
+IRIS User Recommendations
+Materialized top-N job recommendations per user, kept current incrementally.
+
+A resume upload recomputes that user's list. A posted or edited job is
+scored once against every indexed resume and merged into the built lists
+it now belongs to; only users whose list it may have left are recomputed
+in full. Deleting a job clears the built stamp of the lists holding it,
+and the dashboard has those recomputed when next opened. Lists are
+ordered like recommend_jobs: score descending, lower job id on ties.
+"""
+import json
+from datetime import datetime
+
+from sqlalchemy.orm import joinedload
+
+from models import Job, ResumeData, User, UserRecommendation, db
+from services import background
+from services.ats_analyzer import stored_job_features, stored_resume_features
+from services.job_retrieval import recommend_for_resume
+from services.resume_storage import latest_resume
+from services.talent_index import talent_index
+from services.talent_search import job_vector, refresh_talent_index
+
+RECOMMENDATION_COUNT = 6
+
+
+def user_recommendations(user_id: int) -> list[UserRecommendation]:
+    """The stored list with jobs loaded, best first."""
+    return (
+        UserRecommendation.query.options(joinedload(UserRecommendation.job))
+        .filter_by(user_id=user_id)
+        .order_by(UserRecommendation.score.desc(), UserRecommendation.job_id)
+        .all()
+    )
+
+
+def refresh_user_recommendations(user_id: int) -> int:
+    """Recompute a user's list from their latest resume. Returns the number stored."""
+    resume = latest_resume(user_id, ResumeData.id, ResumeData.user_id, ResumeData.features)
+    UserRecommendation.query.filter_by(user_id=user_id).delete(synchronize_session="fetch")
+    results = recommend_for_resume(stored_resume_features(resume), RECOMMENDATION_COUNT) if resume else []
+    now = datetime.utcnow()
+    db.session.execute(db.update(User).where(User.id == user_id).values(recommendations_built_at=now))
+    for result in results:
+        db.session.add(UserRecommendation(
+            user_id=user_id,
+            job_id=result["job"].id,
+            score=result["score"],
+            matched_skills=json.dumps(result["matched_skills"]),
+            missing_skills=json.dumps(result["missing_skills"]),
+            computed_at=now,
+        ))
+    db.session.commit()
+    return len(results)
+
+
+def merge_job_recommendations(job_id: int) -> int:
+    """
+    Score one posted or edited job against every indexed resume and merge it
+    into each user's list where it now qualifies. Returns the number of
+    users whose list changed.
+    """
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return 0
+    if job.duplicate_of is not None:
+        # Duplicates are not recommended; lists holding it from before its edit are rebuilt.
+        stale = [user_id for (user_id,) in db.session.query(UserRecommendation.user_id).filter_by(job_id=job_id)]
+        for user_id in stale:
+            refresh_user_recommendations(user_id)
+        return len(stale)
+    refresh_talent_index()
+    features = stored_job_features(job)
+
+    # A full list admits the job only above its current last entry.
+    floors = {
+        user_id: lowest
+        for user_id, count, lowest in db.session.query(
+            UserRecommendation.user_id, db.func.count(), db.func.min(UserRecommendation.score)
+        ).group_by(UserRecommendation.user_id)
+        if count >= RECOMMENDATION_COUNT
+    }
+    listed = {
+        user_id: score
+        for user_id, score in db.session.query(UserRecommendation.user_id, UserRecommendation.score)
+        .filter_by(job_id=job_id)
+    }
+    results = talent_index.scores_for_job(
+        features.skills, job_vector(job, features), floors, include=set(listed)
+    )
+
+    changed, stale = 0, []
+    user_ids = list(results)
+    now = datetime.utcnow()
+    for start in range(0, len(user_ids), 500):
+        # A list not built yet gets the job when it is computed in full.
+        chunk = [
+            user_id
+            for (user_id,) in db.session.query(User.id).filter(
+                User.id.in_(user_ids[start:start + 500]), User.recommendations_built_at.isnot(None)
+            )
+        ]
+        lists = {user_id: [] for user_id in chunk}
+        for row in UserRecommendation.query.filter(UserRecommendation.user_id.in_(chunk)):
+            lists[row.user_id].append(row)
+        for user_id in chunk:
+            result, rows = results[user_id], lists[user_id]
+            current = next((row for row in rows if row.job_id == job_id), None)
+            if current is not None:
+                if result["score"] < current.score:
+                    # A lower score may let an unlisted job overtake it.
+                    stale.append(user_id)
+                    continue
+                _fill(current, result, now)
+                changed += 1
+                continue
+            if len(rows) >= RECOMMENDATION_COUNT:
+                worst = min(rows, key=lambda row: (row.score, -row.job_id))
+                if (result["score"], -job_id) <= (worst.score, -worst.job_id):
+                    continue
+                db.session.delete(worst)
+            db.session.add(_fill(UserRecommendation(user_id=user_id, job_id=job_id), result, now))
+            changed += 1
+        db.session.commit()
+
+    for user_id in stale:
+        refresh_user_recommendations(user_id)
+    return changed + len(stale)
+
+
+def _fill(row: UserRecommendation, result: dict, now: datetime) -> UserRecommendation:
+    row.score = result["score"]
+    row.matched_skills = json.dumps(result["matched_skills"][:8])
+    row.missing_skills = json.dumps(result["missing_skills"][:5])
+    row.computed_at = now
+    return row
+
+
+def stage_recommendation_removal(job_ids: list[int]) -> None:
+    """Mark the lists holding any of job_ids for a rebuild; call before deleting the jobs, then commit."""
+    holders = db.session.query(UserRecommendation.user_id).filter(UserRecommendation.job_id.in_(job_ids))
+    db.session.execute(
+        db.update(User).where(User.id.in_(holders.scalar_subquery())).values(recommendations_built_at=None)
+    )
+
+
+def schedule_user_refresh(user_id: int) -> None:
+    background.submit(refresh_user_recommendations, user_id, key=("user_recommendations", user_id))
+
+
+def schedule_job_merge(job_id: int) -> None:
+    background.submit(merge_job_recommendations, job_id, key=("job_recommendations", job_id))
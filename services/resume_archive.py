@@ -0,0 +1,235 @@
+"""
+IRIS Resume Archive
+Reads the resumes in a ZIP archive and analyzes them across processes.
+
+Run by resume_import as `python -m services.resume_archive`, so a pool of
+worker processes can start without re-importing the web app. Members are
+read out of the archive once, one at a time, and never unpacked to a
+directory: each resume is written to the upload folder under its content
+hash. The first stdout line reports those files and their hashes; the
+caller answers on stdin with the hashes it has analyzed before, which are
+not extracted again. The others are extracted within the resume_parser
+budgets and analyzed in workers, and one JSON line per member follows as
+results come in, in archive order, so the caller stores them while later
+members are still being analyzed. Nothing here touches the database.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import uuid
+import zipfile
+import zlib
+from collections import deque
+from typing import Iterator
+
+from services.ats_analyzer import ResumeFeatures
+from services.categorizer import resume_category
+from services.near_duplicates import minhash_signature, pack_signature
+from services.resume_parser import KILL_GRACE_SECONDS, extract_resume, keyword_terms, pack_terms
+
+RESUME_EXTENSIONS = (".pdf", ".docx", ".doc")
+
+
+def _ignored(name: str) -> bool:
+    # Folders, macOS resource forks and other hidden files are not resumes.
+    return name.endswith("/") or name.startswith("__MACOSX/") or os.path.basename(name).startswith(".")
+
+
+def iter_members(
+    archive: zipfile.ZipFile, max_files: int, max_file_bytes: int
+) -> Iterator[tuple[str, bytes | None, str | None]]:
+    """
+    (name, content, None) for each resume in the archive, read one at a
+    time, or (name, None, reason) for a member that is not imported.
+    """
+    count = 0
+    for info in archive.infolist():
+        name = info.filename
+        if _ignored(name):
+            continue
+        if os.path.splitext(name)[1].lower() not in RESUME_EXTENSIONS:
+            yield name, None, "Not a PDF, DOC or DOCX file."
+            continue
+        count += 1
+        if count > max_files:
+            yield name, None, f"Only the first {max_files} resumes of an archive are imported."
+            continue
+        if info.flag_bits & 0x1:
+            yield name, None, "The file is password protected."
+            continue
+        if info.file_size > max_file_bytes:
+            yield name, None, "The file is too large."
+            continue
+        try:
+            with archive.open(info) as member:
+                # file_size comes from the archive, so the read is bounded too.
+                content = member.read(max_file_bytes + 1)
+        except (zipfile.BadZipFile, NotImplementedError, EOFError, zlib.error):
+            yield name, None, "The file could not be read from the archive."
+            continue
+        if len(content) > max_file_bytes:
+            yield name, None, "The file is too large."
+            continue
+        yield name, content, None
+
+
+def store_members(archive_path: str, folder: str, max_files: int, max_file_bytes: int) -> list[dict]:
+    """
+    Write each resume in the archive to `folder` under its content hash.
+    Returns one entry per member, in archive order: its name, file name
+    and content hash, or for a member that is not imported a "skipped"
+    status and the reason.
+    """
+    members = []
+    with zipfile.ZipFile(archive_path) as archive:
+        for name, content, reason in iter_members(archive, max_files, max_file_bytes):
+            if content is None:
+                members.append({"name": name, "status": "skipped", "message": reason})
+                continue
+            content_hash = hashlib.sha256(content).hexdigest()
+            file_name = _file_name(name, content_hash)
+            _write_once(folder, file_name, content)
+            members.append({"name": name, "file_name": file_name, "content_hash": content_hash})
+    return members
+
+
+def _write_once(folder: str, file_name: str, content: bytes) -> None:
+    path = os.path.join(folder, file_name)
+    if os.path.exists(path):
+        return
+    partial = os.path.join(folder, f".{uuid.uuid4().hex}.part")
+    with open(partial, "wb") as target:
+        target.write(content)
+    os.replace(partial, path)
+
+
+def _file_name(name: str, content_hash: str) -> str:
+    return content_hash + os.path.splitext(name)[1].lower()
+
+
+def analyze_member(member: dict, folder: str, budgets: tuple[int, int, float]) -> dict:
+    """
+    Worker entry point: extract one stored resume within `budgets` (max
+    pages, max characters, timeout) and analyze it.
+    """
+    try:
+        max_pages, max_chars, timeout = budgets
+        extraction = extract_resume(
+            os.path.join(folder, member["file_name"]), max_pages, max_chars, timeout, workers=0
+        )
+    except Exception:
+        return {**member, "status": "failed", "message": "The resume could not be read."}
+    extracted_text = extraction.text
+    stored_text = extracted_text or "No readable text found."
+    features = ResumeFeatures.from_text(extracted_text)
+    signature = pack_signature(minhash_signature(features.clean_text))
+    return {
+        **member,
+        "status": "analyzed",
+        "extracted_text": stored_text,
+        "pages_processed": extraction.pages_processed or None,
+        "text_truncated": extraction.truncated,
+        "features": features.to_json(),
+        "keyword_terms": pack_terms(keyword_terms(stored_text)),
+        "category": resume_category(extracted_text),
+        "minhash": signature.hex() if signature is not None else None,
+    }
+
+
+def analyze_members(
+    members: list[dict],
+    folder: str,
+    workers: int,
+    budgets: tuple[int, int, float],
+    known_hashes: set[str] = frozenset(),
+) -> Iterator[dict]:
+    """
+    One result per stored member, in order, analyzed by `workers`
+    processes with at most two members per worker in flight. Content in
+    `known_hashes` is not analyzed and gets status "known". A worker stuck
+    on one file past the timeout in `budgets` is replaced and that file
+    reported failed.
+    """
+    timeout = budgets[2]
+    context = multiprocessing.get_context("spawn")
+    pool = context.Pool(workers)
+    # (member, pending result); members that are not analyzed hold their report instead.
+    in_flight = deque()
+
+    def submit(member: dict) -> None:
+        in_flight.append((member, pool.apply_async(analyze_member, (member, folder, budgets))))
+
+    def next_result() -> dict:
+        nonlocal pool
+        member, pending = in_flight.popleft()
+        if isinstance(pending, dict):
+            return pending
+        try:
+            return pending.get(timeout=timeout + KILL_GRACE_SECONDS)
+        except multiprocessing.TimeoutError:
+            pool.terminate()
+            pool = context.Pool(workers)
+            for waiting, waiting_result in [*in_flight]:
+                in_flight.popleft()
+                if isinstance(waiting_result, dict):
+                    in_flight.append((waiting, waiting_result))
+                else:
+                    submit(waiting)
+            return {**member, "status": "failed", "message": "The resume took too long to read."}
+
+    try:
+        for member in members:
+            if "status" in member:
+                in_flight.append((member, member))
+            elif member["content_hash"] in known_hashes:
+                in_flight.append((member, {**member, "status": "known"}))
+            else:
+                submit(member)
+            if len(in_flight) >= 2 * workers:
+                yield next_result()
+        while in_flight:
+            yield next_result()
+    finally:
+        pool.terminate()
+
+
+def _main() -> None:
+    """Child side of resume_import: content hashes and results go to stdout, known hashes come from stdin."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("archive_path")
+    parser.add_argument("folder")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--max-files", type=int, default=1000)
+    parser.add_argument("--max-file-bytes", type=int, default=8 * 1024 * 1024)
+    parser.add_argument("--max-pages", type=int, default=50)
+    parser.add_argument("--max-chars", type=int, default=100_000)
+    args = parser.parse_args()
+    try:
+        members = store_members(args.archive_path, args.folder, args.max_files, args.max_file_bytes)
+    except zipfile.BadZipFile:
+        sys.exit("The file is not a valid ZIP archive.")
+    stored = [member for member in members if "content_hash" in member]
+    header = {
+        "file_names": sorted({member["file_name"] for member in stored}),
+        "content_hashes": sorted({member["content_hash"] for member in stored}),
+    }
+    sys.stdout.write(json.dumps(header) + "\n")
+    sys.stdout.flush()
+    known_hashes = set(json.loads(sys.stdin.readline() or "[]"))
+    for result in analyze_members(
+        members,
+        args.folder,
+        max(args.workers, 1),
+        (args.max_pages, args.max_chars, args.timeout),
+        known_hashes,
+    ):
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,68 @@
+"""
+IRIS Resume Categories
+Batch recategorization of every stored resume with the compiled categorizer.
+
+Run after DEGREE_MAP or SKILL_KEYWORDS change, so category filters in talent
+search see the new categories without waiting for re-uploads.
+"""
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from models import ResumeData, db, stored_text
+from services.categorizer import categorize_texts
+
+
+def recategorize_resumes(batch_size: int = 500, workers: int = 0) -> tuple[int, int]:
+    """
+    Recompute the stored category of every resume from its extracted text,
+    streaming batch_size rows at a time. workers > 0 categorizes batches in
+    that many processes, with at most two batches per worker in flight.
+    Returns (rows changed, rows scanned).
+    """
+    rows = (
+        db.session.query(ResumeData.id, ResumeData.compressed_text, ResumeData.plain_text, ResumeData.category)
+        .order_by(ResumeData.id)
+        .yield_per(batch_size)
+    )
+    changes, scanned = [], 0
+
+    def collect(batch: list[tuple[int, str | None]], categories: list[str]) -> None:
+        changes.extend(
+            {"id": resume_id, "category": category}
+            for (resume_id, current), category in zip(batch, categories)
+            if category != current
+        )
+
+    def batches():
+        batch, texts = [], []
+        for row in rows:
+            batch.append((row.id, row.category))
+            texts.append(stored_text(row.compressed_text, row.plain_text))
+            if len(batch) >= batch_size:
+                yield batch, texts
+                batch, texts = [], []
+        if batch:
+            yield batch, texts
+
+    if workers > 0:
+        # spawn: never fork a process holding the app's DB connections.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            in_flight = deque()
+            for batch, texts in batches():
+                scanned += len(batch)
+                in_flight.append((batch, pool.submit(categorize_texts, texts)))
+                if len(in_flight) >= 2 * workers:
+                    batch, future = in_flight.popleft()
+                    collect(batch, future.result())
+            for batch, future in in_flight:
+                collect(batch, future.result())
+    else:
+        for batch, texts in batches():
+            scanned += len(batch)
+            collect(batch, categorize_texts(texts))
+
+    for start in range(0, len(changes), batch_size):
+        db.session.execute(db.update(ResumeData), changes[start:start + batch_size])
+        db.session.commit()
+    return len(changes), scanned
@@ -0,0 +1,265 @@
+"""
+IRIS Resume Import
+Imports recruiters' ZIP archives of resumes in bulk.
+
+The archive is read and its resumes extracted and analyzed by a child
+process (see resume_archive) with a pool of workers, by default one per
+core. This side stores the results as resume_data rows owned by the
+recruiter and tagged with the import, committing a batch at a time, and
+keeps a per-file report on the resume_imports row. Content analyzed
+before is not extracted again: the new row copies the earlier analysis.
+
+Imported resumes are not the recruiter's own resume, so they stay out of
+talent search, recommendations and the skill supply rollups.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+from datetime import datetime
+from typing import Iterator
+
+from flask import current_app
+
+from models import ResumeData, ResumeImport, db
+from services.ats_analyzer import ResumeFeatures
+from services.background import TaskQueue
+from services.talent_search import resume_search_fields
+from services.resume_parser import limits, unpack_terms
+from services.resume_pipeline import analyzed_resume, release_file, resume_columns, reused_columns
+from services.site_metrics import count_added
+
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_settings = {
+    "workers": 0,
+    "batch_size": 100,
+    "max_files": 1000,
+    "max_file_bytes": 8 * 1024 * 1024,
+    "timeout": 60.0,
+}
+# One archive at a time: each already keeps every core busy.
+_queue = TaskQueue("iris-import", workers=1, max_queued=2)
+
+
+def configure(
+    workers: int = 0,
+    batch_size: int = 100,
+    max_files: int = 1000,
+    max_file_bytes: int = 8 * 1024 * 1024,
+    timeout: float = 60.0,
+    max_queued: int = 2,
+) -> None:
+    """
+    workers: processes analyzing resumes, 0 for one per core. batch_size:
+    resumes per commit. max_files/max_file_bytes bound what one archive
+    may hold; timeout is the seconds one file may spend in extraction.
+    max_queued: archives accepted but not finished, per process.
+    """
+    _settings.update(
+        workers=max(int(workers), 0),
+        batch_size=max(int(batch_size), 1),
+        max_files=max(int(max_files), 1),
+        max_file_bytes=max(int(max_file_bytes), 1),
+        timeout=max(float(timeout), 1.0),
+    )
+    _queue.configure(1, max_queued=max(int(max_queued), 1))
+
+
+def accepting() -> bool:
+    """Whether this process has room for another archive."""
+    return _queue.accepting()
+
+
+def save_archive(uploaded_file, folder: str) -> str:
+    """Save an uploaded archive until it has been imported; returns its path."""
+    path = os.path.join(folder, f".import-{uuid.uuid4().hex}.zip")
+    uploaded_file.save(path)
+    return path
+
+
+def submit(import_id: int, archive_path: str) -> bool:
+    """Queue a saved archive for import, deleting it when done; False when the queue is full."""
+    return _queue.submit(_process, import_id, archive_path) is not None
+
+
+def _process(import_id: int, archive_path: str) -> None:
+    try:
+        run_import(import_id, archive_path)
+    except Exception:
+        current_app.logger.exception("Importing resume archive %s failed", import_id)
+        db.session.rollback()
+        resume_import = db.session.get(ResumeImport, import_id)
+        if resume_import is not None and resume_import.status != "done":
+            _finish(resume_import, "failed", "The archive could not be imported.")
+    finally:
+        if os.path.exists(archive_path):
+            os.remove(archive_path)
+
+
+def run_import(
+    import_id: int, archive_path: str, workers: int | None = None, batch_size: int | None = None
+) -> ResumeImport | None:
+    """Import every resume in the archive for a queued resume_imports row, and fill in its report."""
+    resume_import = db.session.get(ResumeImport, import_id)
+    if resume_import is None:
+        return None
+    resume_import.status = "processing"
+    db.session.commit()
+    batch_size = batch_size or _settings["batch_size"]
+
+    report, batch, unused_files, written_files = [], [], [], []
+    status, message = "done", None
+    try:
+        for result in _archive_results(archive_path, workers, written_files):
+            entry = {"name": result["name"], "status": result["status"], "message": result.get("message")}
+            report.append(entry)
+            if result["status"] in ("analyzed", "known"):
+                batch.append((result, entry))
+                if len(batch) >= batch_size:
+                    unused_files += _store_batch(resume_import, batch, report)
+                    batch = []
+            elif result.get("file_name"):
+                unused_files.append(result["file_name"])
+        unused_files += _store_batch(resume_import, batch, report)
+    except RuntimeError as exc:
+        # Batches stored so far stay imported; release_file keeps their files.
+        for result, entry in batch:
+            entry["status"] = "failed"
+        unused_files += written_files
+        status, message = "failed", str(exc)
+    resume_import.report = json.dumps(report)
+    _finish(resume_import, status, message, report)
+
+    folder = current_app.config["UPLOAD_FOLDER"]
+    for file_name in set(unused_files):
+        release_file(os.path.join(folder, file_name))
+    return resume_import
+
+
+def _known_hashes(hashes: list[str]) -> set[str]:
+    """The content hashes among `hashes` of resumes stored before."""
+    known = set()
+    for start in range(0, len(hashes), 500):
+        known.update(
+            content_hash
+            for (content_hash,) in db.session.query(ResumeData.content_hash)
+            .filter(ResumeData.content_hash.in_(hashes[start:start + 500]))
+            .distinct()
+        )
+    return known
+
+
+def _archive_results(archive_path: str, workers: int | None, written_files: list[str]) -> Iterator[dict]:
+    """
+    Results of resume_archive run in a child process, one per member as they
+    arrive. The child reads the archive once and first reports the files it
+    wrote, added to `written_files`, and their content hashes; it is then
+    told which of those were analyzed before.
+    """
+    budgets = limits()
+    workers = workers if workers is not None else _settings["workers"]
+    command = [
+        sys.executable, "-m", "services.resume_archive",
+        os.path.abspath(archive_path), os.path.abspath(current_app.config["UPLOAD_FOLDER"]),
+        "--workers", str(workers or os.cpu_count() or 1),
+        "--timeout", str(_settings["timeout"]),
+        "--max-files", str(_settings["max_files"]),
+        "--max-file-bytes", str(_settings["max_file_bytes"]),
+        "--max-pages", str(budgets["max_pages"]),
+        "--max-chars", str(budgets["max_chars"]),
+    ]
+    # Worker warnings can be long; a file, unlike a pipe, never blocks them.
+    with tempfile.TemporaryFile() as errors:
+        process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=errors, cwd=_PROJECT_DIR
+        )
+        try:
+            header = process.stdout.readline()
+            if header:
+                stored = json.loads(header)
+                written_files += stored["file_names"]
+                known = _known_hashes(stored["content_hashes"])
+                process.stdin.write(json.dumps(sorted(known)).encode("utf-8") + b"\n")
+            # A child that failed before reporting its hashes exits with the reason.
+            process.stdin.close()
+            for line in process.stdout:
+                yield json.loads(line)
+            process.wait()
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+        if process.returncode != 0:
+            errors.seek(0)
+            lines = errors.read().decode("utf-8", errors="replace").strip().splitlines()
+            raise RuntimeError(lines[-1] if lines else f"Import exited with status {process.returncode}.")
+
+
+def _store_batch(resume_import: ResumeImport, batch: list[tuple[dict, dict]], report: list[dict]) -> list[str]:
+    """Add and commit a batch of analyzed results, filling in their report entries. Returns unused file names."""
+    added, unused = [], []
+    for result, entry in batch:
+        columns = _result_columns(result)
+        if columns is None:
+            # The earlier resume with this content was deleted meanwhile.
+            entry.update(status="failed", message="The resume could not be read. Please import it again.")
+            unused.append(result["file_name"])
+            continue
+        resume = ResumeData(
+            user_id=resume_import.user_id,
+            import_id=resume_import.id,
+            file_name=result["file_name"],
+            original_name=os.path.basename(result["name"])[:255] or result["file_name"],
+            **columns,
+        )
+        db.session.add(resume)
+        added.append((resume, entry))
+    db.session.flush()
+    count_added(*(resume for resume, _entry in added))
+    for resume, entry in added:
+        entry.update(status="imported", resume_id=resume.id)
+    _count(resume_import, report)
+    db.session.commit()
+    return unused
+
+
+def _result_columns(result: dict) -> dict | None:
+    if result["status"] == "known":
+        prior = analyzed_resume(result["content_hash"])
+        if prior is None:
+            return None
+        _features, columns = reused_columns(prior)
+        return {**columns, "minhash": prior.minhash}
+    features = ResumeFeatures.from_json(result["features"])
+    return resume_columns(
+        features,
+        unpack_terms(result["keyword_terms"]),
+        resume_search_fields(features),
+        extracted_text=result["extracted_text"],
+        content_hash=result["content_hash"],
+        category=result["category"],
+        pages_processed=result["pages_processed"],
+        text_truncated=result["text_truncated"],
+        minhash=bytes.fromhex(result["minhash"]) if result["minhash"] else None,
+    )
+
+
+def _count(resume_import: ResumeImport, report: list[dict]) -> None:
+    resume_import.file_count = len(report)
+    resume_import.imported_count = sum(1 for entry in report if entry["status"] == "imported")
+    resume_import.failed_count = sum(1 for entry in report if entry["status"] in ("failed", "skipped"))
+
+
+def _finish(
+    resume_import: ResumeImport, status: str, message: str | None, report: list[dict] | None = None
+) -> ResumeImport:
+    if report is not None:
+        _count(resume_import, report)
+    resume_import.status = status
+    resume_import.message = message
+    resume_import.finished_at = datetime.utcnow()
+    db.session.commit()
+    return resume_import
@@ -1,8 +1,19 @@
 """Resume parsing and lightweight keyword analysis helpers."""
 
+import argparse
+import hashlib
+import json
+import multiprocessing
 import os
 import re
-from typing import Iterable
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Iterable, Iterator
+
+from services.analysis_cache import memoized
+from services.doc_reader import is_compound_file, iter_paragraphs
 
 DEFAULT_SKILLS = {
     "python",
@@ -22,23 +33,129 @@ DEFAULT_SKILLS = {
     "linux",
 }
 
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Time a child process gets past its extraction deadline before it is taken to be stuck.
+KILL_GRACE_SECONDS = 10.0
+
+# Extraction budgets. Text past them is dropped and the result is marked truncated.
+_limits = {"max_pages": 50, "max_chars": 100_000, "workers": 0, "parallel_min_pages": 40}
+
+
+def configure(max_pages: int = 50, max_chars: int = 100_000, workers: int = 0, parallel_min_pages: int = 40) -> None:
+    """
+    max_pages/max_chars bound what one file may contribute. workers > 0
+    extracts PDFs of at least parallel_min_pages pages in that many processes.
+    """
+    _limits.update(
+        max_pages=max(int(max_pages), 1),
+        max_chars=max(int(max_chars), 1),
+        workers=max(int(workers), 0),
+        parallel_min_pages=max(int(parallel_min_pages), 1),
+    )
+
+
+def limits() -> dict:
+    """The configured extraction budgets."""
+    return dict(_limits)
+
+
+@dataclass
+class ExtractionResult:
+    """Text read from a resume file and how much of the file it covers."""
+
+    text: str
+    # PDF pages the text covers, out of page_count; both 0 for other formats.
+    pages_processed: int = 0
+    page_count: int = 0
+    # "pages", "characters" or "time" when a budget cut the text short.
+    truncated_by: str | None = None
+
+    @property
+    def truncated(self) -> bool:
+        return self.truncated_by is not None
+
+
+KEYWORD_SCORING_VERSION = "1." + hashlib.sha1(
+    ",".join(sorted(DEFAULT_SKILLS)).encode("utf-8")
+).hexdigest()[:12]
+
 
 def extract_text_from_file(file_path: str) -> str:
-    """Extract text from PDF, DOCX, or plain-text DOC uploads."""
+    """Extract text from PDF, DOCX, or DOC uploads, within the configured budgets."""
+    return extract_resume(file_path).text
+
+
+def extract_resume(
+    file_path: str,
+    max_pages: int | None = None,
+    max_chars: int | None = None,
+    timeout: float | None = None,
+    workers: int | None = None,
+) -> ExtractionResult:
+    """
+    Extract a resume file page by page (paragraph by paragraph for DOCX and DOC),
+    stopping at the page or character budget or once `timeout` seconds have
+    passed. Budgets left as None use the configured ones. A page that is
+    already being read is finished; a hard stop needs extract_resume_with_timeout.
+    """
+    max_pages = _limits["max_pages"] if max_pages is None else max_pages
+    max_chars = _limits["max_chars"] if max_chars is None else max_chars
+    workers = _limits["workers"] if workers is None else workers
+    deadline = time.monotonic() + timeout if timeout else None
+
     extension = os.path.splitext(file_path)[1].lower()
     if extension == ".pdf":
-        return _extract_pdf(file_path)
+        return _extract_pdf(file_path, max_pages, max_chars, deadline, workers)
     if extension == ".docx":
-        return _extract_docx(file_path)
+        return _extract_docx(file_path, max_chars, deadline)
     if extension == ".doc":
-        return _extract_doc(file_path)
+        return _extract_doc(file_path, max_chars, deadline)
     raise ValueError("Unsupported file type.")
 
 
-def analyze_resume_keywords(resume_text: str, job_text: str = "") -> dict:
-    """Score a resume by matching known skills against resume and job text."""
-    resume_terms = set(_tokenize(resume_text))
-    job_terms = set(_tokenize(job_text))
+def extract_resume_with_timeout(file_path: str, timeout: float) -> ExtractionResult:
+    """
+    extract_resume in a separate interpreter. Text read by `timeout` seconds
+    is kept; the interpreter is killed if it is still stuck on one page a
+    little later. Raises TimeoutError, or RuntimeError if extraction failed.
+    """
+    command = [
+        sys.executable, "-m", "services.resume_parser", os.path.abspath(file_path),
+        "--max-pages", str(_limits["max_pages"]),
+        "--max-chars", str(_limits["max_chars"]),
+        "--workers", str(_limits["workers"]),
+        "--parallel-min-pages", str(_limits["parallel_min_pages"]),
+        "--timeout", str(timeout),
+    ]
+    try:
+        completed = subprocess.run(
+            command, capture_output=True, timeout=timeout + KILL_GRACE_SECONDS, cwd=_PROJECT_DIR
+        )
+    except subprocess.TimeoutExpired:
+        raise TimeoutError(f"Extraction took longer than {timeout:g} seconds.") from None
+    if completed.returncode != 0:
+        lines = completed.stderr.decode("utf-8", errors="replace").strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"Extraction exited with status {completed.returncode}.")
+    return ExtractionResult(**json.loads(completed.stdout))
+
+
+def keyword_terms(text: str) -> frozenset[str]:
+    """The distinct terms keyword scoring compares; store them with pack_terms."""
+    return frozenset(_tokenize(text or ""))
+
+
+def pack_terms(terms: Iterable[str]) -> str:
+    """Terms as stored text: sorted and space-separated (terms never hold whitespace)."""
+    return " ".join(sorted(terms))
+
+
+def unpack_terms(payload: str | None) -> frozenset[str]:
+    return frozenset(payload.split()) if payload else frozenset()
+
+
+def score_keyword_terms(resume_terms: frozenset[str], job_terms: frozenset[str] = frozenset()) -> dict:
+    """analyze_resume_keywords over terms already taken from both texts."""
     reference_terms = job_terms or DEFAULT_SKILLS
     matched = sorted(skill for skill in reference_terms if skill in resume_terms)
     denominator = len(reference_terms) or 1
@@ -49,24 +166,140 @@ def analyze_resume_keywords(resume_text: str, job_text: str = "") -> dict:
     }
 
 
-def _extract_pdf(file_path: str) -> str:
+@memoized("keywords", lambda: KEYWORD_SCORING_VERSION)
+def analyze_resume_keywords(resume_text: str, job_text: str = "") -> dict:
+    """Score a resume by matching known skills against resume and job text."""
+    return score_keyword_terms(keyword_terms(resume_text), keyword_terms(job_text))
+
+
+def _collect(
+    pieces: Iterable[str], total: int | None, max_chars: int, deadline: float | None
+) -> tuple[str, int, str | None]:
+    """
+    Join pieces with newlines until the character budget or the deadline.
+    Returns (text, pieces used, budget hit); a source that runs dry before
+    `total` pieces was stopped by the deadline. With `total` None the source
+    is only stopped here, so running dry means it was read to the end.
+    """
+    parts, size, used = [], 0, 0
+    for piece in pieces:
+        piece = piece or ""
+        used += 1
+        if size + len(piece) > max_chars:
+            # A piece that filled the budget exactly leaves size at max_chars + 1.
+            parts.append(piece[:max(max_chars - size, 0)])
+            return "\n".join(parts).strip(), used, "characters"
+        parts.append(piece)
+        size += len(piece) + 1
+        if deadline is not None and (total is None or used < total) and time.monotonic() >= deadline:
+            return "\n".join(parts).strip(), used, "time"
+    return "\n".join(parts).strip(), used, "time" if total is not None and used < total else None
+
+
+def iter_pdf_pages(file_path: str, start: int = 0, stop: int | None = None) -> Iterator[str]:
+    """Text of each page in [start, stop), parsed only when the previous page has been consumed."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(file_path)
+    for index in range(start, min(len(reader.pages), stop if stop is not None else len(reader.pages))):
+        yield reader.pages[index].extract_text() or ""
+
+
+def _extract_pdf_chunk(file_path: str, start: int, stop: int, max_chars: int) -> list[str]:
+    """Worker entry point: pages [start, stop), stopping once max_chars is exceeded."""
+    pages, size = [], 0
+    for text in iter_pdf_pages(file_path, start, stop):
+        pages.append(text)
+        size += len(text) + 1
+        if size > max_chars:
+            break
+    return pages
+
+
+def _parallel_pdf_pages(
+    file_path: str, pages: int, max_chars: int, workers: int, deadline: float | None
+) -> Iterator[str]:
+    """Pages in order, extracted in chunks across processes; stops quietly at the deadline."""
+    size = max(4, -(-pages // (workers * 4)))
+    chunks = [(file_path, start, min(start + size, pages), max_chars) for start in range(0, pages, size)]
+    # spawn: never fork a web worker that may hold DB connections or locks.
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        results = pool.imap(_extract_chunk_star, chunks)
+        for _chunk in chunks:
+            wait = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            try:
+                chunk_pages = results.next(timeout=wait)
+            except multiprocessing.TimeoutError:
+                return
+            yield from chunk_pages
+    # Leaving the with block terminates workers still busy with later chunks.
+
+
+def _extract_chunk_star(arguments: tuple) -> list[str]:
+    return _extract_pdf_chunk(*arguments)
+
+
+def _extract_pdf(
+    file_path: str, max_pages: int, max_chars: int, deadline: float | None, workers: int
+) -> ExtractionResult:
     from pypdf import PdfReader
 
     reader = PdfReader(file_path)
-    return "\n".join((page.extract_text() or "") for page in reader).strip()
+    page_count = len(reader.pages)
+    pages = min(page_count, max_pages)
+    if workers > 0 and pages >= _limits["parallel_min_pages"]:
+        source = _parallel_pdf_pages(file_path, pages, max_chars, workers, deadline)
+    else:
+        source = (reader.pages[index].extract_text() or "" for index in range(pages))
+    text, used, truncated_by = _collect(source, pages, max_chars, deadline)
+    if truncated_by is None and page_count > pages:
+        truncated_by = "pages"
+    return ExtractionResult(text, used, page_count, truncated_by)
 
 
-def _extract_docx(file_path: str) -> str:
+def _extract_docx(file_path: str, max_chars: int, deadline: float | None) -> ExtractionResult:
     from docx import Document
 
-    document = Document(file_path)
-    return "\n".join(paragraph.text for paragraph in document.paragraphs).strip()
+    paragraphs = Document(file_path).paragraphs
+    text, _used, truncated_by = _collect(
+        (paragraph.text for paragraph in paragraphs), len(paragraphs), max_chars, deadline
+    )
+    return ExtractionResult(text, truncated_by=truncated_by)
 
 
-def _extract_doc(file_path: str) -> str:
-    with open(file_path, "rb") as uploaded_file:
-        return uploaded_file.read().decode("latin-1", errors="ignore").strip()
+def _extract_doc(file_path: str, max_chars: int, deadline: float | None) -> ExtractionResult:
+    if not is_compound_file(file_path):
+        # Word also saves plain text under a .doc name.
+        with open(file_path, "rb") as uploaded_file:
+            # latin-1 decodes one character per byte, so the budget bounds the read.
+            payload = uploaded_file.read(max_chars + 1)
+        text = payload[:max_chars].decode("latin-1", errors="ignore").strip()
+        return ExtractionResult(text, truncated_by="characters" if len(payload) > max_chars else None)
+    text, _used, truncated_by = _collect(iter_paragraphs(file_path, max_chars), None, max_chars, deadline)
+    return ExtractionResult(text, truncated_by=truncated_by)
 
 
 def _tokenize(text: str) -> Iterable[str]:
     return re.findall(r"[a-zA-Z0-9\+\#\.]{2,}", text.lower())
+
+
+def _main() -> None:
+    """Child side of extract_resume_with_timeout: the result goes to stdout as JSON, an error to stderr."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("file_path")
+    parser.add_argument("--max-pages", type=int, default=_limits["max_pages"])
+    parser.add_argument("--max-chars", type=int, default=_limits["max_chars"])
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--parallel-min-pages", type=int, default=_limits["parallel_min_pages"])
+    parser.add_argument("--timeout", type=float, default=None)
+    args = parser.parse_args()
+    configure(args.max_pages, args.max_chars, args.workers, args.parallel_min_pages)
+    try:
+        result = extract_resume(args.file_path, timeout=args.timeout)
+    except Exception as exc:
+        sys.exit(str(exc) or type(exc).__name__)
+    sys.stdout.buffer.write(json.dumps(asdict(result)).encode("utf-8"))
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,253 @@
+"""
+IRIS Resume Pipeline
+Extracts, scores and stores uploaded resumes off the request path.
+
+An upload only saves the file and a queued resume_uploads row. A local
+thread pool works through the queue: text extraction runs in a child
+process within the page, character and time budgets of resume_parser (and
+is killed if a single page overruns them), then the resume is scored and
+stored as a resume_data row. Each web process accepts at most
+`max_queued` uploads at a time and turns the rest away, so a burst of
+uploads cannot tie up its workers or memory.
+"""
+import hashlib
+import os
+import uuid
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from models import ResumeData, ResumeUpload, db
+from services.applicant_ranking import schedule_user_ranking
+from services.ats_analyzer import ResumeFeatures, stored_resume_features
+from services.background import TaskQueue
+from services.categorizer import resume_category
+from services.duplicate_flags import resume_duplicate_fields
+from services.recommendations import schedule_user_refresh
+from services.resume_parser import (
+    ExtractionResult,
+    extract_resume_with_timeout,
+    keyword_terms,
+    pack_terms,
+    score_keyword_terms,
+)
+from services.site_metrics import count_added
+from services.skill_analytics import stage_resume_upload
+from services.stored_keywords import resume_keyword_terms
+from services.talent_search import copied_search_fields, resume_saved, resume_search_fields
+
+_CHUNK_BYTES = 64 * 1024
+
+_settings = {"timeout": 60.0}
+_queue = TaskQueue("iris-resume", workers=2, max_queued=20)
+
+
+def configure(workers: int = 2, max_queued: int = 20, timeout: float = 60.0) -> None:
+    """
+    workers: uploads processed at once. max_queued: uploads accepted but not
+    finished, per process. timeout: seconds one file may spend in extraction.
+    """
+    _queue.configure(max(int(workers), 1), max_queued=max(int(max_queued), 1))
+    _settings.update(timeout=max(float(timeout), 1.0))
+
+
+def accepting() -> bool:
+    """Whether this process has room for another upload."""
+    return _queue.accepting()
+
+
+def submit(upload_id: int, path: str) -> bool:
+    """Queue a saved upload for processing; False when the queue is full."""
+    return _queue.submit(_process, upload_id, path) is not None
+
+
+def _process(upload_id: int, path: str) -> None:
+    try:
+        process_upload(upload_id, path)
+    except Exception:
+        current_app.logger.exception("Processing resume upload %s failed", upload_id)
+        db.session.rollback()
+        _finish(upload_id, path, "failed", "The resume could not be processed.")
+
+
+def save_upload(uploaded_file, folder: str, extension: str) -> tuple[str, str]:
+    """
+    Stream an uploaded file to disk, hashing it on the way. Returns
+    (file name, sha256 hex digest); content is stored once, as
+    <digest><extension>, however often it is uploaded.
+    """
+    digest = hashlib.sha256()
+    partial = os.path.join(folder, f".{uuid.uuid4().hex}.part")
+    try:
+        with open(partial, "wb") as target:
+            for chunk in iter(lambda: uploaded_file.stream.read(_CHUNK_BYTES), b""):
+                digest.update(chunk)
+                target.write(chunk)
+        content_hash = digest.hexdigest()
+        file_name = f"{content_hash}{extension}"
+        path = os.path.join(folder, file_name)
+        if os.path.exists(path):
+            os.remove(partial)
+        else:
+            os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    return file_name, content_hash
+
+
+def analyzed_resume(content_hash: str | None) -> ResumeData | None:
+    """The latest stored resume with this content, whose extraction and analysis can be reused."""
+    if not content_hash:
+        return None
+    return ResumeData.query.filter_by(content_hash=content_hash).order_by(ResumeData.id.desc()).first()
+
+
+def store_resume(
+    user_id: int, file_name: str, original_name: str, extraction: ExtractionResult, content_hash: str | None = None
+) -> ResumeData:
+    """Score extracted text and add it as the user's latest resume; the caller commits."""
+    extracted_text = extraction.text
+    stored_text = extracted_text or "No readable text found."
+    features = ResumeFeatures.from_text(extracted_text)
+    return _add_resume(user_id, features, resume_columns(
+        features,
+        keyword_terms(stored_text),
+        resume_search_fields(features),
+        extracted_text=stored_text,
+        file_name=file_name,
+        original_name=original_name,
+        content_hash=content_hash,
+        category=resume_category(extracted_text),
+        pages_processed=extraction.pages_processed or None,
+        text_truncated=extraction.truncated,
+    ))
+
+
+def reuse_resume(user_id: int, file_name: str, original_name: str, prior: ResumeData) -> ResumeData:
+    """Add the user's latest resume from the extraction and analysis of `prior`, which has the same content."""
+    features, columns = reused_columns(prior)
+    return _add_resume(user_id, features, {**columns, "file_name": file_name, "original_name": original_name})
+
+
+def resume_columns(features: ResumeFeatures, terms: frozenset[str], search_fields: dict, **columns) -> dict:
+    """resume_data values for analyzed content: keyword score and terms, features, search fields and `columns`."""
+    # Terms are stored so applying to a job never tokenizes the resume again.
+    analysis = score_keyword_terms(terms)
+    return {
+        "score": analysis["score"],
+        "keywords": ", ".join(analysis["keywords"]),
+        "keyword_terms": pack_terms(terms),
+        "features": features.to_json(),
+        **search_fields,
+        **columns,
+    }
+
+
+def reused_columns(prior: ResumeData) -> tuple[ResumeFeatures, dict]:
+    """Features and resume_data values, file names aside, for new content identical to `prior`."""
+    features = stored_resume_features(prior)
+    return features, resume_columns(
+        features,
+        resume_keyword_terms(prior),
+        copied_search_fields(prior, features),
+        extracted_text=prior.extracted_text,
+        content_hash=prior.content_hash,
+        category=prior.category or resume_category(prior.extracted_text),
+        pages_processed=prior.pages_processed,
+        text_truncated=prior.text_truncated,
+    )
+
+
+def _add_resume(user_id: int, features: ResumeFeatures, columns: dict) -> ResumeData:
+    stage_resume_upload(user_id, columns["skills"])
+    resume = ResumeData(user_id=user_id, **columns, **resume_duplicate_fields(user_id, features))
+    db.session.add(resume)
+    count_added(resume)
+    return resume
+
+
+def resume_committed(resume: ResumeData) -> None:
+    """Index a newly committed resume, then refresh its user's recommendations and application rankings."""
+    resume_saved(resume)
+    schedule_user_refresh(resume.user_id)
+    schedule_user_ranking(resume.user_id)
+
+
+def process_upload(upload_id: int, path: str) -> None:
+    """Extract, score and store one queued upload."""
+    upload = db.session.get(ResumeUpload, upload_id)
+    if upload is None:
+        # Deleted with its user while queued.
+        release_file(path)
+        return
+    upload.status = "processing"
+    db.session.commit()
+
+    # An identical file may have been analyzed while this one was queued.
+    prior = analyzed_resume(upload.content_hash)
+    extraction = None
+    if prior is None:
+        try:
+            extraction = extract_resume_with_timeout(path, _settings["timeout"])
+        except TimeoutError:
+            _finish(upload_id, path, "failed", "The resume took too long to read. Try a shorter file.")
+            return
+        except RuntimeError as exc:
+            current_app.logger.warning("Resume upload %s could not be read: %s", upload_id, exc)
+            _finish(upload_id, path, "failed", "The resume could not be read.")
+            return
+
+    upload = db.session.get(ResumeUpload, upload_id)
+    if upload is None:
+        release_file(path)
+        return
+    if extraction is None:
+        resume = reuse_resume(upload.user_id, upload.file_name, upload.original_name, prior)
+    else:
+        resume = store_resume(upload.user_id, upload.file_name, upload.original_name, extraction, upload.content_hash)
+    db.session.flush()
+    upload.resume_id = resume.id
+    upload.status = "ready"
+    upload.finished_at = datetime.utcnow()
+    db.session.commit()
+    resume_committed(resume)
+
+
+def _finish(upload_id: int, path: str, status: str, message: str) -> None:
+    upload = db.session.get(ResumeUpload, upload_id)
+    if upload is not None:
+        if upload.status == "ready":
+            # Stored already; only a follow-up step failed.
+            return
+        upload.status = status
+        upload.message = message
+        upload.finished_at = datetime.utcnow()
+        db.session.commit()
+    release_file(path)
+
+
+def release_file(path: str) -> None:
+    """Delete a stored upload unless a resume or an unfinished upload still uses its content."""
+    file_name = os.path.basename(path)
+    in_use = (
+        db.session.query(ResumeData.id).filter_by(file_name=file_name).first() is not None
+        or db.session.query(ResumeUpload.id)
+        .filter(ResumeUpload.file_name == file_name, ResumeUpload.status.in_(("queued", "processing")))
+        .first()
+        is not None
+    )
+    if not in_use and os.path.exists(path):
+        os.remove(path)
+
+
+def upload_state(upload: ResumeUpload) -> dict:
+    """Status payload for polling. Uploads left unfinished far past any queue wait count as failed."""
+    status, message = upload.status, upload.message
+    stale_after = timedelta(
+        seconds=_settings["timeout"] * (_queue.max_queued // _queue.workers + 2)
+    )
+    if status in ("queued", "processing") and datetime.utcnow() - upload.created_at > stale_after:
+        status, message = "failed", "Processing was interrupted. Please upload the resume again."
+    return {"status": status, "message": message, "resume_id": upload.resume_id}
@@ -0,0 +1,61 @@
+"""
+IRIS Resume Storage
+Finds each user's latest resume and moves resume text to compressed storage.
+
+A user's latest resume is their own upload with the highest id; resumes
+from an archive import never are. Applying, ranking applicants,
+recommendations, talent search and the skill rollups all use
+latest_resume or latest_resume_ids, so they agree on which one it is.
+
+ResumeData.extracted_text reads and writes the zlib-compressed
+compressed_text column and falls back to the plain column for rows stored
+before it existed. Both columns are deferred, so list queries never fetch
+resume text. The start-up schema upgrade adds the column and lets the plain
+one hold NULL on a database created before the change;
+compress_resume_texts then compresses the old rows a batch at a time.
+"""
+from sqlalchemy.orm import load_only
+
+from models import ResumeData, compress_text, db
+
+
+def latest_resume_ids(user_ids=None):
+    """Query for the id of each user's latest resume, of the given users or of everyone."""
+    query = db.session.query(db.func.max(ResumeData.id)).filter(ResumeData.import_id.is_(None))
+    if user_ids is not None:
+        query = query.filter(ResumeData.user_id.in_(user_ids))
+    return query.group_by(ResumeData.user_id)
+
+
+def latest_resume(user_id: int, *columns) -> ResumeData | None:
+    """The user's latest resume, loading only `columns` when any are given."""
+    query = ResumeData.query.filter_by(user_id=user_id, import_id=None)
+    if columns:
+        query = query.options(load_only(*columns))
+    return query.order_by(ResumeData.id.desc()).first()
+
+
+def compress_resume_texts(batch_size: int = 500) -> int:
+    """Compress the text of every resume still stored plain, batch_size rows per commit. Returns the rows compressed."""
+    compressed, last_id = 0, 0
+    while True:
+        rows = (
+            db.session.query(ResumeData.id, ResumeData.plain_text)
+            .filter(
+                ResumeData.id > last_id,
+                ResumeData.compressed_text.is_(None),
+                ResumeData.plain_text.isnot(None),
+            )
+            .order_by(ResumeData.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            return compressed
+        db.session.execute(
+            db.update(ResumeData),
+            [{"id": row.id, "compressed_text": compress_text(row.plain_text), "plain_text": None} for row in rows],
+        )
+        db.session.commit()
+        compressed += len(rows)
+        last_id = rows[-1].id
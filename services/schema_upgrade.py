@@ -0,0 +1,222 @@
+"""
+IRIS Schema Upgrade
+Brings tables created by an earlier version of the app up to the models.
+
+db.create_all() creates missing tables but never alters existing ones.
+upgrade_schema runs right after it at start-up and applies MIGRATIONS in
+order. Each migration names the columns one change added to, or relaxed on,
+an existing table. For each named column it adds the column if the table
+lacks it, fills NOT NULL ones for the rows already there, makes its NULL
+constraint match the model, and creates its missing indexes and foreign
+key. SQLite cannot alter a column, so tables whose constraints differ are
+rebuilt from the model once every migration has run. Every step checks the
+live schema first, so running it again changes nothing.
+"""
+from typing import NamedTuple
+
+from flask import current_app
+from sqlalchemy import MetaData, inspect
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.schema import AddConstraint, CreateIndex, CreateTable
+
+from models import db
+
+
+class Migration(NamedTuple):
+    """Columns, as "table.column", that one change brought to tables that may predate it."""
+
+    change: str
+    columns: tuple[str, ...]
+    # What existing rows get in a new NOT NULL column without a scalar default: another column.
+    backfill: dict[str, str] = {}
+
+
+MIGRATIONS = [
+    Migration(
+        "jobs.updated_at stamps the skill index",
+        ("jobs.updated_at",),
+        backfill={"jobs.updated_at": "created_at"},
+    ),
+    Migration("resume_data.features caches the extracted ResumeFeatures", ("resume_data.features",)),
+    Migration(
+        "resume_data search fields feed the talent index",
+        ("resume_data.skills", "resume_data.section_bonus", "resume_data.vector", "resume_data.vector_version"),
+    ),
+    Migration(
+        "applications hold the background ATS ranking",
+        (
+            "applications.ats_score",
+            "applications.matched_skills",
+            "applications.missing_skills",
+            "applications.ranked_at",
+        ),
+    ),
+    Migration(
+        "MinHash signatures and duplicate flags on jobs and resumes",
+        ("jobs.minhash", "jobs.duplicate_of", "resume_data.minhash", "resume_data.duplicate_of"),
+    ),
+    Migration("resume_data.category filters talent search", ("resume_data.category",)),
+    Migration(
+        "extraction budgets record what was read",
+        ("resume_data.pages_processed", "resume_data.text_truncated"),
+    ),
+    Migration("content hashes key stored uploads", ("resume_data.content_hash", "resume_uploads.content_hash")),
+    Migration(
+        "stored keyword terms for apply-time scoring",
+        ("resume_data.keyword_terms", "job_features.keyword_terms"),
+    ),
+    Migration("resume_data.import_id marks archive imports", ("resume_data.import_id",)),
+    Migration(
+        "resume text moves to a compressed column",
+        ("resume_data.compressed_text", "resume_data.extracted_text"),
+    ),
+    Migration(
+        "users.recommendations_built_at marks complete recommendation lists",
+        ("users.recommendations_built_at",),
+    ),
+]
+
+
+def upgrade_schema() -> list[str]:
+    """Apply MIGRATIONS to the tables that exist. Returns the statements applied."""
+    applied = []
+    tables = set(inspect(db.engine).get_table_names())
+    rebuild = {}
+    for migration in MIGRATIONS:
+        statements = []
+        try:
+            for table_name, names in _columns_by_table(migration.columns).items():
+                if table_name not in tables:
+                    continue
+                table = db.metadata.tables[table_name]
+                if _upgrade_columns(table, names, migration.backfill, statements):
+                    rebuild[table.name] = table
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            current_app.logger.exception("Schema upgrade for %s failed", migration.change)
+        applied += statements
+    # After the migrations, so the copy's columns all exist in the old table.
+    for table in rebuild.values():
+        statements = []
+        try:
+            _rebuild_sqlite_table(table, statements)
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            current_app.logger.exception("Rebuilding table %s failed", table.name)
+        applied += statements
+    for statement in applied:
+        current_app.logger.info("Schema upgrade: %s", statement)
+    return applied
+
+
+def _columns_by_table(columns: tuple[str, ...]) -> dict[str, list[str]]:
+    grouped = {}
+    for name in columns:
+        table_name, column_name = name.split(".")
+        grouped.setdefault(table_name, []).append(column_name)
+    return grouped
+
+
+def _run(statement, statements: list[str]) -> None:
+    if isinstance(statement, str):
+        db.session.execute(db.text(statement))
+    else:
+        db.session.execute(statement)
+        statement = str(statement.compile(dialect=db.engine.dialect))
+    statements.append(" ".join(statement.split()))
+
+
+def _column_type(column) -> str:
+    return column.type.compile(dialect=db.engine.dialect)
+
+
+def _references(column) -> str:
+    """Inline REFERENCES clause; SQLite cannot add a foreign key to an existing table any other way."""
+    quote = db.engine.dialect.identifier_preparer.quote
+    for foreign_key in column.foreign_keys:
+        target = foreign_key.column
+        clause = f" REFERENCES {quote(target.table.name)} ({quote(target.name)})"
+        return clause + (f" ON DELETE {foreign_key.ondelete}" if foreign_key.ondelete else "")
+    return ""
+
+
+def _upgrade_columns(table, names: list[str], backfill: dict[str, str], statements: list[str]) -> bool:
+    """Bring the named columns of one table up to the model. True when SQLite must rebuild the table."""
+    dialect = db.engine.dialect
+    quote = dialect.identifier_preparer.quote
+    columns = [table.c[name] for name in names]
+    inspector = inspect(db.session.connection())
+    present = {column["name"] for column in inspector.get_columns(table.name)}
+
+    for column in columns:
+        if column.name in present:
+            continue
+        # Added as NULL so existing rows are valid, then filled in.
+        definition = f"{quote(column.name)} {_column_type(column)} NULL"
+        if dialect.name == "sqlite":
+            definition += _references(column)
+        _run(f"ALTER TABLE {quote(table.name)} ADD COLUMN {definition}", statements)
+        if column.nullable:
+            continue
+        source = backfill.get(f"{table.name}.{column.name}")
+        if source is not None:
+            value = table.c[source]
+        elif column.default is not None and column.default.is_scalar:
+            value = column.default.arg
+        else:
+            raise RuntimeError(f"No value for the existing rows of {table.name}.{column.name}.")
+        _run(db.update(table).where(column.is_(None)).values({column.name: value}), statements)
+        if dialect.name != "sqlite":
+            _run(
+                f"ALTER TABLE {quote(table.name)} MODIFY {quote(column.name)} {_column_type(column)} NOT NULL",
+                statements,
+            )
+
+    # Columns the model now lets hold NULL; on SQLite also the NOT NULL ones just added.
+    inspector = inspect(db.session.connection())
+    nullable = {column["name"]: column["nullable"] for column in inspector.get_columns(table.name)}
+    changed = [column for column in columns if nullable[column.name] != column.nullable]
+    if dialect.name != "sqlite":
+        for column in changed:
+            if column.nullable:
+                _run(
+                    f"ALTER TABLE {quote(table.name)} MODIFY {quote(column.name)} {_column_type(column)} NULL",
+                    statements,
+                )
+
+    _create_indexes(table, names, inspector, statements)
+
+    if dialect.name != "sqlite":
+        constrained = {tuple(key["constrained_columns"]) for key in inspector.get_foreign_keys(table.name)}
+        for constraint in table.foreign_key_constraints:
+            if tuple(constraint.column_keys) not in constrained and constraint.column_keys[0] in names:
+                _run(AddConstraint(constraint), statements)
+    return dialect.name == "sqlite" and bool(changed)
+
+
+def _create_indexes(table, names: list[str], inspector, statements: list[str]) -> None:
+    """Create the missing model indexes of the table that cover any of the named columns."""
+    indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name not in indexes and any(column.name in names for column in index.columns):
+            _run(CreateIndex(index), statements)
+
+
+def _rebuild_sqlite_table(table, statements: list[str]) -> None:
+    """Recreate a table from its model and copy the rows over; SQLite cannot change a column's NULL constraint."""
+    quote = db.engine.dialect.identifier_preparer.quote
+    present = {column["name"] for column in inspect(db.session.connection()).get_columns(table.name)}
+    # The copy's foreign keys resolve against copies of every table, itself included.
+    metadata = MetaData()
+    for other in db.metadata.sorted_tables:
+        other.to_metadata(metadata)
+    rebuilt = table.to_metadata(metadata, name=f"{table.name}_upgrade")
+    columns = ", ".join(quote(column.name) for column in table.columns if column.name in present)
+    _run(CreateTable(rebuilt), statements)
+    _run(f"INSERT INTO {quote(rebuilt.name)} ({columns}) SELECT {columns} FROM {quote(table.name)}", statements)
+    # Indexes go with the old table and are created again from the model.
+    _run(f"DROP TABLE {quote(table.name)}", statements)
+    _run(f"ALTER TABLE {quote(rebuilt.name)} RENAME TO {quote(table.name)}", statements)
+    _create_indexes(table, [column.name for column in table.columns], inspect(db.session.connection()), statements)
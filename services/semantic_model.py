@@ -0,0 +1,423 @@
+"""
+IRIS Semantic Model
+Corpus-level TF-IDF model fitted once over all job descriptions.
+
+The fitted vectorizer and the per-job vectors are persisted to disk so each
+worker loads them at start instead of fitting a vectorizer per resume/JD pair.
+New or edited jobs are vectorized with the existing vocabulary; a full refit
+(which changes the IDF weights and therefore the model version) happens at
+start-up when the catalog has drifted, or on a schedule via the CLI.
+
+Only a refit rewrites the model file. Incremental vectors live in the
+job_features rows; a worker that changes a job touches a marker file next to
+the model, and every worker then reconciles its copy against the database.
+"""
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Callable, Iterable
+
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Bump when the persisted layout or vectorizer settings change.
+MODEL_FORMAT = 3
+
+# Refit once this fraction of the catalog has been added or edited since the last fit.
+REFIT_RATIO = 0.2
+
+# Rows stored or dropped since the last compaction before they are folded into the base matrix.
+COMPACT_ROWS = 512
+
+
+class _JobRows:
+    """
+    One immutable state of the stored job vectors: a base matrix, a short
+    tail of rows stored since it was built, and the base jobs dropped or
+    replaced since. A change builds a new state and swaps it in whole, so a
+    reader holding one state never sees half of a change, and storing a job
+    copies only the tail.
+    """
+
+    def __init__(
+        self,
+        base_ids: list[int],
+        base: sparse.csr_matrix,
+        tail_ids: list[int] | None = None,
+        tail: sparse.csr_matrix | None = None,
+        dropped: frozenset = frozenset(),
+        base_row_of: dict[int, int] | None = None,
+    ):
+        self.base_ids = base_ids
+        self.base = base
+        if base_row_of is None:
+            base_row_of = {job_id: row for row, job_id in enumerate(base_ids)}
+        self.base_row_of = base_row_of
+        self.tail_ids = tail_ids or []
+        self.tail = tail if tail is not None else sparse.csr_matrix((0, base.shape[1]))
+        self.tail_row_of = {job_id: row for row, job_id in enumerate(self.tail_ids)}
+        self.dropped = dropped
+        self._combined = None
+
+    def __getstate__(self) -> dict:
+        return {**self.__dict__, "_combined": None}
+
+    def __len__(self) -> int:
+        return len(self.base_ids) - len(self.dropped) + len(self.tail_ids)
+
+    def locate(self, job_id: int) -> tuple[int, int] | None:
+        """(0, base row) or (1, tail row) of a stored job, or None."""
+        row = self.tail_row_of.get(job_id)
+        if row is not None:
+            return 1, row
+        if job_id in self.dropped:
+            return None
+        row = self.base_row_of.get(job_id)
+        return (0, row) if row is not None else None
+
+    def combined(self) -> tuple[list[int], sparse.csr_matrix]:
+        """Every stored job id and its row as one matrix, in storage order; built once per state."""
+        if self._combined is None:
+            if not self.tail_ids and not self.dropped:
+                self._combined = (self.base_ids, self.base)
+            else:
+                live = [row for row, job_id in enumerate(self.base_ids) if job_id not in self.dropped]
+                matrix = sparse.vstack([self.base[live], self.tail], format='csr')
+                self._combined = ([self.base_ids[row] for row in live] + self.tail_ids, matrix)
+        return self._combined
+
+    def changed(self, drop: set[int], job_ids: list[int] | None = None, matrix=None) -> "_JobRows":
+        """This state with the jobs in `drop` removed and job_ids/matrix appended."""
+        keep = [row for row, job_id in enumerate(self.tail_ids) if job_id not in drop]
+        tail_ids = [self.tail_ids[row] for row in keep] + (job_ids or [])
+        tail = self.tail[keep] if len(keep) < len(self.tail_ids) else self.tail
+        if matrix is not None:
+            tail = sparse.vstack([tail, matrix], format='csr')
+        dropped = self.dropped | {job_id for job_id in drop if job_id in self.base_row_of}
+        rows = _JobRows(self.base_ids, self.base, tail_ids, tail, dropped, self.base_row_of)
+        if len(tail_ids) + len(dropped) > COMPACT_ROWS:
+            ids, combined = rows.combined()
+            rows = _JobRows(ids, combined)
+        return rows
+
+
+class SemanticModel:
+    """Fitted TF-IDF vectorizer plus the stored vector of every job."""
+
+    def __init__(self):
+        self.vectorizer: TfidfVectorizer | None = None
+        self.fitted_at: datetime | None = None
+        self.corpus_size = 0
+        self.pending_updates = 0
+        # Bumped on every stored or removed job.
+        self.revision = 0
+        self._rows = _JobRows([], sparse.csr_matrix((0, 0)))
+        # Job updated_at each row added since the fit was vectorized from.
+        self.job_stamps: dict[int, datetime] = {}
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+    @classmethod
+    def fit(cls, documents: Iterable[tuple[int, str]]) -> "SemanticModel":
+        """Fit over (job_id, cleaned_text) pairs and store every job vector."""
+        model = cls()
+        documents = [(job_id, text) for job_id, text in documents if text and text.strip()]
+        if not documents:
+            return model
+        vectorizer = TfidfVectorizer(stop_words='english', max_features=5000)
+        try:
+            matrix = vectorizer.fit_transform([text for _job_id, text in documents])
+        except ValueError:
+            # Corpus made only of stop words; nothing to learn yet.
+            return model
+        model.vectorizer = vectorizer
+        model.fitted_at = datetime.utcnow()
+        model.corpus_size = len(documents)
+        model._rows = _JobRows([job_id for job_id, _text in documents], matrix.tocsr())
+        return model
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.vectorizer is not None
+
+    @property
+    def version(self) -> str:
+        """Identifies the IDF weights; changes only on a full refit."""
+        if not self.is_fitted:
+            return f"{MODEL_FORMAT}.unfitted"
+        return f"{MODEL_FORMAT}.{self.fitted_at:%Y%m%d%H%M%S}.{self.corpus_size}"
+
+    def needs_refit(self) -> bool:
+        return not self.is_fitted or self.pending_updates > REFIT_RATIO * max(self.corpus_size, 1)
+
+    @property
+    def job_count(self) -> int:
+        return len(self._rows)
+
+    def stored_jobs(self) -> tuple[list[int], sparse.csr_matrix]:
+        """Ids of the stored jobs and their rows, from one consistent state."""
+        return self._rows.combined()
+
+    @property
+    def job_ids(self) -> list[int]:
+        return self.stored_jobs()[0]
+
+    @property
+    def job_matrix(self) -> sparse.csr_matrix:
+        return self.stored_jobs()[1]
+
+    # ── Incremental maintenance ──────────────────────────────────────────────
+    def upsert_job(self, job_id: int, text: str, updated_at: datetime | None = None) -> sparse.csr_matrix | None:
+        """Vectorize one job with the current vocabulary, store it and return it."""
+        if not self.is_fitted:
+            return None
+        vector = self.transform([text])
+        self.store_vectors([job_id], vector, [updated_at])
+        return vector
+
+    # Writers are serialized by the caller (the module lock for the active model).
+    def store_vectors(self, job_ids: list[int], matrix: sparse.csr_matrix, stamps: list[datetime | None]) -> None:
+        """Replace or add the rows of job_ids, vectorized from the job as of each stamp."""
+        self._rows = self._rows.changed(set(job_ids), list(job_ids), matrix)
+        for job_id, stamp in zip(job_ids, stamps):
+            if stamp is None:
+                self.job_stamps.pop(job_id, None)
+            else:
+                self.job_stamps[job_id] = stamp
+        self.pending_updates += len(job_ids)
+        self.revision += 1
+
+    def remove_job(self, job_id: int) -> None:
+        self.remove_jobs([job_id])
+
+    def remove_jobs(self, job_ids: list[int]) -> None:
+        for job_id in job_ids:
+            self.job_stamps.pop(job_id, None)
+        rows = self._rows
+        drop = {job_id for job_id in job_ids if rows.locate(job_id) is not None}
+        if drop:
+            self._rows = rows.changed(drop)
+            self.revision += 1
+
+    def drift(self, jobs: dict[int, datetime]) -> tuple[list[int], list[int]]:
+        """
+        Compare the stored rows with {job_id: updated_at} from the jobs table:
+        (job ids no longer there, job ids missing here or stored from an
+        older version of the job).
+        """
+        rows = self._rows
+        removed = [job_id for job_id in rows.combined()[0] if job_id not in jobs]
+        stale = [
+            job_id
+            for job_id, updated_at in jobs.items()
+            if rows.locate(job_id) is None or updated_at > self.job_stamps.get(job_id, self.fitted_at)
+        ]
+        return removed, stale
+
+    # ── Scoring ──────────────────────────────────────────────────────────────
+    def transform(self, texts: list[str]) -> sparse.csr_matrix:
+        """L2-normalized TF-IDF rows, so a dot product is a cosine similarity."""
+        return self.vectorizer.transform(texts)
+
+    def job_vectors(
+        self, job_ids: list | None, job_texts: list[str], stored: list | None = None
+    ) -> sparse.csr_matrix:
+        """
+        Rows for the jobs, in order: the model's own row for a known job id,
+        else a packed vector from `stored` written under this model version,
+        else a fresh transform of the job text.
+        """
+        rows = self._rows
+        if not job_texts:
+            return sparse.csr_matrix((0, rows.base.shape[1]))
+        if job_ids is None:
+            found = [None] * len(job_texts)
+        else:
+            found = [rows.locate(job_id) for job_id in job_ids]
+        parts, positions = [], []
+        for source, matrix in ((0, rows.base), (1, rows.tail)):
+            picked = [(i, location[1]) for i, location in enumerate(found) if location and location[0] == source]
+            if picked:
+                parts.append(matrix[[row for _i, row in picked]])
+                positions.extend(i for i, _row in picked)
+        missing = [i for i, location in enumerate(found) if location is None]
+        if missing:
+            parts.append(self._vectors_for(missing, job_texts, stored))
+            positions.extend(missing)
+        stacked = parts[0] if len(parts) == 1 else sparse.vstack(parts, format='csr')
+        if positions == sorted(positions):
+            return stacked
+        order = np.empty(len(positions), dtype=np.intp)
+        order[positions] = np.arange(len(positions))
+        return stacked[order]
+
+    def _vectors_for(self, indexes: list[int], job_texts: list[str], stored: list | None) -> sparse.csr_matrix:
+        width = len(self.vectorizer.vocabulary_)
+        packed = {}
+        if stored is not None:
+            for i in indexes:
+                version, payload = stored[i] or (None, None)
+                if payload is not None and version == self.version:
+                    packed[i] = unpack_vector(payload, width)
+        if len(packed) == len(indexes):
+            return sparse.vstack([packed[i] for i in indexes], format='csr')
+        unpacked = [i for i in indexes if i not in packed]
+        transformed = self.transform([job_texts[i] for i in unpacked])
+        if not packed:
+            return transformed.tocsr()
+        row_of = {i: transformed[position] for position, i in enumerate(unpacked)}
+        return sparse.vstack([packed.get(i, row_of.get(i)) for i in indexes], format='csr')
+
+    def similarities(
+        self, resume_text: str, job_texts: list[str], job_ids: list | None = None, stored: list | None = None
+    ) -> list[float]:
+        """
+        Semantic scores (0-100) of one resume against many jobs: one resume
+        transform and one sparse product. Stored vectors are used for job_ids.
+        """
+        if not job_texts:
+            return []
+        resume_vector = self.transform([resume_text])
+        matrix = self.job_vectors(job_ids, job_texts, stored)
+        sims = (matrix @ resume_vector.T).toarray().ravel()
+        return [round(float(sim) * 100, 1) for sim in sims]
+
+    # ── Persistence ──────────────────────────────────────────────────────────
+    def save(self, path: str) -> None:
+        """Write atomically so concurrent workers never load a partial file."""
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(handle)
+        try:
+            joblib.dump({"format": MODEL_FORMAT, "model": self}, temp_path)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    @classmethod
+    def load(cls, path: str) -> "SemanticModel | None":
+        try:
+            payload = joblib.load(path)
+        except Exception:
+            return None
+        if not isinstance(payload, dict) or payload.get("format") != MODEL_FORMAT:
+            return None
+        return payload["model"]
+
+
+def pack_vector(vector: sparse.csr_matrix) -> bytes:
+    """Compact bytes for one TF-IDF row: int32 column indexes, then float32 weights."""
+    row = vector.tocsr()
+    return row.indices.astype("<i4").tobytes() + row.data.astype("<f4").tobytes()
+
+
+def unpack_vector(payload: bytes, width: int) -> sparse.csr_matrix:
+    count = len(payload) // 8
+    indices = np.frombuffer(payload, dtype="<i4", count=count)
+    data = np.frombuffer(payload, dtype="<f4", count=count, offset=count * 4).astype(np.float64)
+    return sparse.csr_matrix((data, indices, [0, count]), shape=(1, width))
+
+
+# ── Process-wide active model ────────────────────────────────────────────────
+_lock = threading.Lock()
+_active = SemanticModel()
+_model_path: str | None = None
+_loaded_mtime: float | None = None
+# Brings a loaded model in line with the jobs table; returns False when it could not.
+_reconcile: Callable[[SemanticModel], bool] | None = None
+_synced_change: int | None = None
+
+
+def configure(path: str, reconcile: Callable[[SemanticModel], bool] | None = None) -> None:
+    """Set where the model is persisted and how to reconcile it, and load it if present."""
+    global _model_path, _reconcile
+    _model_path = path
+    _reconcile = reconcile
+    _reload_if_changed()
+
+
+def _change_marker() -> str:
+    return f"{_model_path}.changed"
+
+
+def _marker_mtime() -> int | None:
+    try:
+        return os.stat(_change_marker()).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _reload_if_changed() -> None:
+    global _active, _loaded_mtime, _synced_change
+    if not _model_path:
+        return
+    try:
+        mtime = os.path.getmtime(_model_path)
+    except OSError:
+        return
+    changed = _marker_mtime()
+    if mtime == _loaded_mtime and changed == _synced_change:
+        return
+    with _lock:
+        if mtime != _loaded_mtime:
+            model = SemanticModel.load(_model_path)
+            if model is None:
+                return
+            _active = model
+            _loaded_mtime = mtime
+        if _reconcile is None or _reconcile(_active):
+            _synced_change = changed
+
+
+def get_model() -> SemanticModel:
+    """Return the active model, picking up a refit or job changes from another worker."""
+    _reload_if_changed()
+    return _active
+
+
+def set_model(model: SemanticModel) -> None:
+    """Install a model for this process and persist it for the others."""
+    global _active, _loaded_mtime
+    with _lock:
+        _active = model
+        if _model_path:
+            model.save(_model_path)
+            _loaded_mtime = os.path.getmtime(_model_path)
+
+
+def refit(documents: Iterable[tuple[int, str]]) -> SemanticModel:
+    model = SemanticModel.fit(documents)
+    set_model(model)
+    return model
+
+
+def mark_changed() -> None:
+    """Tell every worker, this one included, to reconcile its model with the jobs table."""
+    if not _model_path:
+        return
+    marker = _change_marker()
+    try:
+        with open(marker, "a"):
+            pass
+        os.utime(marker)
+    except OSError:
+        pass
+
+
+def upsert_job(job_id: int, text: str, updated_at: datetime | None = None) -> sparse.csr_matrix | None:
+    """Vectorize a saved job into this worker's model; the caller stores the vector and marks the change."""
+    model = get_model()
+    if not model.is_fitted:
+        return None
+    with _lock:
+        return model.upsert_job(job_id, text, updated_at)
+
+
+def remove_job(job_id: int) -> None:
+    model = get_model()
+    with _lock:
+        model.remove_job(job_id)
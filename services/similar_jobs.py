@@ -0,0 +1,177 @@
+"""
+IRIS Similar Jobs
+Precomputed nearest-neighbor lists between jobs for the job detail page.
+
+Similarity blends TF-IDF cosine and skill-set Jaccard over the catalog
+matrices (see job_recommender.CatalogMatrix). A posted or edited job gets
+its list from one pass over the catalog; since similarity is symmetric,
+the same pass shows which other lists the job now enters or may have
+left, and only those are touched. Lists are ordered by similarity, lower
+job id on ties, and only hold jobs with some similarity. Near-duplicate
+jobs, hidden from listings, never appear in a list.
+"""
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy.orm import contains_eager
+
+from models import Job, SimilarJob, db
+from services import background
+from services.job_recommender import CatalogMatrix, catalog_matrix
+
+SIMILAR_JOB_COUNT = 4
+# Stored similarities are rounded so both directions of a pair compare equal.
+_PRECISION = 4
+
+
+def similar_jobs(job_id: int) -> list[SimilarJob]:
+    """The stored neighbors with their jobs loaded, most similar first."""
+    return (
+        SimilarJob.query.join(SimilarJob.similar_job)
+        .options(contains_eager(SimilarJob.similar_job))
+        # A neighbor flagged as a duplicate after the list was written.
+        .filter(SimilarJob.job_id == job_id, Job.duplicate_of.is_(None))
+        .order_by(SimilarJob.score.desc(), SimilarJob.similar_job_id)
+        .all()
+    )
+
+
+def _similarities(catalog: CatalogMatrix, row: int) -> np.ndarray:
+    scores = np.round(catalog.job_similarities(row), _PRECISION)
+    scores[row] = 0.0
+    return scores
+
+
+def _neighbors(catalog: CatalogMatrix, scores: np.ndarray) -> list[tuple[int, float]]:
+    """The SIMILAR_JOB_COUNT best (job_id, score) pairs with a positive score, near-duplicates left out."""
+    rows = np.setdiff1d(np.flatnonzero(scores > 0), catalog.duplicate_rows)
+    if len(rows) > SIMILAR_JOB_COUNT:
+        kth = np.partition(scores[rows], len(rows) - SIMILAR_JOB_COUNT)[len(rows) - SIMILAR_JOB_COUNT]
+        rows = rows[scores[rows] >= kth]
+    order = np.lexsort((catalog.job_ids[rows], -scores[rows]))[:SIMILAR_JOB_COUNT]
+    return [(int(catalog.job_ids[row]), float(scores[row])) for row in rows[order]]
+
+
+def _existing_job_ids(job_ids: list[int], listable: bool = False) -> set[int]:
+    # The catalog can still hold a job deleted, or flagged as a duplicate, while a task was running.
+    if not job_ids:
+        return set()
+    query = db.session.query(Job.id).filter(Job.id.in_(job_ids))
+    if listable:
+        query = query.filter(Job.duplicate_of.is_(None))
+    return {job_id for (job_id,) in query}
+
+
+def _replace(job_id: int, neighbors: list[tuple[int, float]], listable: set[int], now: datetime) -> None:
+    SimilarJob.query.filter_by(job_id=job_id).delete(synchronize_session="fetch")
+    for similar_job_id, score in neighbors:
+        if similar_job_id in listable:
+            db.session.add(SimilarJob(job_id=job_id, similar_job_id=similar_job_id, score=score, computed_at=now))
+
+
+def refresh_similar_jobs(job_ids: list[int]) -> int:
+    """Recompute the lists of the given jobs from scratch. Returns the number written."""
+    catalog = catalog_matrix()
+    lists = {}
+    for job_id in job_ids:
+        row = catalog.row_of(job_id) if catalog is not None else None
+        lists[job_id] = _neighbors(catalog, _similarities(catalog, row)) if row is not None else []
+    existing = _existing_job_ids(job_ids)
+    listable = _existing_job_ids(
+        sorted({neighbor for pairs in lists.values() for neighbor, _score in pairs}), listable=True
+    )
+    now = datetime.utcnow()
+    for job_id, neighbors in lists.items():
+        if job_id in existing:
+            _replace(job_id, neighbors, listable, now)
+    db.session.commit()
+    if catalog_matrix() is not catalog:
+        # A job was posted, edited or deleted meanwhile; recompute against the new catalog.
+        schedule_similar_refresh(job_ids)
+    return len(lists)
+
+
+def update_similar_jobs(job_id: int) -> int:
+    """
+    After a job is posted or edited: rebuild its list and merge it into the
+    lists of other jobs. Returns the number of other lists changed.
+    """
+    catalog = catalog_matrix()
+    row = catalog.row_of(job_id) if catalog is not None else None
+    if row is None:
+        return 0
+    scores = _similarities(catalog, row)
+    now = datetime.utcnow()
+    neighbors = _neighbors(catalog, scores)
+    _replace(job_id, neighbors, _existing_job_ids([neighbor for neighbor, _score in neighbors], listable=True), now)
+    if row in catalog.duplicate_rows:
+        # A near-duplicate enters no list, and leaves those it was in.
+        scores = np.zeros_like(scores)
+
+    # A full list admits the job only at or above its current last entry.
+    row_of = {other: position for position, other in enumerate(catalog.job_ids.tolist())}
+    floors = np.zeros(len(catalog))
+    for other, count, lowest in db.session.query(
+        SimilarJob.job_id, db.func.count(), db.func.min(SimilarJob.score)
+    ).group_by(SimilarJob.job_id):
+        if count >= SIMILAR_JOB_COUNT and other in row_of:
+            floors[row_of[other]] = lowest
+    listed = np.zeros(len(catalog), dtype=bool)
+    for (other,) in db.session.query(SimilarJob.job_id).filter_by(similar_job_id=job_id):
+        if other in row_of:
+            listed[row_of[other]] = True
+    candidates = ((scores > 0) & (scores >= floors)) | listed
+    candidates[row] = False
+
+    changed, stale = 0, []
+    others = catalog.job_ids[candidates].tolist()
+    for start in range(0, len(others), 500):
+        chunk = others[start:start + 500]
+        existing = _existing_job_ids(chunk)
+        chunk = [other for other in chunk if other in existing]
+        lists = {other: [] for other in chunk}
+        for entry in SimilarJob.query.filter(SimilarJob.job_id.in_(chunk)):
+            lists[entry.job_id].append(entry)
+        for other in chunk:
+            score, entries = float(scores[row_of[other]]), lists[other]
+            current = next((entry for entry in entries if entry.similar_job_id == job_id), None)
+            if current is not None:
+                if score < current.score or score <= 0:
+                    # Another job may now outrank it.
+                    stale.append(other)
+                    continue
+                current.score, current.computed_at = score, now
+            else:
+                if len(entries) >= SIMILAR_JOB_COUNT:
+                    worst = min(entries, key=lambda entry: (entry.score, -entry.similar_job_id))
+                    if (score, -job_id) <= (worst.score, -worst.similar_job_id):
+                        continue
+                    db.session.delete(worst)
+                db.session.add(SimilarJob(job_id=other, similar_job_id=job_id, score=score, computed_at=now))
+            changed += 1
+    db.session.commit()
+
+    if stale:
+        refresh_similar_jobs(stale)
+    if catalog_matrix() is not catalog:
+        schedule_similar_refresh([job_id])
+    return changed + len(stale)
+
+
+def referring_job_ids(job_ids: list[int]) -> list[int]:
+    """Other jobs listing any of job_ids as a neighbor; read before deleting them, since the rows go with them."""
+    rows = (
+        db.session.query(SimilarJob.job_id)
+        .filter(SimilarJob.similar_job_id.in_(job_ids), SimilarJob.job_id.notin_(job_ids))
+        .distinct()
+    )
+    return sorted(other for (other,) in rows)
+
+
+def schedule_similar_update(job_id: int) -> None:
+    background.submit(update_similar_jobs, job_id, key=("similar_jobs", job_id))
+
+
+def schedule_similar_refresh(job_ids: list[int]) -> None:
+    if job_ids:
+        background.submit(refresh_similar_jobs, sorted(job_ids))
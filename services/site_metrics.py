@@ -0,0 +1,130 @@
+"""
+IRIS Site Metrics
+Daily counts of new users, jobs, applications and resumes for the admin dashboard.
+
+Each daily_metrics row holds what was created on one (UTC) day and still
+exists. Writers stage +1/-1 deltas in the same transaction as the rows
+they add or delete, so the dashboard sums a few hundred day rows instead
+of scanning the tables it reports on.
+"""
+from collections import Counter, defaultdict
+from datetime import date
+
+from sqlalchemy.exc import IntegrityError
+
+from models import Application, DailyMetric, Job, ResumeData, User, db
+
+# Column counting each model, and the timestamp that dates its rows.
+_COUNTED = {
+    User: ("user_count", User.created_at),
+    Job: ("job_count", Job.created_at),
+    Application: ("application_count", Application.applied_at),
+    ResumeData: ("resume_count", ResumeData.uploaded_at),
+}
+COUNT_COLUMNS = tuple(column for column, _timestamp in _COUNTED.values())
+
+
+def _as_date(value) -> date:
+    # DATE() comes back as a string on SQLite.
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _apply(deltas: Counter) -> None:
+    """Add {(day, column): delta} to the day rows, creating missing days."""
+    by_day = defaultdict(dict)
+    for (day, column), delta in deltas.items():
+        if delta:
+            by_day[day][column] = delta
+    for day, changes in sorted(by_day.items()):
+        update = (
+            db.update(DailyMetric)
+            .where(DailyMetric.day == day)
+            .values({column: getattr(DailyMetric, column) + delta for column, delta in changes.items()})
+        )
+        if db.session.execute(update).rowcount:
+            continue
+        try:
+            with db.session.begin_nested():
+                db.session.add(DailyMetric(day=day, **changes))
+        except IntegrityError:
+            # Another transaction created the day first.
+            db.session.execute(update)
+
+
+def _daily_counts(model, *criteria) -> Counter:
+    column, timestamp = _COUNTED[model]
+    day = db.func.date(timestamp)
+    rows = db.session.query(day, db.func.count()).select_from(model).filter(*criteria).group_by(day)
+    return Counter({(_as_date(value), column): count for value, count in rows})
+
+
+def count_added(*rows) -> None:
+    """Count users, jobs, applications or resumes the caller has just added; the caller commits."""
+    # Timestamps are filled in on flush.
+    db.session.flush()
+    deltas = Counter()
+    for row in rows:
+        column, timestamp = _COUNTED[type(row)]
+        deltas[(getattr(row, timestamp.key).date(), column)] += 1
+    _apply(deltas)
+
+
+def uncount_job(job: Job) -> None:
+    """Uncount a job about to be deleted, with its applications; the caller commits."""
+    deltas = Counter({(job.created_at.date(), "job_count"): 1})
+    deltas.update(_daily_counts(Application, Application.job_id == job.id))
+    _apply(Counter({key: -count for key, count in deltas.items()}))
+
+
+def uncount_user(user: User) -> None:
+    """Uncount a user about to be deleted, with everything deleted along with them; the caller commits."""
+    own_jobs = db.session.query(Job.id).filter(Job.employer_id == user.id)
+    deltas = Counter({(user.created_at.date(), "user_count"): 1})
+    deltas.update(_daily_counts(Job, Job.employer_id == user.id))
+    deltas.update(
+        _daily_counts(Application, (Application.user_id == user.id) | Application.job_id.in_(own_jobs))
+    )
+    deltas.update(_daily_counts(ResumeData, ResumeData.user_id == user.id))
+    _apply(Counter({key: -count for key, count in deltas.items()}))
+
+
+def init_site_metrics(app) -> None:
+    """Count existing rows into an empty daily_metrics table, as on first start with it."""
+    if db.session.query(DailyMetric.day).first() is not None or db.session.query(User.id).first() is None:
+        return
+    totals = rebuild_site_metrics()
+    app.logger.info("Daily metrics counted for %s users", totals["user_count"])
+
+
+def rebuild_site_metrics() -> dict:
+    """Recount every day from the tables. Returns the totals per column."""
+    deltas = Counter()
+    for model in _COUNTED:
+        deltas.update(_daily_counts(model))
+    DailyMetric.query.delete(synchronize_session=False)
+    days = defaultdict(dict)
+    for (day, column), count in deltas.items():
+        days[day][column] = count
+    db.session.add_all(DailyMetric(day=day, **counts) for day, counts in days.items())
+    db.session.commit()
+    totals = Counter()
+    for (_day, column), count in deltas.items():
+        totals[column] += count
+    return {column: totals[column] for column in COUNT_COLUMNS}
+
+
+def monthly_metrics() -> list[dict]:
+    """Sums per month with any activity, oldest first: {"month": date of the 1st, <count columns>}."""
+    year = db.extract("year", DailyMetric.day)
+    month = db.extract("month", DailyMetric.day)
+    rows = (
+        db.session.query(year, month, *(db.func.sum(getattr(DailyMetric, column)) for column in COUNT_COLUMNS))
+        .group_by(year, month)
+        .order_by(year, month)
+    )
+    months = []
+    for row_year, row_month, *counts in rows:
+        counts = [int(count or 0) for count in counts]
+        if any(counts):
+            months.append({"month": date(int(row_year), int(row_month), 1), **dict(zip(COUNT_COLUMNS, counts))})
+    return months
@@ -0,0 +1,161 @@
+"""
+IRIS Skill Analytics
+Rollup counts of taxonomy skills and suggested roles in job demand and resume supply.
+
+A job counts with the skills in its job_features row; a user counts once,
+with the skills of their latest resume. Each also counts toward the three
+roles suggest_jobs would recommend for those skills. Writers stage +1/-1
+deltas in the same transaction as the row they change, so reading the
+rollups is a scan of two small tables whatever the data size.
+"""
+import json
+
+import numpy as np
+from sqlalchemy.orm import load_only
+
+from models import JobFeatureEntry, ResumeData, RoleDemand, SkillDemand, db
+from services.ats_analyzer import ALL_SKILLS_UNIQUE, SKILL_TAXONOMY
+from services.job_recommender import ROLE_NAMES, skill_incidence, top_role_columns, top_roles
+from services.resume_storage import latest_resume, latest_resume_ids
+
+_SKILL_CATEGORY = {}
+for _category, _skills in SKILL_TAXONOMY.items():
+    for _skill in _skills:
+        _SKILL_CATEGORY.setdefault(_skill, _category)
+
+
+def _stage(column: str, old_skills: list[str] | None, new_skills: list[str] | None) -> None:
+    old, new = set(old_skills or ()), set(new_skills or ())
+    if old == new:
+        return
+    old_roles, new_roles = (set(roles) for roles in top_roles(skill_incidence([old, new])))
+    for model, key, added, removed in (
+        (SkillDemand, SkillDemand.skill, new - old, old - new),
+        (RoleDemand, RoleDemand.role, new_roles - old_roles, old_roles - new_roles),
+    ):
+        counter = getattr(model, column)
+        for names, delta in ((added, 1), (removed, -1)):
+            if names:
+                db.session.execute(db.update(model).where(key.in_(names)).values({column: counter + delta}))
+
+
+def stage_job_skills(old_skills: list[str] | None, new_skills: list[str] | None) -> None:
+    """Move a job's demand counts from old_skills to new_skills; the caller commits."""
+    _stage("job_count", old_skills, new_skills)
+
+
+def stage_resume_skills(old_skills: list[str] | None, new_skills: list[str] | None) -> None:
+    """Move a user's supply counts from their old latest resume to the new one; the caller commits."""
+    _stage("resume_count", old_skills, new_skills)
+
+
+def counted_job_skills(entry: JobFeatureEntry | None) -> list[str]:
+    """Skills a job is counted with: those of its job_features row, if any."""
+    return json.loads(entry.skills) if entry is not None and entry.skills else []
+
+
+def latest_resume_skills(user_id: int) -> list[str]:
+    """Skills the user is counted with: those of their latest stored resume."""
+    with db.session.no_autoflush:
+        resume = latest_resume(user_id, ResumeData.skills)
+    return json.loads(resume.skills) if resume is not None and resume.skills else []
+
+
+def stage_resume_upload(user_id: int, skills: str | None) -> None:
+    """Count a resume about to be added (JSON `skills`) as the user's latest instead of the current one."""
+    stage_resume_skills(latest_resume_skills(user_id), json.loads(skills) if skills else [])
+
+
+def stage_job_removal(job) -> None:
+    """Uncount a job about to be deleted; the caller commits."""
+    stage_job_skills(counted_job_skills(job.feature_entry), None)
+
+
+def stage_user_removal(user) -> None:
+    """Uncount a user's latest resume and jobs before the user is deleted; the caller commits."""
+    stage_resume_skills(latest_resume_skills(user.id), None)
+    for job in user.jobs:
+        stage_job_removal(job)
+
+
+def init_skill_analytics(app) -> None:
+    """Create a zero row per taxonomy skill and role; recount everything when the set changed."""
+    skills = {skill for (skill,) in db.session.query(SkillDemand.skill)}
+    roles = {role for (role,) in db.session.query(RoleDemand.role)}
+    if skills == set(ALL_SKILLS_UNIQUE) and roles == set(ROLE_NAMES):
+        return
+    SkillDemand.query.filter(SkillDemand.skill.notin_(ALL_SKILLS_UNIQUE)).delete(synchronize_session=False)
+    RoleDemand.query.filter(RoleDemand.role.notin_(ROLE_NAMES)).delete(synchronize_session=False)
+    db.session.add_all(SkillDemand(skill=skill) for skill in ALL_SKILLS_UNIQUE if skill not in skills)
+    db.session.add_all(RoleDemand(role=role) for role in ROLE_NAMES if role not in roles)
+    db.session.commit()
+    rebuild_skill_analytics()
+    app.logger.info("Skill analytics recounted for a changed skill taxonomy or role map")
+
+
+def rebuild_skill_analytics(batch_size: int = 5000) -> dict:
+    """Recount every rollup from job_features and each user's latest resume. Returns the row totals."""
+    job_rows = db.session.query(JobFeatureEntry.skills).yield_per(batch_size)
+    resume_rows = (
+        ResumeData.query.options(load_only(ResumeData.skills))
+        .filter(ResumeData.id.in_(latest_resume_ids()))
+        .yield_per(batch_size)
+    )
+    job_skills, job_roles, jobs = _count(job_rows, batch_size)
+    resume_skills, resume_roles, resumes = _count(resume_rows, batch_size)
+
+    for column, (skill_counts, role_counts) in (
+        ("job_count", (job_skills, job_roles)),
+        ("resume_count", (resume_skills, resume_roles)),
+    ):
+        db.session.execute(
+            db.update(SkillDemand),
+            [{"skill": skill, column: int(count)} for skill, count in zip(ALL_SKILLS_UNIQUE, skill_counts)],
+        )
+        db.session.execute(
+            db.update(RoleDemand),
+            [{"role": role, column: int(count)} for role, count in zip(ROLE_NAMES, role_counts)],
+        )
+    db.session.commit()
+    return {"jobs": jobs, "resumes": resumes}
+
+
+def _count(rows, batch_size: int) -> tuple[np.ndarray, np.ndarray, int]:
+    """Per-skill and per-role totals over rows with a JSON `skills` column, a batch at a time."""
+    skill_counts = np.zeros(len(ALL_SKILLS_UNIQUE), dtype=np.int64)
+    role_counts = np.zeros(len(ROLE_NAMES), dtype=np.int64)
+    total, batch = 0, []
+
+    def flush():
+        incidence = skill_incidence(batch)
+        skill_counts[:] += np.asarray(incidence.sum(axis=0), dtype=np.int64).ravel()
+        order, matched = top_role_columns(incidence)
+        np.add.at(role_counts, order[matched], 1)
+
+    for row in rows:
+        batch.append(json.loads(row.skills) if row.skills else [])
+        total += 1
+        if len(batch) >= batch_size:
+            flush()
+            batch = []
+    if batch:
+        flush()
+    return skill_counts, role_counts, total
+
+
+def skill_report() -> dict:
+    """Both rollup tables, ordered by job demand, with each skill's category."""
+    skills = SkillDemand.query.order_by(SkillDemand.job_count.desc(), SkillDemand.skill).all()
+    roles = RoleDemand.query.order_by(RoleDemand.job_count.desc(), RoleDemand.role).all()
+    return {
+        "skills": [
+            {
+                "name": row.skill,
+                "category": _SKILL_CATEGORY.get(row.skill, ""),
+                "jobs": row.job_count,
+                "resumes": row.resume_count,
+            }
+            for row in skills
+        ],
+        "roles": [{"name": row.role, "jobs": row.job_count, "resumes": row.resume_count} for row in roles],
+    }
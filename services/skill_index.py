@@ -0,0 +1,78 @@
+"""
+IRIS Skill Index
+In-memory inverted index from taxonomy skill to the ids of jobs requiring it.
+
+Each entry carries the job's `updated_at` stamp, so an entry left stale by a
+write in another worker is detected and the job is scored in full.
+"""
+import threading
+from collections import defaultdict
+from typing import Iterable
+
+
+class SkillIndex:
+    """skill -> job ids, plus job id -> (skills, stamp)."""
+
+    def __init__(self):
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self._jobs: dict[int, tuple[frozenset, object]] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def upsert(self, job_id: int, skills: Iterable[str], stamp: object = None) -> None:
+        skills = frozenset(skills)
+        with self._lock:
+            self._drop(job_id)
+            self._jobs[job_id] = (skills, stamp)
+            for skill in skills:
+                self._postings[skill].add(job_id)
+            self.generation += 1
+
+    def remove(self, job_id: int) -> None:
+        with self._lock:
+            self._drop(job_id)
+            self.generation += 1
+
+    def _drop(self, job_id: int) -> None:
+        entry = self._jobs.pop(job_id, None)
+        if entry is None:
+            return
+        for skill in entry[0]:
+            postings = self._postings.get(skill)
+            if postings is not None:
+                postings.discard(job_id)
+                if not postings:
+                    del self._postings[skill]
+
+    def rebuild(self, entries: Iterable[tuple[int, Iterable[str], object]]) -> None:
+        fresh = SkillIndex()
+        for job_id, skills, stamp in entries:
+            fresh.upsert(job_id, skills, stamp)
+        with self._lock:
+            self._postings, self._jobs = fresh._postings, fresh._jobs
+            self.generation += 1
+
+    def skills_of(self, job_id: int, stamp: object = None) -> frozenset | None:
+        """Indexed skills of a job, or None if it is unknown or its stamp differs."""
+        entry = self._jobs.get(job_id)
+        if entry is None or entry[1] != stamp:
+            return None
+        return entry[0]
+
+    def indexed_skills(self, job_id: int) -> frozenset | None:
+        """Indexed skills of a job without the staleness check, for approximate retrieval."""
+        entry = self._jobs.get(job_id)
+        return entry[0] if entry is not None else None
+
+    def jobs_with_any(self, skills: Iterable[str]) -> set[int]:
+        """Ids of jobs sharing at least one skill with `skills`."""
+        found = set()
+        for skill in skills:
+            found |= self._postings.get(skill, set())
+        return found
+
+
+skill_index = SkillIndex()
@@ -0,0 +1,80 @@
+"""
+IRIS Skill Matcher
+Token-trie matcher that finds every vocabulary term in a single pass over text.
+"""
+import re
+from typing import Iterable
+
+# Word runs and single punctuation characters are tokens; whitespace only
+# separates them. Maximal word runs give us word-boundary semantics for free.
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# Tokens are never empty, so the empty string can mark the end of a term.
+_TERMINAL = ""
+
+
+def _keys(text: str) -> list[str]:
+    """
+    Tokenize lowercased text into trie keys.
+    A token preceded by whitespace is prefixed with a space so that
+    "power bi" matches "power  bi" but not "powerbi" or "power.bi".
+    """
+    keys = []
+    previous_end = None
+    for match in _TOKEN_RE.finditer(text):
+        token = match.group()
+        if previous_end is not None and match.start() != previous_end:
+            token = " " + token
+        keys.append(token)
+        previous_end = match.end()
+    return keys
+
+
+class SkillMatcher:
+    """
+    Compiled multi-term matcher built once from a vocabulary.
+
+    `find` returns every term present in the text (overlapping terms such as
+    "react" and "react native" are both reported) in vocabulary order.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms = list(dict.fromkeys(t.strip().lower() for t in terms if t and t.strip()))
+        self._root: dict = {}
+        for index, term in enumerate(self.terms):
+            keys = _keys(term)
+            if not keys:
+                continue
+            node = self._root.setdefault(keys[0].lstrip(), {})
+            for key in keys[1:]:
+                node = node.setdefault(key, {})
+            node[_TERMINAL] = index
+
+    def find_indexes(self, text: str) -> set[int]:
+        """Return the vocabulary indexes of all terms found in text."""
+        if not text:
+            return set()
+        return self.find_indexes_in_keys(_keys(text.lower()))
+
+    def find_indexes_in_keys(self, keys: list[str]) -> set[int]:
+        """
+        Match against an already tokenized, lowercased key stream (see `_keys`),
+        for callers that tokenize the text themselves.
+        """
+        root = self._root
+        found = set()
+        for start, key in enumerate(keys):
+            node = root.get(key.lstrip())
+            position = start + 1
+            while node is not None:
+                if _TERMINAL in node:
+                    found.add(node[_TERMINAL])
+                if position >= len(keys):
+                    break
+                node = node.get(keys[position])
+                position += 1
+        return found
+
+    def find(self, text: str) -> list[str]:
+        """Return the terms found in text, deduplicated, in vocabulary order."""
+        return [self.terms[i] for i in sorted(self.find_indexes(text))]
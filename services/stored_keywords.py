@@ -0,0 +1,25 @@
+"""
+IRIS Stored Keywords
+Keyword terms of resumes and job descriptions, stored so apply-time scoring
+compares two term sets instead of re-tokenizing both texts.
+"""
+from models import Job, ResumeData
+from services.resume_parser import keyword_terms, pack_terms, unpack_terms
+
+
+def job_keyword_terms(job: Job) -> frozenset[str]:
+    """Keyword terms of the job description, from its job_features row while that is current."""
+    entry = job.feature_entry
+    if entry is not None and entry.keyword_terms is not None and entry.job_updated_at == job.updated_at:
+        return unpack_terms(entry.keyword_terms)
+    return keyword_terms(job.description)
+
+
+def resume_keyword_terms(resume: ResumeData) -> frozenset[str]:
+    """
+    Keyword terms stored with a resume. Rows stored before terms were get
+    them from their text once, here; the caller commits.
+    """
+    if resume.keyword_terms is None:
+        resume.keyword_terms = pack_terms(keyword_terms(resume.extracted_text))
+    return unpack_terms(resume.keyword_terms)
@@ -0,0 +1,265 @@
+"""
+IRIS Talent Index
+In-memory index of each user's latest resume for ranking candidates against a job.
+
+Every indexed resume is one row in two sparse matrices: its TF-IDF vector
+(under a single semantic model version) and its taxonomy skill incidence.
+Ranking a job is then the ATS formula evaluated for all rows at once:
+0.5 x keyword coverage + 0.3 x semantic similarity + the resume's section
+bonus. New uploads go to a small pending segment that is merged into the
+base matrices once it grows, so an upload never rebuilds the whole index.
+"""
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+
+from services.ats_analyzer import ALL_SKILLS_UNIQUE
+from services.categorizer import CATEGORIES, category_parts
+from services.job_recommender import ROUNDING_SLACK, SKILL_COLUMN, skill_incidence
+
+# Pending rows are merged into the base segment past this many.
+MERGE_THRESHOLD = 1024
+# Rows per sparse product when scoring the base segment.
+BLOCK_ROWS = 8192
+# Extra near-tied rows re-scored exactly beyond the requested limit.
+MAX_TIED_ROWS = 1000
+
+
+@dataclass
+class TalentEntry:
+    user_id: int
+    resume_id: int
+    skills: list[str]
+    section_bonus: float
+    vector: sparse.csr_matrix | None
+    category: str | None = None
+
+
+class _Segment:
+    """Row-aligned matrices for a list of entries."""
+
+    def __init__(self, entries: list[TalentEntry], width: int):
+        self.user_ids = np.asarray([entry.user_id for entry in entries], dtype=np.int64)
+        self.resume_ids = np.asarray([entry.resume_id for entry in entries], dtype=np.int64)
+        self.bonus = np.asarray([entry.section_bonus for entry in entries], dtype=np.float64)
+        self.skill_sets = [frozenset(entry.skills) for entry in entries]
+        self.categories = [entry.category for entry in entries]
+        self.category_masks = {category: np.zeros(len(entries), dtype=bool) for category in CATEGORIES}
+        for row, entry in enumerate(entries):
+            for category in category_parts(entry.category):
+                if category in self.category_masks:
+                    self.category_masks[category][row] = True
+
+        self.skills = skill_incidence([entry.skills for entry in entries])
+
+        empty = sparse.csr_matrix((1, width))
+        rows = [entry.vector if entry.vector is not None else empty for entry in entries]
+        self.vectors = sparse.vstack(rows, format="csr") if rows else sparse.csr_matrix((0, width))
+        self.alive = np.ones(len(entries), dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def selected(self, category: str | None) -> np.ndarray:
+        """Live rows, limited to resumes whose stored category includes `category` if given."""
+        if category is None:
+            return self.alive
+        mask = self.category_masks.get(category)
+        return self.alive & mask if mask is not None else np.zeros(len(self), dtype=bool)
+
+
+class TalentIndex:
+    """user_id -> latest indexed resume, scored in bulk against one job."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.vector_version: str | None = None
+        self.max_resume_id = 0
+        self._width = 0
+        self._base = _Segment([], 0)
+        self._pending: list[TalentEntry] = []
+        self._location: dict[int, tuple[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._location)
+
+    def rebuild(self, entries: list[TalentEntry], vector_version: str | None, width: int) -> None:
+        """Replace the index; vectors must all belong to `vector_version`."""
+        latest = {}
+        for entry in entries:
+            if entry.user_id not in latest or entry.resume_id > latest[entry.user_id].resume_id:
+                latest[entry.user_id] = entry
+        ordered = sorted(latest.values(), key=lambda entry: entry.user_id)
+        base = _Segment(ordered, width)
+        with self._lock:
+            self.vector_version = vector_version
+            self._width = width
+            self._base = base
+            self._pending = []
+            self._location = {entry.user_id: ("base", row) for row, entry in enumerate(ordered)}
+            self.max_resume_id = max((entry.resume_id for entry in entries), default=0)
+
+    def upsert(self, entry: TalentEntry) -> None:
+        """Index a newly uploaded resume; older resumes of the same user are dropped."""
+        with self._lock:
+            self.max_resume_id = max(self.max_resume_id, entry.resume_id)
+            location = self._location.get(entry.user_id)
+            if location is not None:
+                segment, row = location
+                current = self._base.resume_ids[row] if segment == "base" else self._pending[row].resume_id
+                if current >= entry.resume_id:
+                    return
+                if segment == "base":
+                    self._base.alive[row] = False
+                else:
+                    self._pending[row] = None
+            self._pending.append(entry)
+            self._location[entry.user_id] = ("pending", len(self._pending) - 1)
+            if len(self._pending) > MERGE_THRESHOLD:
+                self._merge()
+
+    def remove(self, user_id: int) -> None:
+        """Drop a deleted user's resume."""
+        with self._lock:
+            location = self._location.pop(user_id, None)
+            if location is None:
+                return
+            segment, row = location
+            if segment == "base":
+                self._base.alive[row] = False
+            else:
+                self._pending[row] = None
+
+    def _merge(self) -> None:
+        entries = [
+            TalentEntry(
+                int(self._base.user_ids[row]),
+                int(self._base.resume_ids[row]),
+                sorted(self._base.skill_sets[row]),
+                float(self._base.bonus[row]),
+                self._base.vectors[row],
+                self._base.categories[row],
+            )
+            for row in np.flatnonzero(self._base.alive)
+        ]
+        entries.extend(entry for entry in self._pending if entry is not None)
+        entries.sort(key=lambda entry: entry.user_id)
+        self._base = _Segment(entries, self._width)
+        self._pending = []
+        self._location = {entry.user_id: ("base", row) for row, entry in enumerate(entries)}
+
+    def _segments(self) -> list[_Segment]:
+        with self._lock:
+            segments = [self._base]
+            pending = [entry for entry in self._pending if entry is not None]
+            if pending:
+                segments.append(_Segment(pending, self._width))
+        return segments
+
+    def _scored_segments(
+        self, job_skills: list[str], job_vector: sparse.csr_matrix | None, category: str | None = None
+    ) -> list[tuple]:
+        """(segment, estimated scores, keyword, semantic) per segment; unselected rows estimate -inf."""
+        job_skill_vector = np.zeros(len(ALL_SKILLS_UNIQUE))
+        job_skill_vector[[SKILL_COLUMN[skill] for skill in job_skills if skill in SKILL_COLUMN]] = 1.0
+        job_column = job_vector.T.tocsc() if job_vector is not None else None
+
+        scored = []
+        for segment in self._segments():
+            keyword = np.empty(len(segment))
+            semantic = np.zeros(len(segment))
+            for start in range(0, len(segment), BLOCK_ROWS):
+                stop = min(start + BLOCK_ROWS, len(segment))
+                if job_skills:
+                    keyword[start:stop] = (segment.skills[start:stop] @ job_skill_vector) / len(job_skills) * 100
+                else:
+                    keyword[start:stop] = 50.0
+                if job_column is not None:
+                    semantic[start:stop] = (segment.vectors[start:stop] @ job_column).toarray().ravel() * 100
+            scores = np.minimum(keyword * 0.50 + semantic * 0.30 + segment.bonus, 100.0)
+            scores[~segment.selected(category)] = -np.inf
+            scored.append((segment, scores, keyword, semantic))
+        return scored
+
+    @staticmethod
+    def _result(segment: _Segment, row: int, keyword: np.ndarray, semantic: np.ndarray, job_skills: list[str]) -> dict:
+        """Exact ATS score of one row, rounded like analyze_resume, with its skill overlap."""
+        # Python floats: numpy's round() does not round halves like the built-in on floats.
+        keyword_score = round(float(keyword[row]), 1)
+        semantic_score = round(float(semantic[row]), 1)
+        score = min(round(keyword_score * 0.50 + semantic_score * 0.30 + float(segment.bonus[row]), 1), 100.0)
+        resume_skills = segment.skill_sets[row]
+        return {
+            "user_id": int(segment.user_ids[row]),
+            "resume_id": int(segment.resume_ids[row]),
+            "score": float(score),
+            "matched_skills": [skill for skill in job_skills if skill in resume_skills],
+            "missing_skills": [skill for skill in job_skills if skill not in resume_skills],
+        }
+
+    def rank(
+        self,
+        job_skills: list[str],
+        job_vector: sparse.csr_matrix | None,
+        limit: int,
+        category: str | None = None,
+    ) -> tuple[list[dict], int]:
+        """
+        The best `limit` candidates, best first (lower user id on ties), as
+        {user_id, resume_id, score, matched_skills, missing_skills}, plus the
+        number of indexed candidates, optionally only those whose resume
+        category includes `category`. Scores are the analyze_resume ATS
+        scores, rounded the same way.
+        """
+        job_skills = list(dict.fromkeys(job_skills))
+        scored = self._scored_segments(job_skills, job_vector, category)
+        counts = [int(segment.selected(category).sum()) for segment, *_arrays in scored]
+        candidates = []
+        for (segment, scores, keyword, semantic), count in zip(scored, counts):
+            k = min(limit, count)
+            if k <= 0:
+                continue
+            # Everything within the rounding slack of the k-th estimate, then exact scores.
+            threshold = np.partition(scores, len(scores) - k)[len(scores) - k] - 2 * ROUNDING_SLACK
+            rows = np.flatnonzero(scores >= threshold)
+            if len(rows) > limit + MAX_TIED_ROWS:
+                order = np.lexsort((segment.user_ids[rows], -scores[rows]))
+                rows = rows[order[:limit + MAX_TIED_ROWS]]
+            candidates.extend(self._result(segment, row, keyword, semantic, job_skills) for row in rows.tolist())
+        candidates.sort(key=lambda result: (-result["score"], result["user_id"]))
+        return candidates[:limit], sum(counts)
+
+    def scores_for_job(
+        self,
+        job_skills: list[str],
+        job_vector: sparse.csr_matrix | None,
+        floors: dict[int, float],
+        default_floor: float = -np.inf,
+        include: set[int] = frozenset(),
+    ) -> dict[int, dict]:
+        """
+        Exact results, keyed by user id, for every user who may score at least
+        their floor (`floors`, else `default_floor`), plus every user in
+        `include`. Users that certainly score below their floor are skipped
+        without computing their exact score.
+        """
+        job_skills = list(dict.fromkeys(job_skills))
+        results = {}
+        for segment, scores, keyword, semantic in self._scored_segments(job_skills, job_vector):
+            user_floor = np.full(len(segment), default_floor)
+            forced = np.zeros(len(segment), dtype=bool)
+            for row, user_id in enumerate(segment.user_ids.tolist()):
+                if user_id in floors:
+                    user_floor[row] = floors[user_id]
+                if user_id in include:
+                    forced[row] = True
+            rows = np.flatnonzero(((scores >= user_floor - 2 * ROUNDING_SLACK) | forced) & segment.alive)
+            for row in rows.tolist():
+                result = self._result(segment, row, keyword, semantic, job_skills)
+                results[result["user_id"]] = result
+        return results
+
+
+talent_index = TalentIndex()
@@ -0,0 +1,210 @@
+"""
+IRIS Talent Search
+Ranks every job seeker's latest resume against a job for employers.
+
+Each resume stores its skills, section bonus and TF-IDF vector when it is
+uploaded, so the index is built and queried without reading extracted text.
+Imported resumes are left out; they belong to the employer who imported them.
+"""
+import json
+
+from flask import current_app
+from sqlalchemy.orm import joinedload, load_only
+
+from models import Job, ResumeData, db
+from services import semantic_model
+from services.ats_analyzer import (
+    JobFeatures,
+    ResumeFeatures,
+    section_bonus,
+    stored_job_features,
+    stored_resume_features,
+)
+from services.resume_storage import latest_resume_ids
+from services.skill_analytics import stage_resume_skills
+from services.talent_index import TalentEntry, talent_index
+
+
+def resume_search_fields(features: ResumeFeatures) -> dict:
+    """
+    ResumeData column values used by talent search. Resumes too short to
+    score get none and are left out of the index.
+    """
+    if features.text_length < 50:
+        return {"skills": None, "section_bonus": None, "vector": None, "vector_version": None}
+    model = semantic_model.get_model()
+    vector = model.transform([features.clean_text]) if model.is_fitted else None
+    return {
+        "skills": json.dumps(features.skills),
+        "section_bonus": section_bonus(features),
+        "vector": semantic_model.pack_vector(vector) if vector is not None else None,
+        "vector_version": model.version if vector is not None else None,
+    }
+
+
+def copied_search_fields(resume: ResumeData, features: ResumeFeatures) -> dict:
+    """
+    resume_search_fields for a new resume with the same content as `resume`:
+    its stored values while they belong to the active semantic model.
+    """
+    model = semantic_model.get_model()
+    if resume.skills is None or resume.vector_version != (model.version if model.is_fitted else None):
+        return resume_search_fields(features)
+    return {
+        "skills": resume.skills,
+        "section_bonus": resume.section_bonus,
+        "vector": resume.vector,
+        "vector_version": resume.vector_version,
+    }
+
+
+def resume_saved(resume: ResumeData) -> None:
+    """Index a newly uploaded resume for talent search."""
+    if resume.skills is None:
+        return
+    talent_index.upsert(_talent_entry(resume))
+
+
+def user_deleted(user_id: int) -> None:
+    """Drop a deleted user from talent search."""
+    talent_index.remove(user_id)
+
+
+def _talent_entry(row) -> TalentEntry:
+    vector = None
+    if row.vector is not None and row.vector_version == talent_index.vector_version:
+        model = semantic_model.get_model()
+        vector = semantic_model.unpack_vector(row.vector, len(model.vectorizer.vocabulary_))
+    return TalentEntry(row.user_id, row.id, json.loads(row.skills), row.section_bonus, vector, row.category)
+
+
+def _talent_rows(*criteria):
+    return (
+        db.session.query(
+            ResumeData.id,
+            ResumeData.user_id,
+            ResumeData.skills,
+            ResumeData.section_bonus,
+            ResumeData.vector,
+            ResumeData.vector_version,
+            ResumeData.category,
+        )
+        .filter(ResumeData.skills.isnot(None), *criteria)
+        .yield_per(2000)
+    )
+
+
+def init_talent_index(app) -> None:
+    """Index every user's latest resume from its stored search fields; extracted_text is never read."""
+    model = semantic_model.get_model()
+    version = model.version if model.is_fitted else None
+    width = len(model.vectorizer.vocabulary_) if model.is_fitted else 0
+    # Set first so _talent_entry keeps only vectors written under this model.
+    talent_index.vector_version = version
+    entries = [_talent_entry(row) for row in _talent_rows(ResumeData.id.in_(latest_resume_ids()))]
+    talent_index.rebuild(entries, version, width)
+    stale = sum(1 for entry in entries if entry.vector is None)
+    app.logger.info("Talent index built for %s users", len(talent_index))
+    if stale:
+        app.logger.warning(
+            "%s indexed resumes have no vector for semantic model %s; run `flask talent-index backfill`",
+            stale,
+            version,
+        )
+
+
+def refresh_talent_index() -> None:
+    """Rebuild after a semantic model refit, then pick up uploads made by other workers."""
+    model = semantic_model.get_model()
+    if talent_index.vector_version != (model.version if model.is_fitted else None):
+        init_talent_index(current_app)
+        return
+    for row in _talent_rows(ResumeData.id > talent_index.max_resume_id, ResumeData.import_id.is_(None)):
+        talent_index.upsert(_talent_entry(row))
+
+
+def job_vector(job: Job, features: JobFeatures):
+    """The job's TF-IDF row under the active model, or None without a fitted model or job text."""
+    model = semantic_model.get_model()
+    if not model.is_fitted or not features.clean_text:
+        return None
+    return model.job_vectors([job.id], [features.clean_text], [(features.vector_version, features.vector)])
+
+
+def search_talent(
+    job: Job, page: int = 1, per_page: int = 20, category: str | None = None
+) -> tuple[list[dict], int]:
+    """
+    One page of candidates ranked against the job, each a rank() result with
+    its `resume` (without extracted_text) and `user` attached, plus the
+    number of indexed candidates. `category` keeps only resumes whose stored
+    category includes it.
+    """
+    refresh_talent_index()
+    features = stored_job_features(job)
+    ranked, total = talent_index.rank(features.skills, job_vector(job, features), page * per_page, category)
+    results = ranked[(page - 1) * per_page:]
+    resumes = {
+        resume.id: resume
+        for resume in ResumeData.query.options(
+            load_only(
+                ResumeData.id,
+                ResumeData.user_id,
+                ResumeData.original_name,
+                ResumeData.category,
+                ResumeData.uploaded_at,
+            ),
+            joinedload(ResumeData.user),
+        ).filter(ResumeData.id.in_([result["resume_id"] for result in results]))
+    }
+    page_results = []
+    for result in results:
+        resume = resumes.get(result["resume_id"])
+        if resume is not None:
+            page_results.append({**result, "resume": resume, "user": resume.user})
+        else:
+            # Deleted through another worker.
+            talent_index.remove(result["user_id"])
+    return page_results, total
+
+
+def backfill_resume_search_fields(force: bool = False, batch_size: int = 200) -> tuple[int, int]:
+    """
+    Fill talent search fields on resumes that lack them or hold a vector from
+    another semantic model. Returns (rows written, rows scanned).
+    """
+    model = semantic_model.get_model()
+    version = model.version if model.is_fitted else None
+    query = db.session.query(ResumeData.id).order_by(ResumeData.id)
+    if not force:
+        query = query.filter(
+            db.or_(
+                ResumeData.skills.is_(None),
+                ResumeData.vector_version.is_(None),
+                ResumeData.vector_version != version,
+            )
+        )
+    resume_ids = [resume_id for (resume_id,) in query]
+    written = 0
+    for start in range(0, len(resume_ids), batch_size):
+        resumes = ResumeData.query.filter(ResumeData.id.in_(resume_ids[start:start + batch_size])).all()
+        latest_ids = {
+            resume_id
+            for (resume_id,) in db.session.query(db.func.max(ResumeData.id))
+            .filter(
+                ResumeData.user_id.in_({resume.user_id for resume in resumes}),
+                ResumeData.import_id.is_(None),
+            )
+            .group_by(ResumeData.user_id)
+        }
+        for resume in resumes:
+            fields = resume_search_fields(stored_resume_features(resume))
+            if fields["skills"] is None:
+                continue
+            if resume.id in latest_ids:
+                stage_resume_skills(json.loads(resume.skills or "[]"), json.loads(fields["skills"]))
+            for name, value in fields.items():
+                setattr(resume, name, value)
+            written += 1
+        db.session.commit()
+    return written, len(resume_ids)
@@ -124,6 +124,36 @@ document.addEventListener("DOMContentLoaded", () => {
         });
     }
 
+    const uploadPanel = document.querySelector("[data-upload-status]");
+    if (uploadPanel && uploadPanel.getAttribute("data-upload-state") !== "failed") {
+        const statusUrl = uploadPanel.getAttribute("data-upload-status");
+        const labelNode = uploadPanel.querySelector("[data-upload-label]");
+        const messageNode = uploadPanel.querySelector("[data-upload-message]");
+        const retryNode = uploadPanel.querySelector("[data-upload-retry]");
+
+        const pollUpload = () => {
+            fetch(statusUrl, { headers: { Accept: "application/json" } })
+                .then((response) => (response.ok ? response.json() : Promise.reject(response.status)))
+                .then((state) => {
+                    if (state.status === "ready" && state.result_url) {
+                        window.location.assign(state.result_url);
+                        return;
+                    }
+                    if (state.status === "failed") {
+                        labelNode.textContent = "Failed";
+                        messageNode.textContent = state.message || "The resume could not be processed.";
+                        retryNode.hidden = false;
+                        return;
+                    }
+                    labelNode.textContent = state.status === "processing" ? "Analyzing" : "Queued";
+                    window.setTimeout(pollUpload, 1500);
+                })
+                .catch(() => window.setTimeout(pollUpload, 5000));
+        };
+
+        window.setTimeout(pollUpload, 1000);
+    }
+
     const chartCanvas = document.getElementById("adminGrowthChart");
     if (chartCanvas && window.Chart) {
         const labelsNode = document.getElementById("chart-labels");
@@ -0,0 +1,120 @@
+"""Writers for the Word files the reader and upload tests read back."""
+import io
+import struct
+
+from docx import Document
+
+SECTOR = 512
+MINI_SECTOR = 64
+MINI_CUTOFF = 4096
+END_OF_CHAIN = 0xFFFFFFFE
+FREE = 0xFFFFFFFF
+FAT_SECTOR = 0xFFFFFFFD
+NO_STREAM = 0xFFFFFFFF
+
+
+def compound_file(streams: dict[str, bytes]) -> bytes:
+    """A version 3 compound file holding `streams` under the root; small ones go to the mini stream."""
+    sectors, fat = [], []
+
+    def allocate(data: bytes) -> int:
+        count = max(1, -(-len(data) // SECTOR))
+        start = len(sectors)
+        for index in range(count):
+            sectors.append(data[index * SECTOR:(index + 1) * SECTOR].ljust(SECTOR, b"\0"))
+            fat.append(start + index + 1 if index < count - 1 else END_OF_CHAIN)
+        return start
+
+    mini_stream, mini_fat, starts = b"", [], {}
+    for name, data in streams.items():
+        if len(data) < MINI_CUTOFF:
+            count = max(1, -(-len(data) // MINI_SECTOR))
+            starts[name] = len(mini_stream) // MINI_SECTOR
+            mini_stream += data.ljust(count * MINI_SECTOR, b"\0")
+            mini_fat += [starts[name] + index + 1 if index < count - 1 else END_OF_CHAIN for index in range(count)]
+    for name, data in streams.items():
+        if len(data) >= MINI_CUTOFF:
+            starts[name] = allocate(data)
+    mini_stream_start = allocate(mini_stream) if mini_stream else END_OF_CHAIN
+    mini_fat_start = allocate(struct.pack(f"<{len(mini_fat)}I", *mini_fat)) if mini_fat else END_OF_CHAIN
+
+    def entry(name: str, kind: int, start: int, size: int, right: int = NO_STREAM, child: int = NO_STREAM) -> bytes:
+        encoded = (name + "\0").encode("utf-16-le")
+        head = encoded.ljust(64, b"\0") + struct.pack("<HBB", len(encoded), kind, 1)
+        head += struct.pack("<III", NO_STREAM, right, child)
+        return (head.ljust(116, b"\0") + struct.pack("<IQ", start, size)).ljust(128, b"\0")
+
+    names = list(streams)
+    directory = entry("Root Entry", 5, mini_stream_start, len(mini_stream), child=1 if names else NO_STREAM)
+    for index, name in enumerate(names):
+        right = index + 2 if index + 1 < len(names) else NO_STREAM
+        directory += entry(name, 2, starts[name], len(streams[name]), right=right)
+    directory_start = allocate(directory)
+
+    per_sector = SECTOR // 4
+    fat_count = 1
+    while len(sectors) + fat_count > fat_count * per_sector:
+        fat_count += 1
+    fat_start = len(sectors)
+    fat += [FAT_SECTOR] * fat_count
+    fat += [FREE] * (fat_count * per_sector - len(fat))
+    for index in range(fat_count):
+        sectors.append(struct.pack(f"<{per_sector}I", *fat[index * per_sector:(index + 1) * per_sector]))
+    difat = [fat_start + index for index in range(fat_count)] + [FREE] * (109 - fat_count)
+
+    header = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\0" * 16
+    header += struct.pack("<HHHHH", 0x3E, 3, 0xFFFE, 9, 6) + b"\0" * 6
+    header += struct.pack(
+        "<IIIIIIIII", 0, fat_count, directory_start, 0, MINI_CUTOFF, mini_fat_start, 1 if mini_fat else 0,
+        END_OF_CHAIN, 0,
+    )
+    header += struct.pack("<109I", *difat)
+    return header + b"".join(sectors)
+
+
+def word_document(pieces: list[tuple[str, bool]], table_name: str = "1Table", encrypted: bool = False) -> bytes:
+    """
+    A Word 97 file whose text is `pieces`, each (text, stored as 8-bit),
+    described by a piece table in the `table_name` stream.
+    """
+    fib = bytearray(1472)
+    struct.pack_into("<HH", fib, 0, 0xA5EC, 0xC1)
+    flags = (0x0200 if table_name == "1Table" else 0) | (0x0100 if encrypted else 0)
+    struct.pack_into("<H", fib, 10, flags)
+    # csw, cslw and cbRgFcLcb of a Word 97 FIB.
+    struct.pack_into("<H", fib, 32, 14)
+    struct.pack_into("<H", fib, 62, 22)
+    struct.pack_into("<H", fib, 152, 93)
+
+    body = bytearray(fib)
+    positions, descriptors, position = [0], b"", 0
+    for text, eight_bit in pieces:
+        if eight_bit:
+            offset = len(body)
+            body += text.encode("cp1252")
+            fc = (offset * 2) | 0x40000000
+        else:
+            if len(body) % 2:
+                body += b"\0"
+            fc = len(body)
+            body += text.encode("utf-16-le")
+        position += len(text)
+        positions.append(position)
+        descriptors += struct.pack("<HIH", 0, fc, 0)
+    piece_table = struct.pack(f"<{len(positions)}I", *positions) + descriptors
+    # A property modifier block first, as Word writes, then the piece table.
+    clx = b"\x01" + struct.pack("<h", 3) + b"abc" + b"\x02" + struct.pack("<I", len(piece_table)) + piece_table
+    table = b"\0" * 10 + clx
+    # fcClx / lcbClx, pair 33 of the FIB's fc/lcb array.
+    struct.pack_into("<II", body, 154 + 33 * 8, 10, len(clx))
+    return compound_file({"WordDocument": bytes(body), table_name: table, "Data": b"\xff" * 5000})
+
+
+def docx_bytes(text: str) -> bytes:
+    """A .docx file with one paragraph per line of text."""
+    document = Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,66 @@
+"""Memoized analyze_resume against computing it, and the cache's size bound and persistent tier."""
+import pytest
+
+from services import analysis_cache as analysis_cache_module, semantic_model
+from services.analysis_cache import AnalysisCache, analysis_cache, cache_key
+from services.ats_analyzer import analyze_resume, job_features
+from services.semantic_model import SemanticModel
+
+
+@pytest.fixture
+def memory_cache():
+    analysis_cache_module.configure(32 * 1024 * 1024, persistent=False)
+    yield analysis_cache
+    analysis_cache_module.configure(32 * 1024 * 1024, persistent=True)
+
+
+def test_memoized_results_match_computing_them(memory_cache, texts, corpus):
+    jds = [f"{job.title} {job.description}" for job in corpus.jobs(3)] + [""]
+    for resume in texts[:8]:
+        for jd in jds:
+            assert analyze_resume(resume, jd) == analyze_resume.uncached(resume, jd)
+            # Case and spacing never change the result, so they share its entry.
+            hits = memory_cache.hits
+            assert analyze_resume(f"  {resume.upper()}\n", jd.lower()) == analyze_resume.uncached(resume, jd)
+            assert memory_cache.hits == hits + (len(" ".join(resume.split())) >= 50)
+
+
+def test_a_refit_model_stales_cached_results(memory_cache, texts, corpus):
+    jds = [f"{job.title} {job.description}" for job in corpus.jobs(10)]
+    resume = texts[5]
+    before = analyze_resume(resume, jds[0])
+    previous = semantic_model.get_model()
+    semantic_model.set_model(SemanticModel.fit((job_id, job_features(jd).clean_text) for job_id, jd in enumerate(jds)))
+    try:
+        misses = memory_cache.misses
+        after = analyze_resume(resume, jds[0])
+        assert memory_cache.misses == misses + 1
+        assert after == analyze_resume.uncached(resume, jds[0])
+        assert after["semantic_score"] != before["semantic_score"]
+    finally:
+        semantic_model.set_model(previous)
+
+
+def test_least_recently_used_entries_are_evicted_by_size():
+    # Each payload serializes to 33 bytes, so two fit.
+    cache = AnalysisCache(max_bytes=70, persistent=False)
+    for key in "abc":
+        cache.put(key, "ats", "1", {"value": key * 20})
+    assert cache.get("a") is None and cache.evictions == 1
+    assert cache.get("b") is not None
+    cache.put("d", "ats", "1", {"value": "d" * 20})
+    assert cache.get("c") is None and cache.get("b") is not None
+    cache.put("e", "ats", "1", {"value": "e" * 100})
+    assert cache.get("e") is None
+    assert cache.stats()["bytes"] == 66
+
+
+def test_entries_persist_across_processes(database):
+    key = cache_key("ats", "1", "resume", "job")
+    AnalysisCache().put(key, "ats", "1", {"ats_score": 71.5})
+    restarted = AnalysisCache()
+    assert restarted.get(key) == {"ats_score": 71.5}
+    assert restarted.persistent_hits == 1
+    # Writing the same result again, as another worker would, is not an error.
+    restarted.put(key, "ats", "1", {"ats_score": 71.5})
+    assert restarted.get(key) == {"ats_score": 71.5} and restarted.hits == 1
@@ -0,0 +1,52 @@
+"""Applications re-scored for one user's newer resume against ranking each job's applicants."""
+from models import Application, Job, ResumeImport, User
+from services.applicant_ranking import rank_applicants, rank_user_applications
+from services.resume_parser import ExtractionResult
+from services.resume_pipeline import store_resume
+from services.resume_storage import latest_resume
+
+
+def stored_rankings() -> dict[int, tuple]:
+    return {
+        application.id: (application.ats_score, application.matched_skills, application.missing_skills)
+        for application in Application.query
+    }
+
+
+def test_a_newer_resume_reranks_the_users_applications(database, corpus):
+    employer = User(username="employer", email="employer@example.com", password="x", role="employer")
+    seekers = [User(username=f"user{index}", email=f"user{index}@example.com", password="x") for index in range(3)]
+    database.session.add_all([employer, *seekers])
+    database.session.commit()
+    jobs = [
+        Job(title=job.title, description=job.description, employer_id=employer.id) for job in corpus.jobs(4)
+    ]
+    database.session.add_all(jobs)
+    database.session.commit()
+    texts = corpus.resumes(5)
+    for user, text in zip(seekers, texts):
+        store_resume(user.id, "r.pdf", "r.pdf", ExtractionResult(text))
+        for job in jobs[:3]:
+            database.session.add(Application(user_id=user.id, job_id=job.id, resume_path="uploads/r.pdf"))
+    database.session.commit()
+    for job in jobs:
+        rank_applicants(job.id)
+    before = stored_rankings()
+
+    user = seekers[0]
+    store_resume(user.id, "new.pdf", "new.pdf", ExtractionResult(texts[3]))
+    # An archive import under the user's account is never their latest resume.
+    archive = ResumeImport(user_id=user.id, archive_name="resumes.zip")
+    database.session.add(archive)
+    database.session.commit()
+    store_resume(user.id, "imported.pdf", "imported.pdf", ExtractionResult(texts[4])).import_id = archive.id
+    database.session.commit()
+    assert latest_resume(user.id).file_name == "new.pdf"
+
+    assert rank_user_applications(user.id) == 3
+    reranked = stored_rankings()
+    changed = {application_id for application_id in before if reranked[application_id] != before[application_id]}
+    assert changed and changed <= {application.id for application in user.applications}
+    for job in jobs:
+        rank_applicants(job.id)
+    assert stored_rankings() == reranked
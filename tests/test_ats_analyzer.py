@@ -0,0 +1,103 @@
+"""analyze_resume_batch against analyzing each resume and job description pair on its own."""
+import pytest
+
+from services import semantic_model
+from services.ats_analyzer import (
+    ALL_SKILLS,
+    SKILL_TAXONOMY,
+    JobFeatures,
+    ResumeFeatures,
+    _pairwise_semantic_score,
+    analyze_resume_batch,
+    analyze_resumes_for_job,
+    clean_text,
+    extract_skills_from_text,
+    generate_suggestions,
+    job_features,
+    keyword_score,
+    section_bonus,
+)
+from services.semantic_model import SemanticModel, pack_vector
+
+
+def pairwise(resume_text: str, job_description: str) -> dict:
+    """analyze_resume before batching: every step redone for the one pair, TF-IDF fitted on the two texts."""
+    resume_clean = clean_text(resume_text)
+    jd_clean = clean_text(job_description) if job_description else ""
+    resume_skills = extract_skills_from_text(resume_clean)
+    jd_skills = extract_skills_from_text(jd_clean) if jd_clean else ALL_SKILLS[:60]
+    kw_score, matched, missing = keyword_score(resume_skills, jd_skills)
+    sem_score = _pairwise_semantic_score(resume_clean, jd_clean) if jd_clean else 50.0
+    bonus = section_bonus(resume_text)
+    if jd_clean:
+        final = (kw_score * 0.50) + (sem_score * 0.30) + (bonus * 1.0)
+    else:
+        final = min((len(resume_skills) / 15) * 60, 60) + bonus
+    return {
+        "ats_score": min(round(final, 1), 100.0),
+        "matched_skills": matched,
+        "missing_skills": missing[:20],
+        "suggestions": generate_suggestions(matched, missing, resume_text, sem_score),
+        "semantic_score": sem_score,
+        "keyword_score": kw_score,
+        "skill_categories": {
+            category: [skill for skill in matched if skill in skills]
+            for category, skills in SKILL_TAXONOMY.items()
+            if any(skill in skills for skill in matched)
+        },
+    }
+
+
+@pytest.fixture
+def jds(corpus) -> list[str]:
+    return [f"{job.title} {job.description}" for job in corpus.jobs(12)] + [""]
+
+
+@pytest.fixture
+def fitted(jds):
+    previous = semantic_model.get_model()
+    model = SemanticModel.fit((job_id, job_features(jd).clean_text) for job_id, jd in enumerate(jds))
+    semantic_model.set_model(model)
+    yield model
+    semantic_model.set_model(previous)
+
+
+def test_matches_pairwise_analysis_without_a_model(texts, jds):
+    previous = semantic_model.get_model()
+    semantic_model.set_model(SemanticModel())
+    try:
+        for resume in texts[:12]:
+            results = analyze_resume_batch(resume, jds)
+            if len(resume.strip()) >= 50:
+                assert results == [pairwise(resume, jd) for jd in jds]
+            else:
+                assert all(result["ats_score"] == 0 for result in results)
+    finally:
+        semantic_model.set_model(previous)
+
+
+def test_stored_features_match_text(texts, jds, fitted):
+    # Stored vectors come from the model at save time; the job ids point at the model's own rows.
+    stored = []
+    for jd in jds:
+        features = job_features(jd)
+        if features.clean_text:
+            features.vector = pack_vector(fitted.transform([features.clean_text]))
+            features.vector_version = fitted.version
+        stored.append(features)
+    job_ids = list(range(len(jds)))
+    for resume in texts[:12]:
+        expected = [analyze_resume_batch(resume, [jd])[0] for jd in jds]
+        assert analyze_resume_batch(resume, jds) == expected
+        assert analyze_resume_batch(ResumeFeatures.from_text(resume), stored) == expected
+        assert analyze_resume_batch(resume, [JobFeatures.from_text(jd) for jd in jds], job_ids) == expected
+
+
+def test_resumes_for_job_match_one_resume_at_a_time(texts, jds, fitted):
+    keys = ("ats_score", "matched_skills", "missing_skills", "semantic_score", "keyword_score")
+    for job_id, jd in enumerate(jds):
+        results = analyze_resumes_for_job(texts[:12], jd, job_id)
+        expected = [analyze_resume_batch(resume, [jd])[0] for resume in texts[:12]]
+        assert [{key: result[key] for key in keys} for result in results] == [
+            {key: result[key] for key in keys} for result in expected
+        ]
@@ -0,0 +1,65 @@
+"""The bounded task queue behind background refreshes, resume uploads and archive imports."""
+import threading
+
+import pytest
+from flask import Flask
+
+from services import background
+from services.background import TaskQueue
+
+
+@pytest.fixture
+def app_context():
+    with Flask(__name__).app_context():
+        yield
+
+
+def test_queue_turns_tasks_away_while_full(app_context):
+    queue = TaskQueue("test-queue", workers=1, max_queued=2)
+    release = threading.Event()
+    first, second = queue.submit(release.wait), queue.submit(lambda: "done")
+    assert first is not None and second is not None
+    assert not queue.accepting() and queue.submit(lambda: "dropped") is None
+
+    release.set()
+    assert second.result(timeout=5) == "done"
+    first.result(timeout=5)
+    assert queue.accepting()
+    queue.shutdown()
+
+
+def test_a_failing_task_frees_its_place(app_context):
+    queue = TaskQueue("test-queue", workers=1, max_queued=1)
+    with pytest.raises(ZeroDivisionError):
+        queue.submit(lambda: 1 / 0).result(timeout=5)
+    assert queue.submit(lambda: "next").result(timeout=5) == "next"
+    queue.shutdown()
+
+
+def test_submissions_after_shutdown_are_dropped(app_context):
+    queue = TaskQueue("test-queue", workers=1)
+    queue.submit(lambda: None).result(timeout=5)
+    queue.shutdown()
+    assert queue.submit(lambda: None) is None
+    assert queue.accepting()
+
+
+def test_keyed_tasks_coalesce_until_they_start(app_context):
+    release, started = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+
+    blocker = background.submit(block)
+    started.wait(timeout=5)
+    runs = []
+    first = background.submit(runs.append, 1, key=("test", 1))
+    assert background.submit(runs.append, 2, key=("test", 1)) is None
+    release.set()
+    first.result(timeout=5)
+    blocker.result(timeout=5)
+    assert runs == [1]
+    # The key was released when the task started, so a later write queues a fresh run.
+    background.submit(runs.append, 3, key=("test", 1)).result(timeout=5)
+    assert runs == [1, 3]
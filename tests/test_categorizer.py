@@ -0,0 +1,131 @@
+"""The compiled categorizer against the keyword loops it replaced."""
+import random
+import re
+
+import pytest
+
+from services.categorizer import (
+    CATEGORY_MATCHER,
+    DEGREE_MAP,
+    SKILL_KEYWORDS,
+    categorize_texts,
+    detect_degree_category,
+    detect_skill_category,
+    final_category,
+    resume_category,
+)
+
+
+# ── The categorizer before the matcher, unchanged ──────────────────────────
+def old_detect_degree_category(text: str) -> str | None:
+    text_lower = text.lower()
+    for degree, category in DEGREE_MAP.items():
+        if degree in text_lower:
+            return category
+    return None
+
+
+def old_detect_skill_category(text: str) -> str | None:
+    text_lower = text.lower()
+    scores = {}
+    for category, keywords in SKILL_KEYWORDS.items():
+        score = sum(1 for kw in keywords if kw in text_lower)
+        if score > 0:
+            scores[category] = score
+    if not scores:
+        return None
+    return max(scores, key=scores.get)
+
+
+def old_final_category(degree: str, resume_text: str) -> str:
+    deg_cat   = old_detect_degree_category(degree) if degree else None
+    skill_cat = old_detect_skill_category(resume_text) if resume_text else None
+
+    if deg_cat and skill_cat:
+        if deg_cat == skill_cat:
+            return deg_cat
+        return f"{deg_cat} + {skill_cat}"
+    if deg_cat:
+        return deg_cat
+    if skill_cat:
+        return skill_cat
+    return 'General'
+
+
+def substring_hits(text: str) -> set[str]:
+    return {keyword for keyword in CATEGORY_MATCHER.terms if keyword in text.lower()}
+
+
+def matcher_hits(text: str) -> set[str]:
+    return set(CATEGORY_MATCHER.find(text))
+
+
+@pytest.fixture(scope="module")
+def keyword_texts() -> list[str]:
+    """Keyword lists in varied order and case, so ties and degree order come into play."""
+    rng = random.Random(17)
+    vocabulary = CATEGORY_MATCHER.terms
+    texts = []
+    for _ in range(1000):
+        keywords = rng.sample(vocabulary, rng.randint(1, 8))
+        words = [keyword.upper() if rng.random() < 0.2 else keyword for keyword in keywords]
+        texts.append(rng.choice([", ", " ", "; ", "\n"]).join(words))
+    return texts
+
+
+def test_matches_keyword_loops(keyword_texts, texts):
+    """Wherever both find the same keywords, every category agrees with the loops."""
+    compared = [text for text in keyword_texts + texts if substring_hits(text) == matcher_hits(text)]
+    assert len(compared) >= 200
+    for text in compared:
+        assert detect_degree_category(text) == old_detect_degree_category(text)
+        assert detect_skill_category(text) == old_detect_skill_category(text)
+        assert resume_category(text) == old_final_category(text, text)
+        assert final_category(text[:80], text) == old_final_category(text[:80], text)
+    assert categorize_texts(texts) == [resume_category(text) for text in texts]
+
+
+def test_keyword_differences_are_token_boundaries(keyword_texts, texts):
+    """Keywords only one side finds: substrings inside longer words, or terms split by extra whitespace."""
+    for text in keyword_texts + texts:
+        lower = text.lower()
+        for keyword in substring_hits(text) - matcher_hits(text):
+            for match in re.finditer(re.escape(keyword), lower):
+                before = lower[match.start() - 1:match.start()]
+                after = lower[match.end():match.end() + 1]
+                inside = bool(re.match(r"\w", keyword[0]) and re.match(r"\w", before)) or bool(
+                    re.match(r"\w", keyword[-1]) and re.match(r"\w", after)
+                )
+                assert inside, (keyword, text)
+        for keyword in matcher_hits(text) - substring_hits(text):
+            assert " " in keyword, (keyword, text)
+
+
+@pytest.mark.parametrize(
+    "text, category, old_category",
+    [
+        # Substring matching read 'ba' in 'bba' and 'ca' in 'cat'.
+        ("BBA graduate", "Finance", "Finance"),
+        ("B.Tech, later an MBA", "IT", "IT"),
+        ("bsc   it", "IT", "Science"),
+        ("a cat and a barn", None, "Arts"),
+        ("bath towel", None, "Arts"),
+    ],
+)
+def test_degree_keywords_match_whole_tokens(text, category, old_category):
+    assert detect_degree_category(text) == category
+    assert old_detect_degree_category(text) == old_category
+
+
+@pytest.mark.parametrize(
+    "text, category, old_category",
+    [
+        # 'ca', 'go' and 'ui' inside 'vacation', 'good' and 'build' counted for the old loop.
+        ("vacation, good build", None, "IT"),
+        ("Python and Go developer", "IT", "IT"),
+        ("Chartered accountant, CA", "Finance", "Finance"),
+    ],
+)
+def test_skill_keywords_match_whole_tokens(text, category, old_category):
+    assert detect_skill_category(text) == category
+    assert old_detect_skill_category(text) == old_category
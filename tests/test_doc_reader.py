@@ -0,0 +1,68 @@
+"""The piece-table .doc reader against reading the whole file as latin-1."""
+import pytest
+
+from services.ats_analyzer import extract_skills_from_text
+from services.doc_reader import iter_paragraphs
+from services.resume_parser import extract_resume
+from tests.doc_files import word_document
+
+
+def latin1_read(file_path: str) -> str:
+    """_extract_doc before the reader: every byte of the file as a character."""
+    with open(file_path, "rb") as uploaded_file:
+        return uploaded_file.read().decode("latin-1", errors="ignore").strip()
+
+
+def write(tmp_path, name: str, payload: bytes) -> str:
+    path = tmp_path / name
+    path.write_bytes(payload)
+    return str(path)
+
+
+@pytest.fixture
+def resume_lines(corpus) -> list[str]:
+    return [line for line in corpus.resume(words=300).splitlines() if line.strip()]
+
+
+def test_eight_bit_text_matches_and_drops_binary(tmp_path, resume_lines):
+    path = write(tmp_path, "resume.doc", word_document([("\r".join(resume_lines) + "\r", True)]))
+    old, new = latin1_read(path), extract_resume(path).text
+
+    assert new == "\n".join(resume_lines)
+    # The old read found the same text, buried in the file's binary structures.
+    assert all(line in old for line in resume_lines)
+    assert "\0" in old and "\0" not in new
+    assert extract_skills_from_text(new) == extract_skills_from_text("\n".join(resume_lines))
+
+
+def test_unicode_pieces_the_old_read_garbled(tmp_path, resume_lines):
+    text = "\r".join(resume_lines[:6]) + "\rRésumé — Zoë Łukasiewicz\r"
+    pieces = [(text[:40], True), (text[40:], False)]
+    path = write(tmp_path, "resume.doc", word_document(pieces, table_name="0Table"))
+
+    assert list(iter_paragraphs(path, 100_000)) == text.split("\r")
+    assert "Zoë Łukasiewicz" not in latin1_read(path)
+
+
+def test_fields_show_their_result(tmp_path):
+    text = "Portfolio: \x13 HYPERLINK \"https://example.com\" \x14example.com\x15\rPython\r"
+    path = write(tmp_path, "resume.doc", word_document([(text, True)]))
+    assert list(iter_paragraphs(path, 100_000)) == ["Portfolio: example.com", "Python", ""]
+
+
+def test_plain_text_saved_as_doc_reads_as_before(tmp_path, resume_lines):
+    path = write(tmp_path, "resume.doc", "\n".join(resume_lines).encode("latin-1"))
+    assert extract_resume(path).text == latin1_read(path)
+
+
+def test_character_budget(tmp_path, resume_lines):
+    path = write(tmp_path, "resume.doc", word_document([("\r".join(resume_lines * 20), True)]))
+    result = extract_resume(path, max_chars=500)
+    assert len(result.text) <= 500 and result.truncated_by == "characters"
+    assert "\n".join(resume_lines).startswith(result.text)
+
+
+def test_encrypted_document_is_rejected(tmp_path):
+    path = write(tmp_path, "resume.doc", word_document([("secret\r", True)], encrypted=True))
+    with pytest.raises(ValueError):
+        extract_resume(path)
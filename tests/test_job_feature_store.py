@@ -0,0 +1,65 @@
+"""Stored job features against extracting them from the job text, before and after edits and refits."""
+from types import SimpleNamespace
+
+import pytest
+
+from models import Job, User
+from services import semantic_model
+from services.ats_analyzer import JobFeatures, job_document_text, stored_job_features
+from services.job_feature_store import backfill_job_features, iter_job_features, scoring_jobs
+from services.job_recommender import recommend_jobs
+from services.semantic_model import SemanticModel
+
+
+@pytest.fixture
+def jobs(database, corpus):
+    employer = User(username="employer", email="employer@example.com", password="x", role="employer")
+    database.session.add(employer)
+    database.session.commit()
+    for job in corpus.jobs(30):
+        database.session.add(Job(title=job.title, description=job.description, employer_id=employer.id))
+    database.session.commit()
+    jobs = Job.query.order_by(Job.id).all()
+    previous = semantic_model.get_model()
+    semantic_model.set_model(SemanticModel.fit((job.id, extracted(job).clean_text) for job in jobs))
+    yield jobs
+    semantic_model.set_model(previous)
+
+
+def extracted(job) -> JobFeatures:
+    return JobFeatures.from_text(job_document_text(job))
+
+
+def unstored(job: Job) -> SimpleNamespace:
+    """The job as recommend_jobs sees it without a job_features row."""
+    return SimpleNamespace(id=job.id, title=job.title, description=job.description)
+
+
+def test_stored_features_match_extraction(jobs, texts, database):
+    assert backfill_job_features() == (30, 30)
+    assert backfill_job_features() == (0, 30)
+    for job in jobs:
+        stored = stored_job_features(job)
+        assert (stored.clean_text, stored.skills) == (extracted(job).clean_text, extracted(job).skills)
+        assert stored.vector_version == semantic_model.get_model().version
+    for resume in texts[:10]:
+        assert recommend_jobs(resume, scoring_jobs(), 6) == [
+            {**result, "job": database.session.get(Job, result["job"].id)}
+            for result in recommend_jobs(resume, [unstored(job) for job in jobs], 6)
+        ]
+
+
+def test_edited_jobs_are_extracted_again(jobs, corpus, database):
+    backfill_job_features()
+    edited = jobs[3]
+    edited.description = corpus.jobs(31)[30].description
+    database.session.commit()
+
+    assert stored_job_features(edited).clean_text == extracted(edited).clean_text
+    current = {job_id: features for job_id, _updated_at, features in iter_job_features()}
+    assert current == {job.id: extracted(job) for job in jobs}
+    assert backfill_job_features() == (1, 30)
+
+    # A refit model leaves every stored vector behind.
+    semantic_model.set_model(SemanticModel.fit((job.id, extracted(job).clean_text) for job in jobs[:20]))
+    assert backfill_job_features() == (30, 30)
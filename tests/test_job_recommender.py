@@ -0,0 +1,137 @@
+"""Pruned recommend_jobs against scoring and sorting every job."""
+import pytest
+
+from benchmarks.corpus import SyntheticJob
+from services import job_recommender, parallel_scoring, semantic_model
+from services.ats_analyzer import analyze_resume_batch, job_document_text, job_features, resume_features
+from services.job_recommender import ROUNDING_SLACK, catalog_matrix, recommend_jobs, retrieve_job_ids
+from services.semantic_model import SemanticModel
+from services.skill_index import SkillIndex, skill_index
+
+# Jobs sharing no taxonomy skill with most resumes, which the skill index prunes.
+UNRELATED = [
+    ("Warehouse Associate", "Forklift driving, picking and packing orders on night shifts."),
+    ("Line Cook", "Prepare dishes to recipe, keep the kitchen clean and stocked."),
+    ("Delivery Driver", "Deliver parcels on time across the city with a clean licence."),
+]
+
+
+def full_sort(resume_text: str, jobs: list, top_n: int) -> list[tuple]:
+    """recommend_jobs before pruning: analyze every active job, stable sort by score."""
+    if not resume_text:
+        return []
+    scored = []
+    for job in jobs:
+        if not getattr(job, "is_active", True):
+            continue
+        result = analyze_resume_batch(resume_text, [job_document_text(job)])[0]
+        scored.append((job.id, result["ats_score"], result["matched_skills"][:8], result["missing_skills"][:5]))
+    scored.sort(key=lambda row: row[1], reverse=True)
+    return scored[:top_n]
+
+
+@pytest.fixture
+def catalog(corpus):
+    jobs = corpus.jobs(60)
+    for title, description in UNRELATED * 10:
+        jobs.append(SyntheticJob(len(jobs) + 1, title, description))
+    jobs[5].is_active = False
+    documents = [(job.id, job_features(job_document_text(job))) for job in jobs]
+    previous = semantic_model.get_model()
+    semantic_model.set_model(SemanticModel.fit((job_id, features.clean_text) for job_id, features in documents))
+    skill_index.rebuild((job_id, features.skills, None) for job_id, features in documents)
+    yield jobs
+    skill_index.rebuild([])
+    semantic_model.set_model(previous)
+
+
+@pytest.mark.parametrize("top_n", [1, 6, 25])
+def test_matches_full_sort(catalog, texts, top_n):
+    for resume_text in texts[:30]:
+        found = [
+            (item["job"].id, item["score"], item["matched_skills"], item["missing_skills"])
+            for item in recommend_jobs(resume_text, catalog, top_n)
+        ]
+        assert found == full_sort(resume_text, catalog, top_n)
+
+
+def test_process_pool_matches_full_sort(catalog, texts):
+    # Chunks smaller than top_n, so merging the workers' local top rows is exercised.
+    parallel_scoring.configure(workers=2, chunk_size=4, min_jobs=1)
+    try:
+        for resume_text in texts[:8]:
+            found = [
+                (item["job"].id, item["score"], item["matched_skills"], item["missing_skills"])
+                for item in recommend_jobs(resume_text, catalog, 6)
+            ]
+            assert found == full_sort(resume_text, catalog, 6)
+    finally:
+        parallel_scoring.configure(workers=0)
+
+
+def test_estimates_are_within_the_rounding_slack(catalog, texts):
+    matrix = catalog_matrix()
+    jobs = {job.id: job for job in catalog}
+    for resume_text in texts[3:15]:
+        estimates = matrix.estimate_scores(resume_features(resume_text))
+        for job_id, estimate in zip(matrix.job_ids.tolist(), estimates):
+            exact = analyze_resume_batch(resume_text, [job_document_text(jobs[job_id])])[0]["ats_score"]
+            assert abs(exact - estimate) <= ROUNDING_SLACK
+
+
+@pytest.mark.parametrize("top_n", [1, 6, 25])
+def test_shortlist_holds_the_top_jobs(catalog, texts, top_n):
+    # The database catalog has no inactive jobs.
+    semantic_model.get_model().remove_job(catalog[5].id)
+    active = [job for job in catalog if getattr(job, "is_active", True)]
+    # Empty text has no shortlist: every job is scored.
+    for resume_text in filter(None, texts[:30]):
+        shortlist = set(retrieve_job_ids(resume_text, top_n))
+        found = recommend_jobs(resume_text, [job for job in active if job.id in shortlist], top_n)
+        assert found == recommend_jobs(resume_text, active, top_n)
+
+
+def test_prunes_jobs_without_shared_skills(catalog, texts, monkeypatch):
+    scored = []
+
+    def counting(resume, jds, *args, **kwargs):
+        scored.extend(jds)
+        return analyze_resume_batch(resume, jds, *args, **kwargs)
+
+    monkeypatch.setattr(job_recommender, "analyze_resume_batch", counting)
+    recommend_jobs(texts[3], catalog, 6)
+    assert len(scored) < len(catalog) - 1
+
+
+def postings(index: SkillIndex, skills) -> dict:
+    return {skill: index.jobs_with_any([skill]) for skill in skills}
+
+
+def test_index_maintained_per_job_matches_rebuild(corpus):
+    jobs = corpus.jobs(30)
+    skills = {job.id: frozenset(job_features(job_document_text(job)).skills) for job in jobs}
+    every_skill = frozenset().union(*skills.values())
+    maintained = SkillIndex()
+    for job_id, job_skills in skills.items():
+        maintained.upsert(job_id, job_skills, "v1")
+    # An edit that swaps a job's skills, a re-save and two deletions.
+    skills[jobs[0].id] = skills[jobs[1].id]
+    maintained.upsert(jobs[0].id, skills[jobs[0].id], "v2")
+    maintained.upsert(jobs[2].id, skills[jobs[2].id], "v1")
+    for job in jobs[3:5]:
+        maintained.remove(job.id)
+        del skills[job.id]
+
+    rebuilt = SkillIndex()
+    rebuilt.rebuild((job_id, job_skills, "v2" if job_id == jobs[0].id else "v1") for job_id, job_skills in skills.items())
+    assert len(maintained) == len(rebuilt)
+    assert postings(maintained, every_skill) == postings(rebuilt, every_skill)
+    assert maintained.skills_of(jobs[0].id, "v2") == skills[jobs[1].id]
+
+
+def test_stale_stamp_is_not_trusted():
+    index = SkillIndex()
+    index.upsert(1, ["python"], "v1")
+    assert index.skills_of(1, "v1") == frozenset({"python"})
+    assert index.skills_of(1, "v2") is None
+    assert index.indexed_skills(1) == frozenset({"python"})
@@ -0,0 +1,94 @@
+"""Recommendation lists merged per posted job against computing them afresh, and the built marker."""
+import pytest
+from flask import current_app
+
+from models import Job, User, UserRecommendation
+from services import semantic_model
+from services.ats_analyzer import JobFeatures, job_document_text
+from services.recommendations import (
+    merge_job_recommendations,
+    refresh_user_recommendations,
+    stage_recommendation_removal,
+)
+from services.resume_parser import ExtractionResult
+from services.resume_pipeline import store_resume
+from services.semantic_model import SemanticModel
+from services.skill_index import skill_index
+from services.talent_index import talent_index
+from services.talent_search import init_talent_index
+
+
+@pytest.fixture
+def catalog(database, corpus):
+    """25 of 40 jobs in a fitted model and the skill index, and 12 users with an indexed resume."""
+    employer = User(username="employer", email="employer@example.com", password="x", role="employer")
+    database.session.add(employer)
+    database.session.commit()
+    for job in corpus.jobs(40):
+        database.session.add(Job(title=job.title, description=job.description, employer_id=employer.id))
+    for index in range(12):
+        database.session.add(User(username=f"user{index}", email=f"user{index}@example.com", password="x"))
+    database.session.commit()
+    jobs = Job.query.order_by(Job.id).all()
+
+    previous = semantic_model.get_model()
+    model = SemanticModel.fit((job.id, features(job).clean_text) for job in jobs[:25])
+    semantic_model.set_model(model)
+    skill_index.rebuild((job.id, features(job).skills, None) for job in jobs[:25])
+    users = User.query.filter_by(role="user").order_by(User.id).all()
+    for user, text in zip(users, corpus.resumes(len(users))):
+        store_resume(user.id, "r.pdf", "r.pdf", ExtractionResult(text))
+    database.session.commit()
+    init_talent_index(current_app)
+    yield model, jobs, users
+    semantic_model.set_model(previous)
+    skill_index.rebuild(())
+    talent_index.rebuild([], None, 0)
+
+
+def features(job: Job) -> JobFeatures:
+    return JobFeatures.from_text(job_document_text(job))
+
+
+def stored_lists() -> dict[int, list[tuple[int, float]]]:
+    lists = {}
+    query = UserRecommendation.query.order_by(
+        UserRecommendation.user_id, UserRecommendation.score.desc(), UserRecommendation.job_id
+    )
+    for entry in query:
+        lists.setdefault(entry.user_id, []).append((entry.job_id, entry.score))
+    return lists
+
+
+def test_merged_lists_match_a_full_refresh(catalog):
+    model, jobs, users = catalog
+    built, unbuilt = users[:8], users[8:]
+    for user in built:
+        refresh_user_recommendations(user.id)
+
+    for job in jobs[25:]:
+        model.upsert_job(job.id, features(job).clean_text)
+        skill_index.upsert(job.id, features(job).skills)
+        merge_job_recommendations(job.id)
+
+    merged = stored_lists()
+    # A list not built yet is left for the full computation, not started with one job.
+    assert sorted(merged) == [user.id for user in built]
+    for user in built:
+        refresh_user_recommendations(user.id)
+    assert merged == stored_lists()
+    assert all(user.recommendations_built_at is None for user in unbuilt)
+
+
+def test_deleting_a_listed_job_clears_the_marker(catalog, database):
+    _model, _jobs, users = catalog
+    for user in users:
+        refresh_user_recommendations(user.id)
+    lists = stored_lists()
+    job_id = lists[users[0].id][0][0]
+    holders = {user_id for user_id, pairs in lists.items() if job_id in {listed for listed, _score in pairs}}
+
+    stage_recommendation_removal([job_id])
+    database.session.delete(database.session.get(Job, job_id))
+    database.session.commit()
+    assert {user.id for user in users if user.recommendations_built_at is None} == holders
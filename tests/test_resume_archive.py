@@ -0,0 +1,54 @@
+"""Archive members stored once by content hash, then analyzed like a single upload."""
+import hashlib
+import os
+import zipfile
+
+from services.ats_analyzer import ResumeFeatures
+from services.resume_archive import analyze_members, store_members
+from tests.doc_files import docx_bytes
+
+BUDGETS = (50, 100_000, 30.0)
+
+
+def test_members_are_stored_once_and_known_content_is_not_analyzed(tmp_path, corpus):
+    first, second = (docx_bytes(text) for text in corpus.resumes(2))
+    archive_path = tmp_path / "resumes.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("a/first.docx", first)
+        archive.writestr("notes.txt", "not a resume")
+        archive.writestr("__MACOSX/._first.docx", b"resource fork")
+        archive.writestr("a/second.DOCX", second)
+        archive.writestr("copy/first.docx", first)
+    folder = tmp_path / "uploads"
+    folder.mkdir()
+
+    members = store_members(str(archive_path), str(folder), max_files=10, max_file_bytes=1 << 20)
+    first_hash, second_hash = (hashlib.sha256(content).hexdigest() for content in (first, second))
+    assert [member["name"] for member in members] == ["a/first.docx", "notes.txt", "a/second.DOCX", "copy/first.docx"]
+    assert members[1]["status"] == "skipped"
+    assert sorted(os.listdir(folder)) == sorted([f"{first_hash}.docx", f"{second_hash}.docx"])
+
+    results = list(analyze_members(members, str(folder), 1, BUDGETS, known_hashes={first_hash}))
+    assert [(result["name"], result["status"]) for result in results] == [
+        ("a/first.docx", "known"),
+        ("notes.txt", "skipped"),
+        ("a/second.DOCX", "analyzed"),
+        ("copy/first.docx", "known"),
+    ]
+    analyzed = results[2]
+    assert analyzed["file_name"] == f"{second_hash}.docx" and analyzed["content_hash"] == second_hash
+    features = ResumeFeatures.from_json(analyzed["features"])
+    assert features.skills and features.skills == ResumeFeatures.from_text(analyzed["extracted_text"]).skills
+
+
+def test_members_past_max_files_are_skipped_and_not_written(tmp_path, corpus):
+    archive_path = tmp_path / "resumes.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        for index, text in enumerate(corpus.resumes(3)):
+            archive.writestr(f"r{index}.docx", docx_bytes(text))
+    folder = tmp_path / "uploads"
+    folder.mkdir()
+
+    members = store_members(str(archive_path), str(folder), max_files=2, max_file_bytes=1 << 20)
+    assert [member.get("status") for member in members] == [None, None, "skipped"]
+    assert len(os.listdir(folder)) == 2
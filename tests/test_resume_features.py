@@ -0,0 +1,60 @@
+"""ResumeFeatures.from_text against the separate passes it replaced."""
+import re
+
+import pytest
+
+from services.ats_analyzer import (
+    SECTION_POINTS,
+    SUGGESTION_MARKERS,
+    ResumeFeatures,
+    clean_text,
+    extract_skills_from_text,
+    section_bonus,
+)
+
+
+def old_section_bonus(resume_text: str) -> float:
+    text_lower = resume_text.lower()
+    return min(sum(points for section, points in SECTION_POINTS.items() if section in text_lower), 20.0)
+
+
+def old_markers(resume_text: str) -> set[str]:
+    """Section and suggestion words found by the old substring tests."""
+    text_lower = resume_text.lower()
+    return {marker for marker in (*SECTION_POINTS, *SUGGESTION_MARKERS) if marker in text_lower}
+
+
+def old_quantifier_count(resume_text: str) -> int:
+    return len(re.findall(r'\d+\s*%|\d+\s+\w+|\$\d+', resume_text))
+
+
+EDGE_CASES = [
+    "projectsummary certified",
+    "Cut costs $300k and $12 then 40 %, 40% and 7\tdays",
+    "10 20 30 40 apples",
+    "İstanbul 5 İ 10 %",
+    "  C++ / C# -- node.js;;; ci/cd  ",
+    "$ 5 and $5.5 and 5$",
+]
+
+
+@pytest.mark.parametrize("extra", [None, *EDGE_CASES])
+def test_matches_separate_passes(texts, extra):
+    for text in [extra] if extra is not None else texts:
+        features = ResumeFeatures.from_text(text)
+
+        assert features.clean_text == clean_text(text)
+        assert features.skills == extract_skills_from_text(clean_text(text))
+        assert {marker for marker in (*SECTION_POINTS, *SUGGESTION_MARKERS) if features.has(marker)} == (
+            old_markers(text)
+        )
+        assert section_bonus(features) == old_section_bonus(text)
+        assert features.quantifier_count == old_quantifier_count(text)
+        assert features.word_count == len(text.split())
+        assert features.text_length == len(text.strip())
+
+
+def test_json_round_trip(texts):
+    features = ResumeFeatures.from_text(texts[0])
+    assert ResumeFeatures.from_json(features.to_json()) == features
+    assert ResumeFeatures.from_json('{"version": 0}') is None
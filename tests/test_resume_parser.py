@@ -0,0 +1,33 @@
+"""The character budget shared by the .doc and .docx readers."""
+from docx import Document
+
+from services.resume_parser import _collect, extract_resume
+
+
+def test_budget_stops_mid_piece():
+    assert _collect(["a" * 6, "b" * 20], 2, 10, None) == ("aaaaaa\nbbb", 2, "characters")
+
+
+def test_piece_that_fills_the_budget_exactly():
+    text, used, hit = _collect(["a" * 10, "b" * 20, "c" * 5], 3, 10, None)
+    assert (text, used, hit) == ("a" * 10, 2, "characters")
+
+
+def test_piece_that_fills_the_budget_with_its_newline():
+    text, _used, hit = _collect(["a" * 4, "b" * 5, "c" * 5], 3, 10, None)
+    assert text == "aaaa\nbbbbb" and hit == "characters"
+
+
+def test_source_read_to_the_end_within_budget():
+    assert _collect(["a" * 4, "b" * 5], None, 10, None) == ("aaaa\nbbbbb", 2, None)
+
+
+def test_paragraph_ending_at_the_budget(tmp_path):
+    lines = ["x" * 100, "y" * 50, "z" * 50]
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    path = tmp_path / "resume.docx"
+    document.save(str(path))
+    result = extract_resume(str(path), max_chars=100)
+    assert result.text == lines[0] and result.truncated_by == "characters"
@@ -0,0 +1,138 @@
+"""Uploads processed off the request path against extracting and storing them directly."""
+import hashlib
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from models import ResumeData, ResumeUpload, User
+from services import resume_pipeline
+from services.ats_analyzer import ResumeFeatures
+from services.resume_parser import ExtractionResult, extract_resume
+from tests.doc_files import docx_bytes
+
+
+@pytest.fixture
+def seeker(database):
+    user = User(username="seeker", email="seeker@example.com", password="x")
+    database.session.add(user)
+    database.session.commit()
+    return user
+
+
+@pytest.fixture
+def committed(monkeypatch) -> list[ResumeData]:
+    """Resumes handed to resume_committed, whose follow-up work is not queued."""
+    resumes = []
+    monkeypatch.setattr(resume_pipeline, "resume_committed", resumes.append)
+    return resumes
+
+
+# Columns derived from the file content, which a reused analysis must reproduce.
+ANALYSIS_COLUMNS = (
+    "extracted_text", "score", "keywords", "keyword_terms", "features", "skills", "section_bonus",
+    "vector", "vector_version", "category", "pages_processed", "content_hash", "text_truncated",
+)
+
+
+def queue_upload(
+    database, user: User, path, original_name: str = "resume.docx", content_hash: str | None = None
+) -> ResumeUpload:
+    upload = ResumeUpload(
+        user_id=user.id, file_name=path.name, original_name=original_name, content_hash=content_hash
+    )
+    database.session.add(upload)
+    database.session.commit()
+    return upload
+
+
+def test_processed_upload_matches_extracting_it(seeker, committed, database, corpus, tmp_path):
+    path = tmp_path / "upload.docx"
+    path.write_bytes(docx_bytes(corpus.resumes(1)[0]))
+    upload = queue_upload(database, seeker, path)
+
+    resume_pipeline.process_upload(upload.id, str(path))
+    upload = database.session.get(ResumeUpload, upload.id)
+    assert (upload.status, upload.message) == ("ready", None)
+    resume = database.session.get(ResumeData, upload.resume_id)
+    assert committed == [resume]
+    text = extract_resume(str(path)).text
+    assert resume.extracted_text == text
+    assert ResumeFeatures.from_json(resume.features) == ResumeFeatures.from_text(text)
+    assert (resume.user_id, resume.original_name) == (seeker.id, "resume.docx")
+    assert resume_pipeline.upload_state(upload) == {"status": "ready", "message": None, "resume_id": resume.id}
+
+
+def test_unreadable_upload_fails_and_releases_its_file(seeker, committed, database, tmp_path):
+    path = tmp_path / "upload.docx"
+    path.write_bytes(b"not a word document")
+    upload = queue_upload(database, seeker, path)
+
+    resume_pipeline.process_upload(upload.id, str(path))
+    upload = database.session.get(ResumeUpload, upload.id)
+    assert (upload.status, upload.message) == ("failed", "The resume could not be read.")
+    assert upload.resume_id is None and committed == []
+    assert not path.exists()
+
+
+def test_upload_deleted_while_queued_is_dropped(seeker, committed, database, tmp_path):
+    path = tmp_path / "upload.docx"
+    path.write_bytes(b"queued content")
+    upload = queue_upload(database, seeker, path)
+    database.session.delete(upload)
+    database.session.commit()
+
+    resume_pipeline.process_upload(upload.id, str(path))
+    assert ResumeData.query.count() == 0 and not path.exists()
+
+
+def test_uploads_left_unfinished_count_as_failed(seeker, database, tmp_path):
+    upload = queue_upload(database, seeker, tmp_path / "upload.docx")
+    assert resume_pipeline.upload_state(upload)["status"] == "queued"
+    upload.created_at = datetime.utcnow() - timedelta(days=1)
+    assert resume_pipeline.upload_state(upload)["status"] == "failed"
+
+
+def test_uploads_are_stored_once_by_content(tmp_path, corpus):
+    first, second = (docx_bytes(text) for text in corpus.resumes(2))
+    stored = [
+        resume_pipeline.save_upload(FileStorage(io.BytesIO(content)), str(tmp_path), ".docx")
+        for content in (first, second, first)
+    ]
+    digests = [hashlib.sha256(content).hexdigest() for content in (first, second)]
+    assert stored == [(f"{digest}.docx", digest) for digest in (*digests, digests[0])]
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(f"{digest}.docx" for digest in digests)
+    assert (tmp_path / stored[1][0]).read_bytes() == second
+
+
+def test_repeated_content_reuses_the_analysis(seeker, committed, database, corpus, tmp_path, monkeypatch):
+    content = docx_bytes(corpus.resumes(1)[0])
+    path = tmp_path / f"{hashlib.sha256(content).hexdigest()}.docx"
+    path.write_bytes(content)
+    content_hash = path.stem
+    text = extract_resume(str(path)).text
+    prior = resume_pipeline.store_resume(seeker.id, path.name, "first.docx", ExtractionResult(text), content_hash)
+    database.session.commit()
+    assert resume_pipeline.analyzed_resume(content_hash) == prior
+
+    # Queued before the first copy was analyzed: processing finds it and never extracts.
+    def no_extraction(*_args):
+        raise AssertionError("extracted again")
+
+    monkeypatch.setattr(resume_pipeline, "extract_resume_with_timeout", no_extraction)
+    upload = queue_upload(database, seeker, path, "second.docx", content_hash)
+    resume_pipeline.process_upload(upload.id, str(path))
+    reused = database.session.get(ResumeData, database.session.get(ResumeUpload, upload.id).resume_id)
+    assert reused.id != prior.id and reused.original_name == "second.docx"
+    assert [getattr(reused, name) for name in ANALYSIS_COLUMNS] == [getattr(prior, name) for name in ANALYSIS_COLUMNS]
+
+    # The file is shared, so it stays while any resume stores it.
+    database.session.delete(prior)
+    database.session.commit()
+    resume_pipeline.release_file(str(path))
+    assert path.exists()
+    database.session.delete(reused)
+    database.session.commit()
+    resume_pipeline.release_file(str(path))
+    assert not path.exists()
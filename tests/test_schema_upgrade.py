@@ -0,0 +1,65 @@
+"""upgrade_schema against tables created by the version before each migration."""
+from datetime import datetime
+
+from sqlalchemy import inspect
+
+from models import ResumeData, db
+from services.schema_upgrade import upgrade_schema
+
+CREATED = datetime(2024, 5, 1, 9, 30)
+
+
+def replace_table(name: str, ddl: str) -> None:
+    """Swap a table created from the models for the one an earlier version created."""
+    db.session.execute(db.text(f"DROP TABLE {name}"))
+    db.session.execute(db.text(ddl))
+    db.session.commit()
+
+
+def columns(table: str) -> dict[str, bool]:
+    return {column["name"]: column["nullable"] for column in inspect(db.engine).get_columns(table)}
+
+
+def test_jobs_get_updated_at_from_created_at(database):
+    replace_table(
+        "jobs",
+        "CREATE TABLE jobs (id INTEGER PRIMARY KEY, title VARCHAR(150) NOT NULL, description TEXT NOT NULL,"
+        " employer_id INTEGER NOT NULL REFERENCES users (id), created_at DATETIME NOT NULL)",
+    )
+    db.session.execute(
+        db.text("INSERT INTO jobs VALUES (1, 'Analyst', 'SQL and Excel', 1, :created)"), {"created": CREATED}
+    )
+    db.session.commit()
+
+    assert upgrade_schema()
+    assert columns("jobs")["updated_at"] is False
+    updated_at = db.session.execute(db.text("SELECT updated_at FROM jobs WHERE id = 1")).scalar_one()
+    assert str(updated_at) == str(CREATED)
+    assert upgrade_schema() == []
+
+
+def test_resume_data_from_before_every_migration_reads_through_the_model(database):
+    replace_table(
+        "resume_data",
+        "CREATE TABLE resume_data (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL REFERENCES users (id),"
+        " extracted_text TEXT NOT NULL, file_name VARCHAR(255) NOT NULL, original_name VARCHAR(255) NOT NULL,"
+        " score INTEGER NOT NULL, keywords TEXT NOT NULL, uploaded_at DATETIME NOT NULL)",
+    )
+    db.session.execute(
+        db.text("INSERT INTO resume_data VALUES (1, 1, 'Python and SQL', 'a.pdf', 'cv.pdf', 40, 'python', :created)"),
+        {"created": CREATED},
+    )
+    db.session.commit()
+
+    upgrade_schema()
+    found = columns("resume_data")
+    assert found == {column.name: column.nullable for column in ResumeData.__table__.columns}
+    indexes = {index["name"] for index in inspect(db.engine).get_indexes("resume_data")}
+    assert indexes == {index.name for index in ResumeData.__table__.indexes}
+
+    resume = db.session.get(ResumeData, 1)
+    assert resume.extracted_text == "Python and SQL"
+    assert resume.text_truncated is False
+    resume.extracted_text = "Python, SQL and Flask"
+    db.session.commit()
+    assert upgrade_schema() == []
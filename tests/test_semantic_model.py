@@ -0,0 +1,125 @@
+"""Job vectors kept up to date per save and delete against vectorizing the catalog afresh."""
+import sys
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from models import Job, User
+from services import semantic_model
+from services.ats_analyzer import JobFeatures, job_document_text
+from services.catalog import reconcile_semantic_model
+from services.semantic_model import SemanticModel
+
+
+def cleaned(job) -> str:
+    return JobFeatures.from_text(job_document_text(job)).clean_text
+
+
+def assert_rows(model: SemanticModel, texts: dict[int, str]) -> None:
+    """The model stores exactly `texts`, each row as a fresh transform of its text."""
+    job_ids, matrix = model.stored_jobs()
+    assert sorted(job_ids) == sorted(texts) and model.job_count == len(texts)
+    expected = model.transform([texts[job_id] for job_id in job_ids])
+    assert abs(matrix - expected).max() < 1e-12
+    shuffled = sorted(texts, reverse=True)
+    picked = model.job_vectors(shuffled, [""] * len(shuffled))
+    assert abs(picked - model.transform([texts[job_id] for job_id in shuffled])).max() < 1e-12
+
+
+@pytest.fixture
+def jobs(corpus):
+    return corpus.jobs(60)
+
+
+@pytest.mark.parametrize("compact_rows", [3, 512])
+def test_saves_and_deletes_match_fresh_vectors(jobs, monkeypatch, compact_rows):
+    monkeypatch.setattr(semantic_model, "COMPACT_ROWS", compact_rows)
+    texts = {job.id: cleaned(job) for job in jobs[:40]}
+    model = SemanticModel.fit(texts.items())
+    for job in jobs[40:]:
+        texts[job.id] = cleaned(job)
+        model.upsert_job(job.id, texts[job.id])
+    # Edits, re-saves of a job stored since the fit, and deletions of both kinds.
+    for job_id, other in ((1, jobs[50]), (45, jobs[2]), (45, jobs[3]), (7, jobs[7])):
+        texts[job_id] = cleaned(other)
+        model.upsert_job(job_id, texts[job_id])
+    for job_id in (2, 3, 41, 59, 1000):
+        model.remove_job(job_id)
+        texts.pop(job_id, None)
+    assert_rows(model, texts)
+    # Texts of jobs the model does not hold are transformed in place.
+    mixed = model.job_vectors([5, 999, 6], [texts[5], "python flask developer", texts[6]])
+    assert abs(mixed - model.transform([texts[5], "python flask developer", texts[6]])).max() < 1e-12
+
+
+def test_saved_model_keeps_incremental_rows(jobs, tmp_path):
+    texts = {job.id: cleaned(job) for job in jobs[:30]}
+    model = SemanticModel.fit(texts.items())
+    for job in jobs[30:35]:
+        texts[job.id] = cleaned(job)
+        model.upsert_job(job.id, texts[job.id])
+    model.remove_job(4)
+    del texts[4]
+    model.save(str(tmp_path / "model.joblib"))
+    assert_rows(SemanticModel.load(str(tmp_path / "model.joblib")), texts)
+
+
+def test_readers_see_whole_states_while_jobs_are_saved(jobs, monkeypatch):
+    monkeypatch.setattr(semantic_model, "COMPACT_ROWS", 8)
+    texts = {job.id: cleaned(job) for job in jobs[:40]}
+    model = SemanticModel.fit(texts.items())
+    steady = list(range(21, 41))
+    expected = model.transform([texts[job_id] for job_id in steady]).toarray()
+    done = threading.Event()
+
+    def writer():
+        for round_ in range(1000):
+            job = jobs[40 + round_ % 20]
+            model.upsert_job(job.id, cleaned(job))
+            # Re-storing an early job moves every later row of the old layout.
+            model.upsert_job(1 + round_ % 20, texts[1 + round_ % 20])
+            model.remove_job(job.id)
+        done.set()
+
+    previous = sys.getswitchinterval()
+    # Switch threads as often as possible, so reads land inside writes.
+    sys.setswitchinterval(1e-6)
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        while not done.is_set():
+            found = model.job_vectors(steady, [""] * len(steady)).toarray()
+            assert np.allclose(found, expected)
+    finally:
+        done.wait()
+        thread.join()
+        sys.setswitchinterval(previous)
+
+
+def test_reconcile_brings_a_loaded_model_in_line_with_the_jobs_table(database, corpus):
+    employer = User(username="employer", email="employer@example.com", password="x", role="employer")
+    database.session.add(employer)
+    database.session.commit()
+    synthetic = corpus.jobs(25)
+    stamp = datetime(2026, 1, 1)
+    for job in synthetic[:20]:
+        database.session.add(
+            Job(title=job.title, description=job.description, employer_id=employer.id, updated_at=stamp)
+        )
+    database.session.commit()
+    model = SemanticModel.fit((job.id, cleaned(job)) for job in Job.query)
+
+    # Another worker edits, deletes and posts jobs.
+    edited = database.session.get(Job, 3)
+    edited.description = synthetic[21].description
+    edited.updated_at = model.fitted_at + timedelta(minutes=1)
+    database.session.delete(database.session.get(Job, 5))
+    for job in synthetic[22:]:
+        database.session.add(Job(title=job.title, description=job.description, employer_id=employer.id))
+    database.session.commit()
+
+    assert reconcile_semantic_model(model)
+    assert_rows(model, {job.id: cleaned(job) for job in Job.query})
+    assert model.drift({job.id: job.updated_at for job in Job.query}) == ([], [])
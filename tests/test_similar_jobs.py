@@ -0,0 +1,75 @@
+"""Similar-job lists merged per posted, edited and deleted job against computing them all afresh."""
+import pytest
+
+from models import Job, SimilarJob, User
+from services import semantic_model
+from services.ats_analyzer import JobFeatures, job_document_text
+from services.semantic_model import SemanticModel
+from services.similar_jobs import referring_job_ids, refresh_similar_jobs, update_similar_jobs
+from services.skill_index import skill_index
+
+
+@pytest.fixture
+def catalog(database, corpus):
+    """Jobs in the database, 15 of them in a fitted model and the skill index, and the rest not yet."""
+    employer = User(username="employer", email="employer@example.com", password="x", role="employer")
+    database.session.add(employer)
+    database.session.commit()
+    for job in corpus.jobs(40):
+        database.session.add(Job(title=job.title, description=job.description, employer_id=employer.id))
+    database.session.commit()
+    jobs = Job.query.order_by(Job.id).all()
+
+    previous = semantic_model.get_model()
+    model = SemanticModel.fit((job.id, features(job).clean_text) for job in jobs[:15])
+    semantic_model.set_model(model)
+    skill_index.rebuild((job.id, features(job).skills, None) for job in jobs[:15])
+    yield model, jobs
+    semantic_model.set_model(previous)
+    skill_index.rebuild(())
+
+
+def features(job: Job) -> JobFeatures:
+    return JobFeatures.from_text(job_document_text(job))
+
+
+def save(model: SemanticModel, job: Job) -> None:
+    """What catalog.job_saved does to the model and the skill index."""
+    model.upsert_job(job.id, features(job).clean_text)
+    skill_index.upsert(job.id, features(job).skills)
+
+
+def stored_lists() -> dict[int, list[tuple[int, float]]]:
+    lists = {}
+    for entry in SimilarJob.query.order_by(SimilarJob.job_id, SimilarJob.score.desc(), SimilarJob.similar_job_id):
+        lists.setdefault(entry.job_id, []).append((entry.similar_job_id, entry.score))
+    return lists
+
+
+def test_merged_lists_match_a_full_refresh(catalog, database):
+    model, jobs = catalog
+    refresh_similar_jobs([job.id for job in jobs[:15]])
+
+    for job in jobs[15:]:
+        save(model, job)
+        update_similar_jobs(job.id)
+    # An edit that makes a job resemble another, and one that moves it away again.
+    for job, source in ((jobs[4], jobs[30]), (jobs[20], jobs[9]), (jobs[4], jobs[11])):
+        job.title, job.description = source.title, source.description + " consultant"
+        database.session.commit()
+        save(model, job)
+        update_similar_jobs(job.id)
+    deleted = [jobs[7].id, jobs[25].id]
+    neighbors_of = referring_job_ids(deleted)
+    for job_id in deleted:
+        database.session.delete(database.session.get(Job, job_id))
+        model.remove_job(job_id)
+        skill_index.remove(job_id)
+    database.session.commit()
+    refresh_similar_jobs(neighbors_of)
+
+    merged = stored_lists()
+    assert len(merged) > 30
+    assert all(job_id not in deleted for pairs in merged.values() for job_id, _score in pairs)
+    refresh_similar_jobs([job.id for job in Job.query])
+    assert merged == stored_lists()
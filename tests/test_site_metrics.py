@@ -0,0 +1,134 @@
+"""The daily_metrics rollup against the dashboard's old scan of every row."""
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from models import Application, DailyMetric, Job, ResumeData, User
+from services.site_metrics import (
+    COUNT_COLUMNS,
+    count_added,
+    monthly_metrics,
+    rebuild_site_metrics,
+    uncount_job,
+    uncount_user,
+)
+
+START = datetime(2025, 11, 20, 23, 30)
+
+
+def scanned_metrics() -> tuple[dict, dict]:
+    """The old dashboard: per-month counts and totals from loading every row."""
+    months = defaultdict(lambda: {"users": 0, "jobs": 0, "applications": 0})
+    for user in User.query.all():
+        months[user.created_at.strftime("%Y-%m")]["users"] += 1
+    for job in Job.query.all():
+        months[job.created_at.strftime("%Y-%m")]["jobs"] += 1
+    for application in Application.query.all():
+        months[application.applied_at.strftime("%Y-%m")]["applications"] += 1
+    totals = {
+        "user_count": User.query.count(),
+        "job_count": Job.query.count(),
+        "application_count": Application.query.count(),
+        "resume_count": ResumeData.query.count(),
+    }
+    return dict(months), totals
+
+
+def rolled_up_metrics() -> tuple[dict, dict]:
+    rows = monthly_metrics()
+    months = {
+        row["month"].strftime("%Y-%m"): {
+            "users": row["user_count"],
+            "jobs": row["job_count"],
+            "applications": row["application_count"],
+        }
+        for row in rows
+    }
+    return months, {column: sum(row[column] for row in rows) for column in COUNT_COLUMNS}
+
+
+def day_rows() -> list[tuple]:
+    return [
+        (row.day, *(getattr(row, column) for column in COUNT_COLUMNS))
+        for row in DailyMetric.query.order_by(DailyMetric.day)
+    ]
+
+
+def populate(db) -> list[User]:
+    """Employers with jobs and seekers with resumes and applications, spread over three months."""
+    users = []
+    for index in range(12):
+        when = START + timedelta(days=index * 5, hours=index)
+        user = User(
+            username=f"user{index}",
+            email=f"user{index}@example.com",
+            password="x",
+            role="employer" if index % 3 == 0 else "user",
+            created_at=when,
+        )
+        db.session.add(user)
+        count_added(user)
+        users.append(user)
+    db.session.commit()
+    employers = [user for user in users if user.role == "employer"]
+    seekers = [user for user in users if user.role == "user"]
+    jobs = []
+    for index, employer in enumerate(employers * 2):
+        job = Job(
+            title=f"Job {index}",
+            description="Python developer",
+            employer_id=employer.id,
+            created_at=employer.created_at + timedelta(days=index),
+        )
+        db.session.add(job)
+        count_added(job)
+        jobs.append(job)
+    db.session.commit()
+    for index, seeker in enumerate(seekers):
+        resume = ResumeData(
+            user_id=seeker.id,
+            file_name="r.pdf",
+            original_name="r.pdf",
+            uploaded_at=seeker.created_at + timedelta(hours=2),
+        )
+        applications = [
+            Application(
+                user_id=seeker.id,
+                job_id=job.id,
+                resume_path="r.pdf",
+                applied_at=seeker.created_at + timedelta(days=offset + 1),
+            )
+            for offset, job in enumerate(jobs[index % 3::3])
+        ]
+        db.session.add_all([resume, *applications])
+        count_added(resume, *applications)
+    db.session.commit()
+    return users
+
+
+def test_rollup_matches_scan(database):
+    populate(database)
+    assert rolled_up_metrics() == scanned_metrics()
+
+
+def test_rollup_follows_deletions(database):
+    users = populate(database)
+    employer, seeker = users[3], users[4]
+    # One deletion per commit, as the admin routes do.
+    job = employer.jobs[0]
+    uncount_job(job)
+    database.session.delete(job)
+    database.session.commit()
+    for user in (employer, seeker):
+        uncount_user(user)
+        database.session.delete(user)
+        database.session.commit()
+    assert rolled_up_metrics() == scanned_metrics()
+
+
+def test_rebuild_matches_incremental_counts(database):
+    populate(database)
+    incremental = day_rows()
+    totals = rebuild_site_metrics()
+    rebuilt = day_rows()
+    assert rebuilt == [row for row in incremental if any(row[1:])]
+    assert totals == scanned_metrics()[1]
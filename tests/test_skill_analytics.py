@@ -0,0 +1,76 @@
+"""Skill and role rollups staged per write against recounting them, and against suggest_jobs."""
+import json
+import random
+from datetime import datetime
+
+from flask import current_app
+
+from models import JobFeatureEntry, ResumeData, RoleDemand, SkillDemand, db
+from services.ats_analyzer import ALL_SKILLS_UNIQUE
+from services.job_recommender import skill_incidence, suggest_jobs, top_roles
+from services.skill_analytics import (
+    init_skill_analytics,
+    rebuild_skill_analytics,
+    stage_job_skills,
+    stage_resume_upload,
+)
+
+
+def skill_lists(seed: int, count: int) -> list[list[str]]:
+    rng = random.Random(seed)
+    lists = [rng.sample(ALL_SKILLS_UNIQUE, rng.randint(0, 12)) for _ in range(count)]
+    # Repeated and unknown skills are ignored like suggest_jobs ignores them.
+    lists[0] = lists[1] + lists[1][:2] + ["not a taxonomy skill"]
+    return lists
+
+
+def rollups() -> tuple[dict, dict]:
+    skills = {row.skill: (row.job_count, row.resume_count) for row in SkillDemand.query}
+    roles = {row.role: (row.job_count, row.resume_count) for row in RoleDemand.query}
+    return skills, roles
+
+
+def test_top_roles_match_suggest_jobs():
+    lists = skill_lists(5, 300)
+    assert top_roles(skill_incidence(lists)) == [suggest_jobs(skills)["recommended"] for skills in lists]
+
+
+def test_staged_counts_match_a_recount(database):
+    init_skill_analytics(current_app)
+    rng = random.Random(11)
+    lists = skill_lists(11, 121)
+
+    entries = {}
+    for job_id in range(1, 61):
+        skills = lists[job_id]
+        stage_job_skills(None, skills)
+        entries[job_id] = JobFeatureEntry(
+            job_id=job_id,
+            version="1",
+            job_updated_at=datetime(2024, 1, 1),
+            clean_text="",
+            skills=json.dumps(skills),
+        )
+        db.session.add(entries[job_id])
+    db.session.commit()
+    for job_id in rng.sample(sorted(entries), 20):
+        skills = lists[60 + job_id]
+        stage_job_skills(json.loads(entries[job_id].skills), skills)
+        entries[job_id].skills = json.dumps(skills)
+    for job_id in rng.sample(sorted(entries), 10):
+        stage_job_skills(json.loads(entries[job_id].skills), None)
+        db.session.delete(entries.pop(job_id))
+    db.session.commit()
+
+    # Several uploads per user; only the latest counts.
+    for upload in range(90):
+        skills = json.dumps(rng.choice(lists))
+        user_id = 1 + upload % 30
+        stage_resume_upload(user_id, skills)
+        db.session.add(ResumeData(user_id=user_id, file_name="r.pdf", original_name="r.pdf", skills=skills))
+        db.session.commit()
+
+    staged = rollups()
+    assert any(count != (0, 0) for count in staged[0].values())
+    assert rebuild_skill_analytics() == {"jobs": 50, "resumes": 30}
+    assert rollups() == staged
@@ -0,0 +1,44 @@
+"""SkillMatcher against the per-skill regex scan it replaced."""
+import re
+
+from services.ats_analyzer import ALL_SKILLS, ALL_SKILLS_UNIQUE, clean_text, extract_skills_from_text
+from services.skill_matcher import SkillMatcher
+
+
+def regex_skills(text: str) -> list[str]:
+    """extract_skills_from_text before the matcher: one \\b regex search per skill."""
+    text_lower = text.lower()
+    found = []
+    for skill in ALL_SKILLS:
+        pattern = r'\b' + re.escape(skill) + r'\b'
+        if re.search(pattern, text_lower):
+            found.append(skill)
+    return list(dict.fromkeys(found))
+
+
+def _word_bounded(skill: str) -> bool:
+    # \b after a trailing symbol needs a word character next, so the old scan
+    # missed c++ and c#; only skills starting and ending in a word character compare.
+    return bool(re.match(r"\w", skill)) and bool(re.search(r"\w$", skill))
+
+
+def test_matches_regex_scan(texts):
+    # Multi-word skills now also match across a run of whitespace ("power  bi").
+    for text in texts:
+        for candidate in (clean_text(text), " ".join(text.split())):
+            expected = [skill for skill in regex_skills(candidate) if _word_bounded(skill)]
+            found = [skill for skill in extract_skills_from_text(candidate) if _word_bounded(skill)]
+            assert found == expected
+
+
+def test_taxonomy_order_and_dedup():
+    assert extract_skills_from_text("SQL, sql and Python") == [
+        skill for skill in ALL_SKILLS_UNIQUE if skill in ("sql", "python")
+    ]
+
+
+def test_symbol_terms_and_word_boundaries():
+    matcher = SkillMatcher(["c++", "c#", "react", "react native", "power bi", "go"])
+    assert matcher.find("C++ and C# with React Native") == ["c++", "c#", "react", "react native"]
+    assert matcher.find("power   bi") == ["power bi"]
+    assert matcher.find("powerbi, power.bi, reactjs, google") == []
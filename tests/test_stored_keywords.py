@@ -0,0 +1,48 @@
+"""Apply-time keyword scoring from stored terms against tokenizing both texts."""
+import re
+
+from models import Job, ResumeData, User
+from services.ats_analyzer import JobFeatures, job_document_text
+from services.job_feature_store import store_job_features
+from services.resume_parser import DEFAULT_SKILLS, ExtractionResult, score_keyword_terms
+from services.resume_pipeline import store_resume
+from services.stored_keywords import job_keyword_terms, resume_keyword_terms
+
+
+def tokenized(resume_text: str, job_text: str) -> dict:
+    """analyze_resume_keywords before terms were stored: both texts tokenized on every call."""
+    resume_terms = set(re.findall(r"[a-zA-Z0-9\+\#\.]{2,}", resume_text.lower()))
+    job_terms = set(re.findall(r"[a-zA-Z0-9\+\#\.]{2,}", job_text.lower()))
+    reference_terms = job_terms or DEFAULT_SKILLS
+    matched = sorted(skill for skill in reference_terms if skill in resume_terms)
+    return {"score": int((len(matched) / (len(reference_terms) or 1)) * 100), "keywords": matched[:20]}
+
+
+def test_stored_terms_score_like_the_texts(database, texts, corpus):
+    user = User(username="seeker", email="seeker@example.com", password="x")
+    database.session.add(user)
+    database.session.commit()
+    jobs = [Job(title=job.title, description=job.description, employer_id=user.id) for job in corpus.jobs(8)]
+    database.session.add_all(jobs)
+    database.session.commit()
+    for job in jobs[:6]:
+        store_job_features(job, JobFeatures.from_text(job_document_text(job)))
+    database.session.commit()
+    # An edit leaves the stored terms behind; they are not used until rewritten.
+    jobs[0].description = corpus.jobs(9)[8].description
+    database.session.commit()
+
+    resumes = [
+        store_resume(user.id, "r.pdf", "r.pdf", ExtractionResult(text)) for text in texts[:20] if text
+    ]
+    # Stored before terms were: they come from the text on first use.
+    legacy = ResumeData(user_id=user.id, file_name="old.pdf", original_name="old.pdf", extracted_text=texts[25])
+    database.session.add_all([*resumes, legacy])
+    database.session.commit()
+
+    for resume in [*resumes, legacy]:
+        for job in jobs:
+            found = score_keyword_terms(resume_keyword_terms(resume), job_keyword_terms(job))
+            assert found == tokenized(resume.extracted_text, job.description)
+        assert score_keyword_terms(resume_keyword_terms(resume)) == tokenized(resume.extracted_text, "")
+    assert legacy.keyword_terms is not None
@@ -0,0 +1,81 @@
+"""The talent index kept up to date per upload against rebuilding it, and against analyze_resume."""
+import pytest
+
+from services import semantic_model, talent_index as talent_index_module
+from services.ats_analyzer import analyze_resume_batch, job_features, resume_features, section_bonus
+from services.categorizer import resume_category
+from services.semantic_model import SemanticModel
+from services.talent_index import TalentEntry, TalentIndex
+
+
+@pytest.fixture
+def model(corpus):
+    jobs = corpus.jobs(40)
+    previous = semantic_model.get_model()
+    model = SemanticModel.fit((job.id, job_features(f"{job.title} {job.description}").clean_text) for job in jobs)
+    semantic_model.set_model(model)
+    yield model
+    semantic_model.set_model(previous)
+
+
+@pytest.fixture
+def resumes(corpus) -> list[str]:
+    return corpus.resumes(40)
+
+
+def entry(model: SemanticModel, user_id: int, resume_id: int, text: str) -> TalentEntry:
+    features = resume_features(text)
+    vector = model.transform([features.clean_text])
+    return TalentEntry(user_id, resume_id, features.skills, section_bonus(features), vector, resume_category(text))
+
+
+def width(model: SemanticModel) -> int:
+    return len(model.vectorizer.vocabulary_)
+
+
+def rankings(index: TalentIndex, model: SemanticModel, jobs) -> list:
+    found = []
+    for job in jobs:
+        features = job_features(f"{job.title} {job.description}")
+        vector = model.transform([features.clean_text])
+        found.append(index.rank(features.skills, vector, 100))
+        found.append(index.rank(features.skills, vector, 5, category="IT"))
+    return found
+
+
+def test_uploads_and_deletions_match_rebuild(model, resumes, corpus, monkeypatch):
+    monkeypatch.setattr(talent_index_module, "MERGE_THRESHOLD", 4)
+    entries = {user_id: entry(model, user_id, user_id, text) for user_id, text in enumerate(resumes[:20], 1)}
+    maintained = TalentIndex()
+    maintained.rebuild(list(entries.values()), model.version, width(model))
+    for user_id, text in enumerate(resumes[20:], 21):
+        entries[user_id] = entry(model, user_id, user_id, text)
+        maintained.upsert(entries[user_id])
+    # Newer resumes replace a user's entry; an older one arriving late does not.
+    for user_id in (3, 25, 31):
+        entries[user_id] = entry(model, user_id, 100 + user_id, resumes[user_id % 7])
+        maintained.upsert(entries[user_id])
+    maintained.upsert(entry(model, 3, 50, resumes[0]))
+    for user_id in (5, 27, 31, 99):
+        maintained.remove(user_id)
+        entries.pop(user_id, None)
+
+    rebuilt = TalentIndex()
+    rebuilt.rebuild(list(entries.values()), model.version, width(model))
+    assert len(maintained) == len(rebuilt) == len(entries)
+    jobs = corpus.jobs(5)
+    assert rankings(maintained, model, jobs) == rankings(rebuilt, model, jobs)
+
+
+def test_rank_matches_analyze_resume(model, resumes, corpus):
+    index = TalentIndex()
+    entries = [entry(model, user_id, user_id, text) for user_id, text in enumerate(resumes, 1)]
+    index.rebuild(entries, model.version, width(model))
+    for job in corpus.jobs(3):
+        text = f"{job.title} {job.description}"
+        features = job_features(text)
+        ranked, total = index.rank(features.skills, model.transform([features.clean_text]), 10)
+        assert total == len(resumes)
+        scores = [analyze_resume_batch(resume, [text])[0]["ats_score"] for resume in resumes]
+        expected = sorted((-score, user_id) for user_id, score in enumerate(scores, 1))[:10]
+        assert [(-result["score"], result["user_id"]) for result in ranked] == expected